@@ -15,6 +15,9 @@ from homeassistant.helpers.reload import async_integration_yaml_config
 from homeassistant.helpers.service import async_register_admin_service
 from homeassistant.helpers.typing import ConfigType
 
+from . import changegroup, metadata
+from .controlstate import ControlStateStore, async_read_controls
+from .common import config_for_core, request_timeout_for_core
 from .const import *
 from .qsys import qrc
 
@@ -49,14 +52,70 @@ CONFIG_SCHEMA = vol.Schema(
                                         )
                                     }
                                 ),
-                                vol.Optional(CONF_CHANGEGROUP, default={CONF_POLL_INTERVAL: 1.0, CONF_REQUEST_TIMEOUT: 5.0}): vol.Schema(
+                                vol.Optional(CONF_CHANGEGROUP, default={CONF_POLL_INTERVAL: 1.0, CONF_REQUEST_TIMEOUT: 5.0, CONF_AUTO_POLL: False}): vol.Schema(
                                     {
                                         vol.Optional(
                                             CONF_POLL_INTERVAL, default=1.0
                                         ): vol.Coerce(float),
+                                        # adaptive polling between these bounds
+                                        vol.Optional(
+                                            CONF_POLL_INTERVAL_MIN
+                                        ): vol.Coerce(float),
+                                        vol.Optional(
+                                            CONF_POLL_INTERVAL_MAX
+                                        ): vol.Coerce(float),
                                         vol.Optional(
                                             CONF_REQUEST_TIMEOUT, default=5.0
                                         ): vol.Coerce(float),
+                                        vol.Optional(
+                                            CONF_AUTO_POLL, default=False
+                                        ): bool,
+                                        # extra change groups polled at their own rate
+                                        vol.Optional(CONF_POLL_TIERS): vol.Schema(
+                                            {
+                                                # the default tier is the change group itself
+                                                vol.All(
+                                                    str,
+                                                    vol.NotIn([DEFAULT_POLL_TIER]),
+                                                ): vol.Schema(
+                                                    {
+                                                        vol.Required(
+                                                            CONF_POLL_INTERVAL
+                                                        ): vol.Coerce(float),
+                                                        vol.Optional(
+                                                            CONF_POLL_INTERVAL_MIN
+                                                        ): vol.Coerce(float),
+                                                        vol.Optional(
+                                                            CONF_POLL_INTERVAL_MAX
+                                                        ): vol.Coerce(float),
+                                                        vol.Optional(
+                                                            CONF_AUTO_POLL,
+                                                            default=False,
+                                                        ): bool,
+                                                        # control name patterns polled by the tier
+                                                        vol.Optional(
+                                                            CONF_POLL_TIER_CONTROLS,
+                                                            default=[],
+                                                        ): [str],
+                                                    }
+                                                )
+                                            }
+                                        ),
+                                    }
+                                ),
+                                # default timeout of calls made outside the change group
+                                vol.Optional(CONF_CALL_TIMEOUT): vol.All(
+                                    vol.Coerce(float), vol.Range(min=0, min_included=False)
+                                ),
+                                # the core drops sessions idle for about a minute
+                                vol.Optional(CONF_KEEPALIVE, default={CONF_KEEPALIVE_INTERVAL: 15.0, CONF_KEEPALIVE_MAX_MISSED: 3}): vol.Schema(
+                                    {
+                                        vol.Optional(
+                                            CONF_KEEPALIVE_INTERVAL, default=15.0
+                                        ): vol.Coerce(float),
+                                        vol.Optional(
+                                            CONF_KEEPALIVE_MAX_MISSED, default=3
+                                        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
                                     }
                                 ),
                                 vol.Optional(CONF_PLATFORMS): vol.Schema(
@@ -69,6 +128,10 @@ CONFIG_SCHEMA = vol.Schema(
                                                             CONF_ENTITY_NAME,
                                                             default=None,
                                                         ): vol.Any(None, str),
+                                                        vol.Optional(
+                                                            CONF_POLL_TIER,
+                                                            default=None,
+                                                        ): vol.Any(None, str),
                                                         vol.Optional(
                                                             CONF_DEVICE_CLASS,
                                                             default=None,
@@ -79,6 +142,16 @@ CONFIG_SCHEMA = vol.Schema(
                                                         vol.Required(
                                                             CONF_COMPONENT
                                                         ): str,
+                                                        vol.Optional(
+                                                            CONF_MAX_UPDATE_RATE,
+                                                            default=None,
+                                                        ): vol.Any(
+                                                            None,
+                                                            vol.All(
+                                                                vol.Coerce(float),
+                                                                vol.Range(min=0, min_included=False),
+                                                            ),
+                                                        ),
                                                     }
                                                 )
                                             ]
@@ -91,6 +164,14 @@ CONFIG_SCHEMA = vol.Schema(
                                                             CONF_ENTITY_NAME,
                                                             default=None,
                                                         ): vol.Any(None, str),
+                                                        vol.Optional(
+                                                            CONF_POLL_TIER,
+                                                            default=None,
+                                                        ): vol.Any(None, str),
+                                                        vol.Optional(
+                                                            CONF_EXTRA_ATTRIBUTES,
+                                                            default=EXTRA_ATTRIBUTES_FULL,
+                                                        ): vol.In(EXTRA_ATTRIBUTES_MODES),
                                                         vol.Optional(
                                                             CONF_DEVICE_CLASS,
                                                             default=None,
@@ -144,6 +225,25 @@ CONFIG_SCHEMA = vol.Schema(
                                                             CONF_NUMBER_VALUE_TEMPLATE,
                                                             default=None,
                                                         ): vol.Any(None, str),
+                                                        # ignore smaller changes of the value
+                                                        vol.Optional(
+                                                            CONF_DEADBAND,
+                                                            default=None,
+                                                        ): vol.Any(None, vol.Coerce(float)),
+                                                        vol.Optional(
+                                                            CONF_DEADBAND_RELATIVE,
+                                                            default=None,
+                                                        ): vol.Any(None, vol.Coerce(float)),
+                                                        vol.Optional(
+                                                            CONF_MAX_UPDATE_RATE,
+                                                            default=None,
+                                                        ): vol.Any(
+                                                            None,
+                                                            vol.All(
+                                                                vol.Coerce(float),
+                                                                vol.Range(min=0, min_included=False),
+                                                            ),
+                                                        ),
                                                     }
                                                 )
                                             ]
@@ -156,6 +256,14 @@ CONFIG_SCHEMA = vol.Schema(
                                                             CONF_ENTITY_NAME,
                                                             default=None,
                                                         ): vol.Any(None, str),
+                                                        vol.Optional(
+                                                            CONF_POLL_TIER,
+                                                            default=None,
+                                                        ): vol.Any(None, str),
+                                                        vol.Optional(
+                                                            CONF_EXTRA_ATTRIBUTES,
+                                                            default=EXTRA_ATTRIBUTES_FULL,
+                                                        ): vol.In(EXTRA_ATTRIBUTES_MODES),
                                                         vol.Optional(
                                                             CONF_DEVICE_CLASS,
                                                             default=None,
@@ -182,6 +290,25 @@ CONFIG_SCHEMA = vol.Schema(
                                                             CONF_SENSOR_ATTRIBUTE,
                                                             default="String",
                                                         ): str,
+                                                        # ignore smaller changes of the value
+                                                        vol.Optional(
+                                                            CONF_DEADBAND,
+                                                            default=None,
+                                                        ): vol.Any(None, vol.Coerce(float)),
+                                                        vol.Optional(
+                                                            CONF_DEADBAND_RELATIVE,
+                                                            default=None,
+                                                        ): vol.Any(None, vol.Coerce(float)),
+                                                        vol.Optional(
+                                                            CONF_MAX_UPDATE_RATE,
+                                                            default=None,
+                                                        ): vol.Any(
+                                                            None,
+                                                            vol.All(
+                                                                vol.Coerce(float),
+                                                                vol.Range(min=0, min_included=False),
+                                                            ),
+                                                        ),
                                                     }
                                                 )
                                             ]
@@ -194,6 +321,14 @@ CONFIG_SCHEMA = vol.Schema(
                                                             CONF_ENTITY_NAME,
                                                             default=None,
                                                         ): vol.Any(None, str),
+                                                        vol.Optional(
+                                                            CONF_POLL_TIER,
+                                                            default=None,
+                                                        ): vol.Any(None, str),
+                                                        vol.Optional(
+                                                            CONF_EXTRA_ATTRIBUTES,
+                                                            default=EXTRA_ATTRIBUTES_FULL,
+                                                        ): vol.In(EXTRA_ATTRIBUTES_MODES),
                                                         vol.Optional(
                                                             CONF_DEVICE_CLASS,
                                                             default=None,
@@ -217,6 +352,14 @@ CONFIG_SCHEMA = vol.Schema(
                                                             CONF_ENTITY_NAME,
                                                             default=None,
                                                         ): vol.Any(None, str),
+                                                        vol.Optional(
+                                                            CONF_POLL_TIER,
+                                                            default=None,
+                                                        ): vol.Any(None, str),
+                                                        vol.Optional(
+                                                            CONF_EXTRA_ATTRIBUTES,
+                                                            default=EXTRA_ATTRIBUTES_FULL,
+                                                        ): vol.In(EXTRA_ATTRIBUTES_MODES),
                                                         vol.Required(
                                                             CONF_COMPONENT
                                                         ): str,
@@ -253,6 +396,125 @@ CONFIG_SCHEMA = vol.Schema(
 )
 
 
+CALL_METHOD_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(CALL_METHOD_DEVICE_ID): vol.Any(str, [str]),
+            vol.Exclusive(CALL_METHOD_NAME, "method_or_calls"): str,
+            vol.Optional(CALL_METHOD_PARAMS): object,
+            vol.Exclusive(CALL_METHOD_CALLS, "method_or_calls"): [
+                vol.Schema(
+                    {
+                        vol.Required(CALL_METHOD_NAME): str,
+                        vol.Optional(CALL_METHOD_PARAMS): object,
+                    }
+                )
+            ],
+            vol.Optional(CALL_METHOD_ORDERED, default=False): bool,
+            vol.Optional(CALL_METHOD_TIMEOUT): vol.All(
+                vol.Coerce(float), vol.Range(min=0, min_included=False)
+            ),
+        }
+    ),
+    vol.Any(
+        vol.Schema({vol.Required(CALL_METHOD_NAME): str}, extra=vol.ALLOW_EXTRA),
+        vol.Schema({vol.Required(CALL_METHOD_CALLS): list}, extra=vol.ALLOW_EXTRA),
+        msg=f"one of {CALL_METHOD_NAME} or {CALL_METHOD_CALLS} is required",
+    ),
+)
+
+
+async def async_call_cores(cores, data, request_timeouts=None):
+    """Call the method, or the calls, of call_method service data on all cores.
+
+    `cores` maps device ids to cores, which are all called at once so that
+    e.g. mutes land at the same time. Without a timeout in `data` each core
+    gets its timeout from `request_timeouts`, by device id, so that one
+    offline core does not hold up the service call. Returns the response of each core by
+    device id, for calls a list with a response or exception per call. A
+    core that failed has the exception as its response, ServiceValidationError
+    is raised when all of them failed.
+    """
+    timeout = data.get(CALL_METHOD_TIMEOUT)
+    request_timeouts = request_timeouts or {}
+    timeouts = [
+        request_timeouts.get(device_id) if timeout is None else timeout
+        for device_id in cores
+    ]
+
+    if CALL_METHOD_CALLS in data:
+        calls = [
+            (c[CALL_METHOD_NAME], c.get(CALL_METHOD_PARAMS))
+            for c in data[CALL_METHOD_CALLS]
+        ]
+        ordered = data.get(CALL_METHOD_ORDERED, False)
+        requests = (
+            core.call_many(calls, ordered=ordered, timeout=core_timeout)
+            for core, core_timeout in zip(cores.values(), timeouts)
+        )
+    else:
+        method = data.get(CALL_METHOD_NAME)
+        params = data.get(CALL_METHOD_PARAMS)
+        requests = (
+            core.call(method, params, timeout=core_timeout)
+            for core, core_timeout in zip(cores.values(), timeouts)
+        )
+    responses = await asyncio.gather(*requests, return_exceptions=True)
+
+    errors = [r for r in responses if isinstance(r, BaseException)]
+    if len(errors) == len(responses):
+        err = errors[0]
+        if isinstance(err, qrc.QRCError):
+            # Extract error message from QRCError and raise ServiceValidationError
+            error_dict = err.error if hasattr(err, 'error') else {}
+            error_code = error_dict.get('code', 'unknown')
+            error_message = error_dict.get('message', str(err))
+            raise ServiceValidationError(
+                f"QRC Error (code {error_code}): {error_message}"
+            ) from err
+        raise ServiceValidationError(f"QRC call failed: {err!r}") from err
+
+    for device_id, response in zip(cores, responses):
+        if isinstance(response, BaseException):
+            _LOGGER.warning("Call to device %s failed: %r", device_id, response)
+    return dict(zip(cores, responses))
+
+
+def call_method_response(data, responses):
+    """Service response of call_method for the responses of async_call_cores.
+
+    A single device gets the QRC response of its method, or the results of
+    its calls, as before several devices could be called at once. For
+    several devices the entry of each is keyed by device id under "devices".
+    """
+    if CALL_METHOD_CALLS not in data and len(responses) == 1:
+        (response,) = responses.values()
+        return response
+
+    result = _calls_result if CALL_METHOD_CALLS in data else _call_result
+    entries = {device_id: result(response) for device_id, response in responses.items()}
+    if len(entries) == 1:
+        (entry,) = entries.values()
+        return entry
+    return {"devices": entries}
+
+
+def _calls_result(results):
+    """Service response entry of the calls of one device."""
+    if isinstance(results, BaseException):
+        return _call_result(results)
+    return {"results": [_call_result(result) for result in results]}
+
+
+def _call_result(result):
+    """Service response entry of one call of a batched call_method."""
+    if isinstance(result, qrc.QRCError):
+        return {"error": result.error}
+    if isinstance(result, BaseException):
+        return {"error": {"message": repr(result)}}
+    return {"result": result.get("result")}
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Your controller/hub specific code."""
     # Data that you want to share with your platforms
@@ -275,65 +537,113 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
             _LOGGER.error("Invalid %s configuration: %s", DOMAIN, ex)
             return False
 
-    hass.data[DOMAIN] = {CONF_CONFIG: domain_conf, CONF_CACHED_CORES: {}}
+    hass.data[DOMAIN] = {
+        CONF_CONFIG: domain_conf,
+        CONF_CACHED_CORES: {},
+        CONF_CACHED_CHANGE_GROUPS: {},
+        CONF_CACHED_METADATA: {},
+        CONF_CACHED_CONTROL_STATES: {},
+    }
 
-    async def handle_call_method(call: ServiceCall):
-        """Handle the service call."""
+    def core_names_for_devices(device_ids):
+        """Return the core name of each Q-SYS device id, skipping unknown devices."""
         registry = dr.async_get(hass)
+        core_names = {}
+        for device_id in device_ids:
+            device: dr.DeviceEntry = registry.devices.get(device_id, None)
+            for config_entry_id in device.config_entries if device else ():
+                config_entry = hass.data[DOMAIN][CONF_CONFIG_ENTRIES].get(
+                    config_entry_id
+                )
+                if not config_entry:
+                    continue
+                core_name = config_entry.data.get(CONF_USER_DATA, {}).get(
+                    CONF_CORE_NAME
+                )
+                if core_name in hass.data[DOMAIN][CONF_CACHED_CORES]:
+                    core_names[device_id] = core_name
+        return core_names
 
+    async def handle_call_method(call: ServiceCall):
+        """Handle the service call."""
         _LOGGER.info("Call request: %s", call.data)
 
-        config_entry_ids = set()
-
         device_ids = call.data.get(CALL_METHOD_DEVICE_ID, [])
         # support single string device_id as well as list of device_ids
         if isinstance(device_ids, str):
             device_ids = [device_ids]
 
-        for device_id in device_ids:
-            device: dr.DeviceEntry = registry.devices.get(device_id, None)
-
-            for config_entry_id in device.config_entries:
-                config_entry_ids.add(config_entry_id)
-
-        if not config_entry_ids:
+        core_names = core_names_for_devices(device_ids)
+        cores = {
+            device_id: hass.data[DOMAIN][CONF_CACHED_CORES][core_name]
+            for device_id, core_name in core_names.items()
+        }
+        if not cores:
             raise ServiceValidationError("No matching Q-SYS device found for call")
 
-        for config_entry_id in config_entry_ids:
-            config_entry = hass.data[DOMAIN][CONF_CONFIG_ENTRIES].get(config_entry_id)
-
-            if not config_entry:
-                continue
-
-        core: qrc.Core = hass.data[DOMAIN][CONF_CACHED_CORES].get(
-            config_entry.data.get(CONF_USER_DATA, {}).get(CONF_CORE_NAME)
+        responses = await async_call_cores(
+            cores,
+            call.data,
+            {
+                device_id: request_timeout_for_core(hass, core_name)
+                for device_id, core_name in core_names.items()
+            },
         )
-
-        method = call.data.get(CALL_METHOD_NAME)
-        params = call.data.get(CALL_METHOD_PARAMS)
-
-        try:
-            response = await core.call(method, params)
-            _LOGGER.debug("Call response: %s", response)
-            if call.return_response:
-                return response
-            return
-        except qrc.QRCError as err:
-            # Extract error message from QRCError and raise ServiceValidationError
-            error_dict = err.error if hasattr(err, 'error') else {}
-            error_code = error_dict.get('code', 'unknown')
-            error_message = error_dict.get('message', str(err))
-            raise ServiceValidationError(
-                f"QRC Error (code {error_code}): {error_message}"
-            ) from err
+        _LOGGER.debug("Call responses: %s", responses)
+        if call.return_response:
+            return call_method_response(call.data, responses)
+        return
 
     hass.services.async_register(
         DOMAIN,
         "call_method",
         handle_call_method,
+        schema=CALL_METHOD_SCHEMA,
         supports_response=SupportsResponse.OPTIONAL,
     )
 
+    async def handle_get_controls(call: ServiceCall):
+        """Return control values, from the change group state where possible."""
+        device_id = call.data[CALL_METHOD_DEVICE_ID]
+        core_name = core_names_for_devices([device_id]).get(device_id)
+        if core_name is None:
+            raise ServiceValidationError("No matching Q-SYS device found for call")
+
+        components = await async_read_controls(
+            hass.data[DOMAIN][CONF_CACHED_CORES][core_name],
+            hass.data[DOMAIN][CONF_CACHED_CONTROL_STATES].get(core_name),
+            [
+                (control[CONF_COMPONENT], control[CONF_CONTROL])
+                for control in call.data[CALL_CONTROLS]
+            ],
+            call.data.get(CALL_MAX_AGE),
+            request_timeout_for_core(hass, core_name),
+        )
+        return {"components": components}
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_controls",
+        handle_get_controls,
+        schema=vol.Schema(
+            {
+                vol.Required(CALL_METHOD_DEVICE_ID): str,
+                vol.Required(CALL_CONTROLS): [
+                    vol.Schema(
+                        {
+                            vol.Required(CONF_COMPONENT): str,
+                            vol.Required(CONF_CONTROL): str,
+                        }
+                    )
+                ],
+                vol.Optional(CALL_MAX_AGE): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
     # TODO: set up values in hass.data to be used by async setup entry?
     # may use https://github.com/home-assistant/core/blob/dev/homeassistant/components/knx/__init__.py#L210
     # for inspiration
@@ -361,8 +671,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data[DOMAIN].setdefault(CONF_CONFIG_ENTRIES, {})[entry.entry_id] = entry
 
     user_data = entry.data[CONF_USER_DATA]
-    c = qrc.Core(user_data[CONF_HOST])
     core_name = user_data[CONF_CORE_NAME]
+    core_config = config_for_core(hass, core_name)
+    change_group_config = core_config.get(CONF_CHANGEGROUP) or {}
+    keepalive_config = core_config.get(CONF_KEEPALIVE) or {}
+    request_timeout = request_timeout_for_core(hass, core_name)
+    c = qrc.Core(
+        user_data[CONF_HOST],
+        # calls without a timeout of their own wait for reconnects by default
+        default_timeout=core_config.get(CONF_CALL_TIMEOUT),
+        keepalive_interval=keepalive_config.get(CONF_KEEPALIVE_INTERVAL, 15.0),
+        keepalive_timeout=request_timeout,
+        keepalive_max_missed=keepalive_config.get(CONF_KEEPALIVE_MAX_MISSED, 3),
+    )
 
     # set up automatic logon
     async def logon():
@@ -378,6 +699,32 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # use design name? might be harder for the user?
     hass.data[DOMAIN][CONF_CACHED_CORES][core_name] = c
 
+    # last known control values, kept up to date by the change group
+    control_states = ControlStateStore()
+    hass.data[DOMAIN][CONF_CACHED_CONTROL_STATES][core_name] = control_states
+
+    # a change group per poll tier, platforms register their controls into them
+    change_groups = changegroup.create_change_group_for_core(
+        c, change_group_config, core_name, control_states=control_states
+    )
+    # stopped in async_unload_entry, while the core is still running
+    hass.data[DOMAIN][CONF_CACHED_CHANGE_GROUPS][core_name] = change_groups
+
+    # components and controls of the design, served from disk while revalidating
+    metadata_cache = await metadata.async_load_metadata_cache(
+        hass, c, core_name, request_timeout
+    )
+    hass.data[DOMAIN][CONF_CACHED_METADATA][core_name] = metadata_cache
+    entry.async_on_unload(
+        c.subscribe_notification("EngineStatus", metadata_cache.on_engine_status)
+    )
+    entry.async_on_unload(metadata_cache.close)
+    entry.async_create_background_task(
+        hass,
+        metadata_cache.async_revalidate_from_core(),
+        f"{DOMAIN}_{core_name}_metadata_revalidation",
+    )
+
     registry = dr.async_get(hass)
     # TODO: reconcile with docs https://developers.home-assistant.io/docs/device_registry_index
     # TODO: use name_by_user?
@@ -400,6 +747,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             registry.async_remove_device(de.id)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # started once all platforms registered their controls, so that each
+    # change group is created with one AddComponentControl per component
+    change_groups.start()
 
     async def _reload_integration(call: ServiceCall) -> None:
         """Reload the integration."""
@@ -417,6 +767,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.data[DOMAIN][CONF_CACHED_CORES].pop(
             entry.data[CONF_USER_DATA][CONF_CORE_NAME], None
         )
+        change_groups = hass.data[DOMAIN][CONF_CACHED_CHANGE_GROUPS].pop(
+            entry.data[CONF_USER_DATA][CONF_CORE_NAME], None
+        )
+        if change_groups is not None:
+            # no poll may run once the core is torn down by the unload callbacks
+            await change_groups.stop()
+        hass.data[DOMAIN][CONF_CACHED_METADATA].pop(
+            entry.data[CONF_USER_DATA][CONF_CORE_NAME], None
+        )
+        hass.data[DOMAIN][CONF_CACHED_CONTROL_STATES].pop(
+            entry.data[CONF_USER_DATA][CONF_CORE_NAME], None
+        )
 
         hass.data[DOMAIN].setdefault(CONF_CONFIG_ENTRIES, {}).pop(entry.entry_id, None)
 
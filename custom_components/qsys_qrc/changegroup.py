@@ -1,24 +1,158 @@
 import asyncio
+import fnmatch
 import logging
 from enum import Enum, auto
 import contextlib
 
 from .qsys import qrc
-from .const import CONF_POLL_INTERVAL, CONF_REQUEST_TIMEOUT
+from .const import (
+    CONF_AUTO_POLL,
+    CONF_POLL_INTERVAL,
+    CONF_POLL_INTERVAL_MAX,
+    CONF_POLL_INTERVAL_MIN,
+    CONF_POLL_TIER_CONTROLS,
+    CONF_POLL_TIERS,
+    CONF_REQUEST_TIMEOUT,
+    DEFAULT_POLL_TIER,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def create_change_group_for_platform(core, change_group_config, platform):
-    change_group_config = change_group_config or {}
-    return ChangeGroupPoller(
-        core,
-        f"{platform}_platform",
-        change_group_config.get(CONF_POLL_INTERVAL, 1.0),
-        change_group_config.get(CONF_REQUEST_TIMEOUT, 5.0),
+def _combine_deadbands(deadbands):
+    """Deadband of a control shared by subscriptions, the most sensitive one wins."""
+    return (
+        min(absolute or 0.0 for absolute, _ in deadbands),
+        min(relative or 0.0 for _, relative in deadbands),
     )
 
 
+# keys of a change that follow its Value
+_VALUE_KEYS = frozenset({"Value", "String", "Position"})
+
+
+def _within_deadband(last, change, deadband):
+    """Whether a change is identical to the last one, or only moved its Value a little."""
+    if last == change:
+        return True
+    absolute, relative = deadband
+    last_value, value = last.get("Value"), change.get("Value")
+    if not (absolute or relative) or not (
+        isinstance(last_value, (int, float)) and isinstance(value, (int, float))
+    ):
+        return False
+    if any(
+        last.get(key) != change.get(key)
+        for key in last.keys() | change.keys()
+        if key not in _VALUE_KEYS
+    ):
+        # e.g. Choices or Legend changed
+        return False
+    return abs(value - last_value) < max(absolute, relative * abs(last_value))
+
+
+def _split_handlers(listeners):
+    """Return (sync, async) tuples of listeners, classified once up front."""
+    return (
+        tuple(
+            listener
+            for listener in listeners
+            if not asyncio.iscoroutinefunction(listener)
+        ),
+        tuple(
+            listener for listener in listeners if asyncio.iscoroutinefunction(listener)
+        ),
+    )
+
+
+def create_change_group_for_core(
+    core, change_group_config, core_name, *, control_states=None
+):
+    """Create the change groups shared by all platforms of a core.
+
+    The change_group config itself describes the default tier, every entry
+    of its tiers gets a change group of its own polled at its own rate.
+    """
+    change_group_config = change_group_config or {}
+    request_timeout = change_group_config.get(CONF_REQUEST_TIMEOUT, 5.0)
+
+    def create_poller(change_group_name, tier_config):
+        return ChangeGroupPoller(
+            core,
+            change_group_name,
+            tier_config.get(CONF_POLL_INTERVAL, 1.0),
+            request_timeout,
+            auto_poll=tier_config.get(CONF_AUTO_POLL, False),
+            min_poll_interval=tier_config.get(CONF_POLL_INTERVAL_MIN),
+            max_poll_interval=tier_config.get(CONF_POLL_INTERVAL_MAX),
+            control_states=control_states,
+        )
+
+    pollers = {
+        DEFAULT_POLL_TIER: create_poller(
+            f"{core_name}_change_group", change_group_config
+        )
+    }
+    tier_patterns = []
+    for tier, tier_config in (change_group_config.get(CONF_POLL_TIERS) or {}).items():
+        if tier != DEFAULT_POLL_TIER:
+            pollers[tier] = create_poller(
+                f"{core_name}_change_group_{tier}", tier_config
+            )
+        tier_patterns.extend(
+            (pattern, tier) for pattern in tier_config.get(CONF_POLL_TIER_CONTROLS, [])
+        )
+    return ChangeGroupHub(pollers, tier_patterns)
+
+
+class ChangeGroupHub:
+    """The change groups of a core, one per poll tier.
+
+    Controls are polled by the tier given for their entity, else by the
+    first tier with a control name pattern matching them, else by the
+    default tier. All tiers feed the same ControlStateStore.
+    """
+
+    def __init__(self, pollers, tier_patterns=()):
+        self.pollers = pollers
+        self._tier_patterns = list(tier_patterns)  # (fnmatch pattern, tier)
+
+    def tier_for(self, control_name, tier=None):
+        if tier is None:
+            for pattern, pattern_tier in self._tier_patterns:
+                if fnmatch.fnmatchcase(control_name, pattern):
+                    tier = pattern_tier
+                    break
+            else:
+                return DEFAULT_POLL_TIER
+        if tier not in self.pollers:
+            _LOGGER.warning(
+                "Unknown poll tier %s for %s, using %s",
+                tier,
+                control_name,
+                DEFAULT_POLL_TIER,
+            )
+            return DEFAULT_POLL_TIER
+        return tier
+
+    def poller_for(self, control_name, tier=None):
+        """Return the ChangeGroupPoller that polls a control."""
+        return self.pollers[self.tier_for(control_name, tier)]
+
+    def start(self):
+        """Start the pollers of the tiers that have controls, idempotent."""
+        for poller in self.pollers.values():
+            if poller.has_controls():
+                poller.start()
+
+    async def stop(self):
+        await asyncio.gather(*(poller.stop() for poller in self.pollers.values()))
+
+    def poll_stats(self):
+        """Return the poll statistics of every tier by tier name."""
+        return {tier: poller.poll_stats() for tier, poller in self.pollers.items()}
+
+
 class PollerState(Enum):
     IDLE = auto()          # Not started
     STARTING = auto()      # Waiting for core connectivity & creating CG
@@ -32,20 +166,66 @@ class ChangeGroupPoller:
     Responsibilities:
     - Wait for Core connection
     - (Re)create change group after reconnect
-    - Poll for changes at interval
+    - Poll for changes at interval, or let the Core push them (AutoPoll)
+    - Optionally adapt the poll interval to the activity of the group
     - Notify listeners
     - Resilient against timeouts, QRCError, generic exceptions
     """
 
-    def __init__(self, core: qrc.Core, change_group_name, poll_interval, request_timeout):
+    def __init__(
+        self,
+        core: qrc.Core,
+        change_group_name,
+        poll_interval,
+        request_timeout,
+        *,
+        auto_poll=False,
+        min_poll_interval=None,
+        max_poll_interval=None,
+        max_concurrent_requests=8,
+        control_states=None,
+    ):
         self.core = core
         self._listeners_component_control = []  # (listener, filter)
+        self._listeners_component_control_index = {}  # (component, control) -> (sync, async)
         self._listeners_run_loop_iteration_ending = []
         self._listeners_component_control_changes = {}  # (component, control) -> [listeners]
+        # (component, control) -> [commit callbacks], see subscribe_component_control_changes
+        self._commit_listeners = {}
+        # (component, control) -> [(absolute, relative) deadband of each subscription]
+        self._deadbands = {}
+        # (component, control) -> (sync, async, commit, deadband), rebuilt on subscribe
+        self._dispatch_table = {}
+        # (component, control) -> change last passed to listeners
+        self._last_dispatched = {}
+        # (key, listener, commit) of late subscribers to controls already reported
+        self._replays = []
+        self._suppressed_changes = 0
         self._change_group_name = change_group_name
         self.cg = None
         self._poll_interval = poll_interval
         self._request_timeout = request_timeout
+        # adaptive polling: back to the floor as soon as a poll returns changes,
+        # doubling up to the ceiling while the group is idle
+        self._min_poll_interval = (
+            poll_interval if min_poll_interval is None else min_poll_interval
+        )
+        self._max_poll_interval = (
+            poll_interval if max_poll_interval is None else max_poll_interval
+        )
+        self._current_poll_interval = poll_interval
+        # polls run on a fixed-rate schedule, ticks missed by a slow poll are skipped
+        self._missed_deadlines = 0
+        # bounds the pipelined AddComponentControl requests when (re)creating
+        self._max_concurrent_requests = max_concurrent_requests
+        # ControlStateStore updated with every change before listeners run
+        self.control_states = control_states
+
+        # AutoPoll: the core pushes change sets which are queued by the reader
+        # and dispatched from the run loop
+        self._auto_poll = auto_poll
+        self._auto_poll_results = asyncio.Queue()
+        self._unsubscribe_auto_poll = None
 
         # state & coordination
         self._state = PollerState.IDLE
@@ -65,21 +245,73 @@ class ChangeGroupPoller:
             if new_state in (PollerState.IDLE, PollerState.STOPPING):
                 self._started_event.clear()
 
+    @property
+    def poll_interval(self):
+        """Interval chosen for the next poll."""
+        return self._current_poll_interval
+
+    def poll_stats(self):
+        """Return the current poll interval and the number of skipped poll ticks."""
+        return {
+            "interval": self._current_poll_interval,
+            "missed_deadlines": self._missed_deadlines,
+            "suppressed_changes": self._suppressed_changes,
+        }
+
+    def _next_poll_deadline(self, deadline, change_count, now):
+        """Return the loop time of the next poll after the one due at `deadline`.
+
+        Deadlines stay on the grid of the interval so that the period does
+        not drift with the poll latency. If the poll overran one or more
+        deadlines they are skipped rather than polled back to back.
+        """
+        interval = self._next_poll_interval(change_count)
+        deadline += interval
+        if deadline <= now:
+            missed = int((now - deadline) // interval) + 1
+            self._missed_deadlines += missed
+            deadline += missed * interval
+        return deadline
+
+    def _next_poll_interval(self, change_count):
+        if change_count:
+            interval = self._min_poll_interval
+        else:
+            interval = min(
+                max(self._current_poll_interval, self._min_poll_interval) * 2,
+                self._max_poll_interval,
+            )
+        self._current_poll_interval = max(interval, self._min_poll_interval)
+        return self._current_poll_interval
+
     async def wait_until_running(self, timeout=None):
         await asyncio.wait_for(self._started_event.wait(), timeout)
 
+    def has_controls(self):
+        return bool(self._listeners_component_control_changes)
+
     def subscribe_component_control(self, listener, filter):
         self._listeners_component_control.append((listener, filter))
+        self._listeners_component_control_index.clear()
 
     async def _fire_on_component_control(self, component, control):
-        for listener, filter in self._listeners_component_control:
-            if filter(component, control):
-                if asyncio.iscoroutine(listener) or asyncio.iscoroutinefunction(
+        # filters are evaluated once per control
+        handlers = self._listeners_component_control_index.get((component, control))
+        if handlers is None:
+            handlers = self._listeners_component_control_index[
+                (component, control)
+            ] = _split_handlers(
+                [
                     listener
-                ):
-                    await listener(self, component, control)
-                else:
-                    listener(self, component, control)
+                    for listener, filter in self._listeners_component_control
+                    if filter(component, control)
+                ]
+            )
+        sync_handlers, async_handlers = handlers
+        for listener in sync_handlers:
+            listener(self, component, control)
+        for listener in async_handlers:
+            await listener(self, component, control)
 
     def subscribe_run_loop_iteration_ending(self, listener):
         self._listeners_run_loop_iteration_ending.append(listener)
@@ -92,22 +324,53 @@ class ChangeGroupPoller:
                 listener(self)
 
     async def subscribe_component_control_changes(
-        self, listener, component_name, control_name
+        self,
+        listener,
+        component_name,
+        control_name,
+        *,
+        commit=None,
+        deadband=None,
+        deadband_relative=None,
     ):
-        self._listeners_component_control_changes.setdefault(
-            (component_name, control_name), []
-        ).append(listener)
+        """Call listener(poller, change) for every change of the control.
+
+        `commit` is called once at the end of each batch of changes (one poll
+        or push) that had changes for any control it was subscribed with, e.g.
+        to write the state of an entity once after applying all its changes.
+
+        Changes identical to the last one passed to the listeners are dropped,
+        as are numeric changes smaller than `deadband` or than
+        `deadband_relative` times the last value. When several subscriptions
+        of a control ask for a deadband, the smallest one applies.
+        """
+        key = (component_name, control_name)
+        listeners = self._listeners_component_control_changes.setdefault(key, [])
+        listeners.append(listener)
+        commits = self._commit_listeners.setdefault(key, [])
+        if commit is not None and commit not in commits:
+            commits.append(commit)
+        deadbands = self._deadbands.setdefault(key, [])
+        deadbands.append((deadband, deadband_relative))
+        self._dispatch_table[key] = (
+            *_split_handlers(listeners),
+            tuple(commits),
+            _combine_deadbands(deadbands),
+        )
 
-        # If change group already created, add control immediately (best-effort)
-        if self.cg:
+        if self.cg and len(listeners) > 1:
+            # the control is already part of the group and the core will not
+            # report it again until it changes, so the last change is replayed
+            # to the new listener with the next batch
+            self._replays.append((key, listener, commit))
+        # If change group already created, add control immediately (best-effort).
+        elif self.cg:
             try:
-                await asyncio.wait_for(
-                    self.cg.add_component_control(
-                        {
-                            "Name": component_name,
-                            "Controls": [{"Name": control_name}],
-                        }
-                    ),
+                await self.cg.add_component_control(
+                    {
+                        "Name": component_name,
+                        "Controls": [{"Name": control_name}],
+                    },
                     timeout=self._request_timeout,
                 )
             except Exception as ex:  # noqa: BLE001
@@ -118,20 +381,10 @@ class ChangeGroupPoller:
                     repr(ex),
                 )
 
-    async def _fire_on_component_control_change(self, change):
-        component_name = change["Component"]
-        control_name = change["Name"]
-
-        for listener in self._listeners_component_control_changes.get(
-            (component_name, control_name), []
-        ):
-            if asyncio.iscoroutine(listener) or asyncio.iscoroutinefunction(listener):
-                await listener(self, change)
-            else:
-                listener(self, change)
-
     async def _create_or_recreate_change_group(self):
         self.cg = self.core.change_group(self._change_group_name)
+        # a new group reports all its controls, which must reach the listeners
+        self._last_dispatched.clear()
         _LOGGER.info(
             "%s: creating changegroup with %d controls, poll interval: %f, request timeout: %f",
             self._change_group_name,
@@ -140,34 +393,164 @@ class ChangeGroupPoller:
             self._request_timeout,
         )
         self._creation_count += 1
-        # add all subscribed controls
-        for (component_name, control_name), _listeners in self._listeners_component_control_changes.items():
+        self._stop_auto_poll()
+
+        # add all subscribed controls, one request per component
+        controls_by_component = {}
+        for component_name, control_name in self._listeners_component_control_changes:
+            controls_by_component.setdefault(component_name, []).append(control_name)
+
+        semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+        await asyncio.gather(
+            *(
+                self._add_component_controls(semaphore, component_name, control_names)
+                for component_name, control_names in controls_by_component.items()
+            )
+        )
+
+        if self._auto_poll:
+            await self._start_auto_poll()
+
+    async def _add_component_controls(self, semaphore, component_name, control_names):
+        async with semaphore:
             try:
-                await asyncio.wait_for(
-                    self.cg.add_component_control(
-                        {
-                            "Name": component_name,
-                            "Controls": [{"Name": control_name}],
-                        }
-                    ),
+                await self.cg.add_component_control(
+                    {
+                        "Name": component_name,
+                        "Controls": [{"Name": name} for name in control_names],
+                    },
                     timeout=self._request_timeout,
                 )
             except Exception as ex:  # noqa: BLE001
                 _LOGGER.warning(
-                    "%s: unable to add control %s/%s: %s",
+                    "%s: unable to add %d controls of %s: %s",
                     self._change_group_name,
+                    len(control_names),
                     component_name,
-                    control_name,
                     repr(ex),
                 )
 
+    async def _start_auto_poll(self):
+        self._unsubscribe_auto_poll = self.core.subscribe_change_group_push(
+            self._change_group_name, self._auto_poll_results.put_nowait
+        )
+        await self.cg.auto_poll(self._poll_interval, timeout=self._request_timeout)
+
+    def _stop_auto_poll(self):
+        if self._unsubscribe_auto_poll:
+            self._unsubscribe_auto_poll()
+            self._unsubscribe_auto_poll = None
+        # results pushed for a previous change group are stale
+        while not self._auto_poll_results.empty():
+            self._auto_poll_results.get_nowait()
+
     async def _poll_once(self):
+        """Poll the change group, returning the number of changes."""
         if not self.cg:
-            return
-        poll_result = await asyncio.wait_for(self.cg.poll(), timeout=self._request_timeout)
+            return 0
+        poll_result = await self.cg.poll(timeout=self._request_timeout)
         _LOGGER.debug("%s poll result: %s", self._change_group_name, poll_result)
-        for change in poll_result.get("result", {}).get("Changes", []):
-            await self._fire_on_component_control_change(change)
+        changes = poll_result.get("result", {}).get("Changes", [])
+        await self._dispatch_changes(changes)
+        self._confirm_control_states()
+        return len(changes)
+
+    async def _wait_for_auto_poll_once(self):
+        # bounded wait so that disconnects are noticed, a stop ends it right away
+        get = asyncio.ensure_future(self._auto_poll_results.get())
+        stop = asyncio.ensure_future(self._stop_event.wait())
+        try:
+            await asyncio.wait(
+                (get, stop),
+                timeout=self._poll_interval,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            stop.cancel()
+            if not get.done():
+                get.cancel()
+        if get.cancelled():
+            if self._replays:
+                await self._dispatch_changes([])
+            return
+        push = get.result()
+        _LOGGER.debug("%s auto poll result: %s", self._change_group_name, push)
+        await self._dispatch_changes(push.get("Changes", []))
+        self._confirm_control_states()
+
+    def _confirm_control_states(self):
+        if self.control_states is not None:
+            self.control_states.confirm(self._change_group_name)
+
+    async def _dispatch_changes(self, changes):
+        """Update the control states and notify the listeners of the changes.
+
+        Sync listeners are called in order of the changes, the async ones of
+        all changes then run concurrently. A failing listener is logged without
+        affecting the others. Once all changes are applied, the commit
+        callbacks of the changed controls are called, each once.
+        """
+        control_states = self.control_states
+        dispatch_table = self._dispatch_table
+        last_dispatched = self._last_dispatched
+        pending = []
+        commits = {}  # ordered set
+
+        replays, self._replays = self._replays, []
+        for key, listener, commit in replays:
+            change = last_dispatched.get(key)
+            if change is None:
+                # not reported yet, or the group was recreated and reports it
+                # to all listeners
+                continue
+            if asyncio.iscoroutinefunction(listener):
+                pending.append(listener(self, change))
+            else:
+                self._call_listener(listener, change)
+            if commit is not None:
+                commits[commit] = None
+
+        for change in changes:
+            if control_states is not None:
+                control_states.update(change, self._change_group_name)
+            key = (change["Component"], change["Name"])
+            handlers = dispatch_table.get(key)
+            if handlers is None:
+                continue
+            sync_handlers, async_handlers, commit_handlers, deadband = handlers
+            last = last_dispatched.get(key)
+            if last is not None and _within_deadband(last, change, deadband):
+                self._suppressed_changes += 1
+                continue
+            last_dispatched[key] = change
+            for listener in sync_handlers:
+                self._call_listener(listener, change)
+            for listener in async_handlers:
+                pending.append(listener(self, change))
+            for commit in commit_handlers:
+                commits[commit] = None
+
+        if pending:
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(result, Exception):
+                    self._log_listener_failure(result)
+        for commit in commits:
+            commit()
+
+    def _call_listener(self, listener, change):
+        try:
+            listener(self, change)
+        except Exception as ex:  # noqa: BLE001
+            self._log_listener_failure(ex)
+
+    def _log_listener_failure(self, ex):
+        """Log a failed sync or async change listener, the others still run."""
+        _LOGGER.error(
+            "%s: change listener failed: %s",
+            self._change_group_name,
+            repr(ex),
+            exc_info=ex,
+        )
 
     async def _run_loop(self):
         while not self._stop_event.is_set():
@@ -176,8 +559,12 @@ class ChangeGroupPoller:
                 # Wait for connection; if already connected continues immediately
                 await self.core.wait_until_connected()
                 await self._create_or_recreate_change_group()
+                # a new group reports all its controls, start out fast
+                self._current_poll_interval = self._min_poll_interval
                 await self._set_state(PollerState.RUNNING)
 
+                loop = asyncio.get_running_loop()
+                deadline = loop.time()
                 # inner polling loop; break on disconnection or stop
                 while not self._stop_event.is_set():
                     # If core lost connection, break to outer loop to recreate
@@ -186,8 +573,13 @@ class ChangeGroupPoller:
                         # Clear existing change group reference so recreation definitely occurs
                         self.cg = None
                         break
-                    await self._poll_once()
-                    await asyncio.sleep(self._poll_interval)
+                    if self._auto_poll:
+                        await self._wait_for_auto_poll_once()
+                        continue
+                    change_count = await self._poll_once()
+                    now = loop.time()
+                    deadline = self._next_poll_deadline(deadline, change_count, now)
+                    await self._sleep_unless_stopped(deadline - now)
 
             except TimeoutError as ex:
                 _LOGGER.warning(
@@ -211,15 +603,39 @@ class ChangeGroupPoller:
                     repr(ex),
                 )
             finally:
+                # not polling until the change group is recreated
+                if self.control_states is not None:
+                    self.control_states.expire(self._change_group_name)
                 await self._fire_on_run_loop_iteration_ending()
                 # short pause before attempting to restart after error (unless stopping)
                 if not self._stop_event.is_set():
-                    await asyncio.sleep(self._poll_interval)
+                    await self._sleep_unless_stopped(self._poll_interval)
 
         await self._set_state(PollerState.STOPPING)
+        await self._destroy_auto_poll_change_group()
         self.cg = None
         await self._set_state(PollerState.IDLE)
 
+    async def _sleep_unless_stopped(self, delay):
+        """Sleep for `delay` seconds, returning early when stop() is called."""
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._stop_event.wait(), delay)
+
+    async def _destroy_auto_poll_change_group(self):
+        if not self._auto_poll:
+            return
+        self._stop_auto_poll()
+        if self.cg and self.core._connected_event.is_set():
+            # the core keeps pushing until the change group is destroyed
+            try:
+                await self.cg.destroy(timeout=self._request_timeout)
+            except Exception as ex:  # noqa: BLE001
+                _LOGGER.debug(
+                    "%s: unable to destroy change group: %s",
+                    self._change_group_name,
+                    repr(ex),
+                )
+
     def start(self):
         if self._loop_task and not self._loop_task.done():
             return self._loop_task
@@ -236,8 +652,12 @@ class ChangeGroupPoller:
         """
         self._stop_event.set()
         if self._loop_task:
-            # Allow loop to exit naturally (bounded by one poll + sleep)
-            graceful_timeout = self._poll_interval + self._request_timeout + 0.2
+            # Allow loop to exit naturally, the wait between polls ends on
+            # the stop event so only a poll in flight can hold it up
+            graceful_timeout = self._request_timeout + 0.2
+            if self._auto_poll:
+                # leave room for destroying the change group
+                graceful_timeout += self._request_timeout
             try:
                 await asyncio.wait_for(self._loop_task, timeout=graceful_timeout)
             except TimeoutError:
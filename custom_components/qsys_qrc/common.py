@@ -1,4 +1,6 @@
+import asyncio
 import re
+import time
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry, entity
@@ -20,11 +22,44 @@ def config_for_core(hass, core_name):
     return hass.data[DOMAIN].get(CONF_CONFIG, {}).get(CONF_CORES, {}).get(core_name, {})
 
 
+def request_timeout_for_core(hass, core_name):
+    """Seconds to wait for a response of the core, from its change group config."""
+    change_group_config = config_for_core(hass, core_name).get(CONF_CHANGEGROUP) or {}
+    return change_group_config.get(CONF_REQUEST_TIMEOUT, 5.0)
+
+
+def change_group_for_core(hass, core_name):
+    return hass.data[DOMAIN].get(CONF_CACHED_CHANGE_GROUPS, {}).get(core_name)
+
+
+def metadata_for_core(hass, core_name):
+    return hass.data[DOMAIN].get(CONF_CACHED_METADATA, {}).get(core_name)
+
+
+def control_states_for_core(hass, core_name):
+    return hass.data[DOMAIN].get(CONF_CACHED_CONTROL_STATES, {}).get(core_name)
+
+
 _camel_pattern = re.compile(r"(?<!^)(?=[A-Z])")
+_attribute_names = {}  # change key -> attribute name
+
+# change keys kept as attributes in the minimal mode
+_MINIMAL_ATTRIBUTE_KEYS = frozenset({"Component", "Name", "Value", "String", "Position"})
+
+
+def attribute_name(key):
+    """Attribute name of a change key, e.g. "Indeterminate" -> "indeterminate"."""
+    name = _attribute_names.get(key)
+    if name is None:
+        name = _attribute_names[key] = _camel_pattern.sub("_", key).lower()
+    return name
 
 
 class QSysComponentBase(entity.Entity):
     _attr_should_poll = False
+    _min_write_interval = None  # seconds between state writes, see set_max_update_rate
+    _last_write = None
+    _trailing_write = None
 
     def __init__(
         self,
@@ -38,6 +73,7 @@ class QSysComponentBase(entity.Entity):
         super().__init__()
         self._core_name = core_name
         self.core = core
+        self.control_states = control_states_for_core(hass, core_name)
         self._attr_unique_id = unique_id
         extra_attrs = {}
         # for k, v in control.items():
@@ -55,13 +91,77 @@ class QSysComponentBase(entity.Entity):
 
         self._attr_name = entity_name
 
+    def control_value(self, control, default=None):
+        """Last value of a control of the component received from the core."""
+        if self.control_states is None:
+            return default
+        return self.control_states.value(self.component, control, default)
+
+    def set_max_update_rate(self, max_update_rate):
+        """Limit state writes of changes to max_update_rate per second, None for no limit."""
+        self._min_write_interval = 1.0 / max_update_rate if max_update_rate else None
+
+    def async_write_ha_state_throttled(self):
+        """Write the state, at most at the configured max update rate.
+
+        Writes within the minimum interval of the previous one are merged
+        into a single trailing write, so the latest state always lands.
+        """
+        if self._min_write_interval is None:
+            self.async_write_ha_state()
+            return
+        if self._trailing_write is not None:
+            # the pending write picks up the latest state
+            return
+        now = time.monotonic()
+        if self._last_write is None or now - self._last_write >= self._min_write_interval:
+            self._write_state_now()
+            return
+        self._trailing_write = asyncio.get_running_loop().call_later(
+            self._last_write + self._min_write_interval - now, self._write_state_now
+        )
+
+    def _write_state_now(self):
+        self._trailing_write = None
+        self._last_write = time.monotonic()
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._trailing_write is not None:
+            self._trailing_write.cancel()
+            self._trailing_write = None
+        await super().async_will_remove_from_hass()
+
     def on_core_polling_ending(self, poller):
         self._attr_available = False
         self.async_write_ha_state()
 
 
+class UnrecordedValueAttributes:
+    """Leaves the value attributes of a control entity out of the recorder.
+
+    Mixed into the entity classes used outside of the full attribute mode,
+    see control_entity_class.
+    """
+
+    # change with every poll and duplicate the state of the entity
+    _unrecorded_attributes = frozenset({"value", "string", "position"})
+
+
+def control_entity_class(entity_class, unrecorded_class, mode):
+    """Entity class for an extra_attributes mode.
+
+    Entity combines _unrecorded_attributes per class, so the mode picks the
+    class: the full mode records everything as before.
+    """
+    if (mode or EXTRA_ATTRIBUTES_FULL) == EXTRA_ATTRIBUTES_FULL:
+        return entity_class
+    return unrecorded_class
+
+
 class QSysComponentControlBase(QSysComponentBase):
     _attr_available = False
+    _extra_attributes = EXTRA_ATTRIBUTES_FULL
 
     def __init__(
         self,
@@ -76,19 +176,25 @@ class QSysComponentControlBase(QSysComponentBase):
         super().__init__(hass, core_name, core, unique_id, entity_name, component)
         self.control = control
 
+    def set_extra_attributes(self, mode):
+        """Select which change keys become attributes: none, minimal or full."""
+        self._extra_attributes = mode or EXTRA_ATTRIBUTES_FULL
+
     async def on_core_change(self, core, change):
         self._attr_available = True
-        extra_attrs = {}
 
-        # TODO: it's not clear whether this is a problem or not (data size storage for attributes mentioned in a tip
-        # at https://developers.home-assistant.io/docs/core/entity/sensor
-        for k, v in change.items():
-            extra_attrs[_camel_pattern.sub("_", k).lower()] = v
-        self._attr_extra_state_attributes.update(extra_attrs)
+        # see the tip about attribute sizes at https://developers.home-assistant.io/docs/core/entity/sensor
+        mode = self._extra_attributes
+        if mode != EXTRA_ATTRIBUTES_NONE:
+            extra_attrs = self._attr_extra_state_attributes
+            for k, v in change.items():
+                if mode == EXTRA_ATTRIBUTES_FULL or k in _MINIMAL_ATTRIBUTE_KEYS:
+                    extra_attrs[attribute_name(k)] = v
 
         # TODO: is this really async?
         await self.on_control_changed(core, change)
-        self.async_write_ha_state()
+        # the state is written once per batch of changes, see the commit
+        # argument of ChangeGroupPoller.subscribe_component_control_changes
 
     async def on_control_changed(self, core, change):
         pass
@@ -96,4 +202,5 @@ class QSysComponentControlBase(QSysComponentBase):
     async def update_control(self, control_values):
         payload = {"Name": self.control}
         payload.update(**control_values)
-        await self.core.component().set(self.component, controls=[payload])
+        # rapid updates, e.g. from dragging a slider, only send the latest value
+        await self.core.component().set_coalesced(self.component, controls=[payload])
@@ -3,6 +3,9 @@
 DOMAIN = "qsys_qrc"
 
 CONF_CACHED_CORES = "qsys_qrc_cores"
+CONF_CACHED_CHANGE_GROUPS = "qsys_qrc_change_groups"
+CONF_CACHED_METADATA = "qsys_qrc_metadata"
+CONF_CACHED_CONTROL_STATES = "qsys_qrc_control_states"
 
 CONF_CORES = "cores"
 CONF_PLATFORMS = "platforms"
@@ -24,7 +27,20 @@ CONF_CONFIG = "qsys_qrc_config"
 
 CONF_CHANGEGROUP = "change_group"
 CONF_POLL_INTERVAL = "poll_interval"
+CONF_POLL_INTERVAL_MIN = "poll_interval_min"
+CONF_POLL_INTERVAL_MAX = "poll_interval_max"
 CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_AUTO_POLL = "auto_poll"
+CONF_POLL_TIERS = "tiers"
+CONF_POLL_TIER_CONTROLS = "controls"
+CONF_POLL_TIER = "poll_tier"
+DEFAULT_POLL_TIER = "normal"
+
+CONF_CALL_TIMEOUT = "call_timeout"
+
+CONF_KEEPALIVE = "keepalive"
+CONF_KEEPALIVE_INTERVAL = "interval"
+CONF_KEEPALIVE_MAX_MISSED = "max_missed"
 
 CONF_FILTER = "filter"
 CONF_EXCLUDE_COMPONENT_CONTROL = "exclude_component_control"
@@ -59,9 +75,28 @@ CALL_METHOD_DEVICE_ID = "device_id"
 CALL_METHOD_ENTITY_ID = "entity_id"
 CALL_METHOD_NAME = "method"
 CALL_METHOD_PARAMS = "params"
+CALL_METHOD_CALLS = "calls"
+CALL_METHOD_ORDERED = "ordered"
+CALL_METHOD_TIMEOUT = "timeout"
+CALL_CONTROLS = "controls"
+CALL_MAX_AGE = "max_age"
 
 CONF_SENSOR_ATTRIBUTE = "attribute"
 
+CONF_DEADBAND = "deadband"
+CONF_DEADBAND_RELATIVE = "deadband_relative"
+CONF_MAX_UPDATE_RATE = "max_update_rate"
+CONF_EXTRA_ATTRIBUTES = "extra_attributes"
+
+EXTRA_ATTRIBUTES_NONE = "none"
+EXTRA_ATTRIBUTES_MINIMAL = "minimal"
+EXTRA_ATTRIBUTES_FULL = "full"
+EXTRA_ATTRIBUTES_MODES = [
+    EXTRA_ATTRIBUTES_NONE,
+    EXTRA_ATTRIBUTES_MINIMAL,
+    EXTRA_ATTRIBUTES_FULL,
+]
+
 CONF_USER_DATA = "user_data"
 CONF_ENGINE_STATUS = "engine_status"
 
@@ -0,0 +1,170 @@
+"""Last known state of the controls of a core, fed by its change groups."""
+import asyncio
+import time
+
+
+class ControlState:
+    """Last known state of a single control.
+
+    `version` is incremented on every change received for the control, so
+    readers can tell whether a value was updated since they last looked.
+    `source` names the change group that reports the control, see
+    ControlStateStore.confirmed_at.
+    """
+
+    __slots__ = ("value", "string", "position", "version", "updated_at", "source")
+
+    def __init__(self):
+        self.value = None
+        self.string = None
+        self.position = None
+        self.version = 0
+        self.updated_at = None  # time.monotonic() of the last change
+        self.source = None
+
+    def as_dict(self):
+        return {
+            "value": self.value,
+            "string": self.string,
+            "position": self.position,
+            "version": self.version,
+        }
+
+
+class ControlStateStore:
+    """In-memory store of control states of a core, keyed by (component, control).
+
+    Change groups only report changes, so the state of a control is as
+    recent as the last poll or push of the change group reporting it, not
+    its last change. Each change group confirms its controls after every
+    successful poll or push, and expires them when it stops polling, e.g.
+    on a disconnect.
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._confirmed_at = {}  # source -> time.monotonic() of its last poll
+
+    def __len__(self):
+        """Return the number of controls with a known state."""
+        return len(self._states)
+
+    def update(self, change, source=None):
+        """Apply a change group change and return the updated ControlState."""
+        key = (change["Component"], change["Name"])
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = ControlState()
+        state.value = change.get("Value")
+        state.string = change.get("String")
+        state.position = change.get("Position")
+        state.version += 1
+        state.updated_at = time.monotonic()
+        state.source = source
+        return state
+
+    def confirm(self, source):
+        """Mark the controls reported by `source` as current."""
+        self._confirmed_at[source] = time.monotonic()
+
+    def expire(self, source):
+        """Mark the controls reported by `source` stale until it confirms them again."""
+        self._confirmed_at.pop(source, None)
+
+    def confirmed_at(self, state):
+        """Return the time.monotonic() up to which a state is known to be current.
+
+        None when the change group reporting it is not polling. States
+        without a source are current as of their last change.
+        """
+        if state.source is None:
+            return state.updated_at
+        confirmed_at = self._confirmed_at.get(state.source)
+        if confirmed_at is None:
+            return None
+        return max(confirmed_at, state.updated_at)
+
+    def get(self, component, control):
+        """Return the ControlState of a control, None if no change was received yet."""
+        return self._states.get((component, control))
+
+    def value(self, component, control, default=None):
+        state = self._states.get((component, control))
+        return default if state is None else state.value
+
+    def version(self, component, control):
+        state = self._states.get((component, control))
+        return 0 if state is None else state.version
+
+    def component_states(self, component):
+        """Return the known ControlStates of a component by control name."""
+        return {
+            control: state
+            for (component_name, control), state in self._states.items()
+            if component_name == component
+        }
+
+
+async def async_read_controls(
+    core, control_states, controls, max_age=None, timeout=None
+):
+    """Read controls from the store, falling back to Component.Get.
+
+    `controls` is a list of (component, control) pairs. Controls that are
+    not in the store, no longer polled, or last confirmed by their change
+    group more than `max_age` seconds ago, are read from the core with one
+    Component.Get per component, all sent at once and failing after
+    `timeout` seconds. Returns {component: {control: state}} where state
+    has the value, string, position, age in seconds (None when read from
+    the core) and source ("cache" or "core"), or an error message if the
+    read failed.
+    """
+    now = time.monotonic()
+    result = {}
+    stale = {}  # component -> control names
+    for component, control in controls:
+        confirmed_at = None
+        if control_states is not None:
+            state = control_states.get(component, control)
+            if state is not None:
+                confirmed_at = control_states.confirmed_at(state)
+        age = None if confirmed_at is None else round(now - confirmed_at, 3)
+        if age is None or (max_age is not None and age > max_age):
+            stale.setdefault(component, []).append(control)
+            continue
+        result.setdefault(component, {})[control] = {
+            "value": state.value,
+            "string": state.string,
+            "position": state.position,
+            "age": age,
+            "source": "cache",
+        }
+
+    components = list(stale)
+    responses = await asyncio.gather(
+        *(
+            core.component().get(
+                component,
+                [{"Name": control} for control in stale[component]],
+                timeout=timeout,
+            )
+            for component in components
+        ),
+        return_exceptions=True,
+    )
+    for component, response in zip(components, responses):
+        states = result.setdefault(component, {})
+        if isinstance(response, BaseException):
+            error = getattr(response, "error", None) or {"message": repr(response)}
+            for control in stale[component]:
+                states[control] = {"error": error.get("message", repr(response))}
+            continue
+        for control in response["result"]["Controls"]:
+            states[control["Name"]] = {
+                "value": control.get("Value"),
+                "string": control.get("String"),
+                "position": control.get("Position"),
+                "age": None,
+                "source": "core",
+            }
+    return result
@@ -26,8 +26,13 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.util.dt import utcnow
 
-from . import changegroup
-from .common import QSysComponentBase, id_for_component, config_for_core
+from .common import (
+    QSysComponentBase,
+    id_for_component,
+    change_group_for_core,
+    config_for_core,
+    metadata_for_core,
+)
 from .const import *  # pylint: disable=unused-wildcard-import,wildcard-import
 from .qsys import qrc
 
@@ -61,16 +66,14 @@ async def async_setup_entry_safe(
     entities = {}
 
     core_config = config_for_core(hass, core_name)
-    # can platform name be more dynamic than this?
-    poller = changegroup.create_change_group_for_platform(
-        core, core_config.get(CONF_CHANGEGROUP), PLATFORM
-    )
+    # the change groups are shared by all platforms of the core
+    change_groups = change_group_for_core(hass, core_name)
 
     # TODO: this is a little hard to reload at the moment, do via listener instead?
-    # TODO: timeouts for remote calls like these?
-    components = await core.component().get_components()
+    metadata_cache = metadata_for_core(hass, core_name)
+    components = await metadata_cache.get_components()
     component_by_name = {}
-    for component in components["result"]:
+    for component in components:
         component_by_name[component["Name"]] = component
 
     for media_player_config in core_config.get(CONF_PLATFORMS, {}).get(
@@ -118,30 +121,33 @@ async def async_setup_entry_safe(
             raise PlatformNotReady(msg)
 
         if media_player_entity.unique_id not in entities:
+            media_player_entity.set_max_update_rate(media_player_config[CONF_MAX_UPDATE_RATE])
             entities[media_player_entity.unique_id] = media_player_entity
             async_add_entities([media_player_entity])
 
-            poller.subscribe_run_loop_iteration_ending(
-                media_player_entity.on_core_polling_ending
-            )
+            controls = await metadata_cache.get_controls(component_name)
 
-            get_controls_result = await core.component().get_controls(component_name)
-
-            for control in get_controls_result["result"]["Controls"]:
+            pollers = []
+            for control in controls:
                 # avoid polling peak levels for media players because we're not utilizing them on the HA side
                 if control["Name"].endswith(".peak.level"):
                     continue
+                poller = change_groups.poller_for(
+                    control["Name"], media_player_config[CONF_POLL_TIER]
+                )
+                if poller not in pollers:
+                    pollers.append(poller)
+                    poller.subscribe_run_loop_iteration_ending(
+                        media_player_entity.on_core_polling_ending
+                    )
+                # the state is written once per batch of changes
                 await poller.subscribe_component_control_changes(
                     media_player_entity.on_changed,
                     component_name,
                     control["Name"],
+                    commit=media_player_entity.async_write_ha_state_throttled,
                 )
 
-    if len(entities) > 0:
-        # TODO: handle poll exceptions, disconnections and re-connections
-        polling = asyncio.create_task(poller.run_while_core_running())
-        entry.async_on_unload(lambda: polling.cancel() and None)
-
     for entity_entry in er.async_entries_for_config_entry(
         er.async_get(hass), entry.entry_id
     ):
@@ -176,8 +182,6 @@ class QRCUrlReceiverEntity(QSysComponentBase, MediaPlayerEntity):
 
         self._attr_device_class = device_class
 
-        self._qsys_state = {}
-
     def on_changed(self, core, change):
         _LOGGER.debug("Media player control %s changed: %s", self.unique_id, change)
 
@@ -186,12 +190,11 @@ class QRCUrlReceiverEntity(QSysComponentBase, MediaPlayerEntity):
         name = change["Name"]
         value = change["Value"]
 
-        self._qsys_state[name] = change
-
         if name == "track.name" or name == "url":
-            self._attr_media_title = self._qsys_state.get(
-                "track_name", self._qsys_state.get("url", {})
-            ).get("String")
+            state = self.control_states.get(
+                self.component, "track_name"
+            ) or self.control_states.get(self.component, "url")
+            self._attr_media_title = state.string if state else None
 
         elif name in ("channel.1.gain", "channel.2.gain"):
             # TODO: should iterate over channels instead, and not hard-code names
@@ -204,10 +207,9 @@ class QRCUrlReceiverEntity(QSysComponentBase, MediaPlayerEntity):
             self._attr_is_volume_muted = value == 1.0
 
         self._update_state()
-        self.async_write_ha_state()
 
     def _update_state(self):
-        enabled = self._qsys_state.get("enable", {}).get("Value", None) == 1.0
+        enabled = self.control_value("enable") == 1.0
         if not enabled:
             self._attr_state = MediaPlayerState.OFF
             return
@@ -222,7 +224,7 @@ class QRCUrlReceiverEntity(QSysComponentBase, MediaPlayerEntity):
         }
 
         self._attr_state = status_to_state.get(
-            self._qsys_state.get("status", {}).get("Value", None), MediaPlayerState.ON
+            self.control_value("status"), MediaPlayerState.ON
         )
 
     async def async_turn_on(self) -> None:
@@ -245,7 +247,7 @@ class QRCUrlReceiverEntity(QSysComponentBase, MediaPlayerEntity):
         )
 
     async def async_set_volume_level(self, volume: float) -> None:
-        await self.core.component().set(
+        await self.core.component().set_coalesced(
             self.component,
             [
                 {"Name": "channel.1.gain", "Position": volume * POSITION_0DB},
@@ -316,8 +318,6 @@ class QRCAudioFilePlayerEntity(QSysComponentBase, MediaPlayerEntity):
 
         self._attr_device_class = device_class
 
-        self._qsys_state = {}
-
         self._browse_lock = asyncio.Lock()
 
     def on_changed(self, core, change):
@@ -330,8 +330,6 @@ class QRCAudioFilePlayerEntity(QSysComponentBase, MediaPlayerEntity):
         name = change["Name"]
         value = change["Value"]
 
-        self._qsys_state[name] = change
-
         if name == "track.name":
             self._attr_media_title = value
 
@@ -350,26 +348,24 @@ class QRCAudioFilePlayerEntity(QSysComponentBase, MediaPlayerEntity):
             self._attr_media_position = change["Value"]
             self._attr_media_position_updated_at = utcnow()
 
-            self._attr_media_duration = self._qsys_state.get("progress", {}).get(
-                "Value", 0
-            ) + self._qsys_state.get("remaining", {}).get("Value", 0)
+            self._attr_media_duration = self.control_value(
+                "progress", 0
+            ) + self.control_value("remaining", 0)
 
         elif name == "remaining":
-            self._attr_media_duration = self._qsys_state.get("progress", {}).get(
-                "Value", 0
-            ) + self._qsys_state.get("remaining", {}).get("Value", 0)
+            self._attr_media_duration = self.control_value(
+                "progress", 0
+            ) + self.control_value("remaining", 0)
 
         if name in ["playing", "stopped", "pause", "progress", "remaining", "status"]:
             self._update_state()
 
-        self.async_write_ha_state()
-
     def _update_state(self):
-        if self._qsys_state.get("playing", {}).get("Value", 0.0) == 1.0:
+        if self.control_value("playing", 0.0) == 1.0:
             self._attr_state = MediaPlayerState.PLAYING
-        elif self._qsys_state.get("stopped", {}).get("Value", 0.0) == 1.0:
+        elif self.control_value("stopped", 0.0) == 1.0:
             self._attr_state = MediaPlayerState.IDLE
-        elif self._qsys_state.get("paused", {}).get("Value", 0.0) == 1.0:
+        elif self.control_value("paused", 0.0) == 1.0:
             self._attr_state = MediaPlayerState.PAUSED
         else:
             # TODO: include "status" field values?
@@ -404,7 +400,7 @@ class QRCAudioFilePlayerEntity(QSysComponentBase, MediaPlayerEntity):
         )
 
     async def async_set_volume_level(self, volume: float) -> None:
-        await self.core.component().set(
+        await self.core.component().set_coalesced(
             self.component,
             [
                 {"Name": "gain", "Position": volume * POSITION_0DB},
@@ -449,6 +445,7 @@ class QRCAudioFilePlayerEntity(QSysComponentBase, MediaPlayerEntity):
                     {"Name": "root.ui", "Value": url.path.lstrip("/")},
                     {"Name": "directory.ui", "Value": ""},
                 ],
+                priority=qrc.Priority.BACKGROUND,
             )
 
             title = url.path if url.path.lstrip("/") != "" else "Q-SYS Audio Player"
@@ -470,7 +467,9 @@ class QRCAudioFilePlayerEntity(QSysComponentBase, MediaPlayerEntity):
 
     async def _append_current_directories(self, browser: BrowseMedia, url):
         result = await self.core.component().get(
-            self.component, controls=[{"Name": "directory.ui"}]
+            self.component,
+            controls=[{"Name": "directory.ui"}],
+            priority=qrc.Priority.BACKGROUND,
         )
         directory_names = [
             d for d in result["result"]["Controls"][0].get("Choices") if d
@@ -492,7 +491,9 @@ class QRCAudioFilePlayerEntity(QSysComponentBase, MediaPlayerEntity):
 
     async def _append_current_filenames(self, browser: BrowseMedia, url):
         result = await self.core.component().get(
-            self.component, controls=[{"Name": "filename.ui"}]
+            self.component,
+            controls=[{"Name": "filename.ui"}],
+            priority=qrc.Priority.BACKGROUND,
         )
         filenames = result["result"]["Controls"][0].get("Choices")
 
@@ -576,8 +577,6 @@ class QRCGainEntity(QSysComponentBase, MediaPlayerEntity):
 
         self._attr_device_class = device_class
 
-        self._qsys_state = {}
-
     def on_changed(self, core, change):
         _LOGGER.debug("Media player control %s changed: %s", self.unique_id, change)
 
@@ -586,8 +585,6 @@ class QRCGainEntity(QSysComponentBase, MediaPlayerEntity):
         name = change["Name"]
         value = change["Value"]
 
-        self._qsys_state[name] = change
-
         if name == "gain":
             # TODO: should iterate over channels instead, and not hard-code names
             self._attr_volume_level = max(
@@ -598,8 +595,6 @@ class QRCGainEntity(QSysComponentBase, MediaPlayerEntity):
             # TODO: marks as muted even if only one channel is muted, should iterate over channels
             self._attr_is_volume_muted = value == 1.0
 
-        self.async_write_ha_state()
-
     async def async_mute_volume(self, mute: bool) -> None:
         await self.core.component().set(
             self.component,
@@ -609,7 +604,7 @@ class QRCGainEntity(QSysComponentBase, MediaPlayerEntity):
         )
 
     async def async_set_volume_level(self, volume: float) -> None:
-        await self.core.component().set(
+        await self.core.component().set_coalesced(
             self.component,
             [
                 {"Name": "gain", "Position": volume * POSITION_0DB},
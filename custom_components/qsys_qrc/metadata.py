@@ -0,0 +1,164 @@
+"""Persistent cache of the components and controls of a core's design."""
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .qsys import qrc
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+
+async def async_load_metadata_cache(
+    hass: HomeAssistant, core: qrc.Core, core_name, request_timeout=None
+):
+    """Create the metadata cache of a core, loaded from HA storage."""
+    store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{core_name}.metadata")
+    cache = DesignMetadataCache(hass, core, store, request_timeout)
+    await cache.async_load()
+    return cache
+
+
+class DesignMetadataCache:
+    """Components and controls of a design, keyed by its DesignCode.
+
+    Cached metadata is served right away, the design is revalidated in the
+    background whenever the core reports its DesignCode (StatusGet or
+    EngineStatus). When the design changed, only the components whose
+    GetComponents entry changed lose their cached controls.
+
+    Requests to the core fail with TimeoutError after `request_timeout`
+    seconds, also while it is disconnected.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, core: qrc.Core, store, request_timeout=None
+    ):
+        self.hass = hass
+        self.core = core
+        self._store = store
+        self._request_timeout = request_timeout
+        self._design_code = None
+        self._components = None  # GetComponents result
+        self._controls = {}  # component name -> GetControls result controls
+        self._revalidate_lock = asyncio.Lock()
+        self._revalidate_tasks = set()
+
+    @property
+    def design_code(self):
+        return self._design_code
+
+    async def async_load(self):
+        data = await self._store.async_load()
+        if not data or not data.get("design_code"):
+            # metadata of an unknown design cannot be revalidated
+            return
+        self._design_code = data.get("design_code")
+        self._components = data.get("components")
+        self._controls = data.get("controls", {})
+
+    def _data_to_save(self):
+        return {
+            "design_code": self._design_code,
+            "components": self._components,
+            "controls": self._controls,
+        }
+
+    def _schedule_save(self):
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def get_components(self):
+        """Return the components of the design, from the cache if possible."""
+        if self._components is None:
+            response = await self.core.component().get_components(
+                timeout=self._request_timeout
+            )
+            self._components = response["result"]
+            self._schedule_save()
+        return self._components
+
+    async def get_controls(self, component_name):
+        """Return the controls of a component, from the cache if possible."""
+        controls = self._controls.get(component_name)
+        if controls is None:
+            response = await self.core.component().get_controls(
+                component_name, timeout=self._request_timeout
+            )
+            controls = self._controls[component_name] = response["result"]["Controls"]
+            self._schedule_save()
+        return controls
+
+    def on_engine_status(self, params):
+        """EngineStatus notification handler, revalidates on a new DesignCode."""
+        design_code = params.get("DesignCode")
+        if design_code and design_code != self._design_code:
+            # serialized by the revalidate lock, each one is kept until done
+            task = self.hass.async_create_background_task(
+                self.async_revalidate(design_code),
+                f"{DOMAIN}_metadata_revalidation",
+            )
+            self._revalidate_tasks.add(task)
+            task.add_done_callback(self._revalidate_tasks.discard)
+
+    def close(self):
+        """Cancel the revalidations still running in the background."""
+        for task in self._revalidate_tasks:
+            task.cancel()
+        self._revalidate_tasks.clear()
+
+    async def async_revalidate_from_core(self):
+        """Revalidate against the DesignCode reported by StatusGet."""
+        try:
+            status = await self.core.status_get(timeout=self._request_timeout)
+        except (TimeoutError, qrc.QRCError) as ex:
+            # revalidated from the EngineStatus sent on the next connect instead
+            _LOGGER.debug("Unable to get design status: %s", repr(ex))
+            return
+        await self.async_revalidate(status.get("result", {}).get("DesignCode"))
+
+    async def async_revalidate(self, design_code):
+        if not design_code:
+            return
+        async with self._revalidate_lock:
+            if design_code == self._design_code:
+                return
+            if self._design_code is None:
+                # nothing was loaded from storage, so anything cached was
+                # fetched from the running design
+                self._design_code = design_code
+                self._schedule_save()
+                return
+
+            try:
+                response = await self.core.component().get_components(
+                    timeout=self._request_timeout
+                )
+            except (TimeoutError, qrc.QRCError) as ex:
+                # keep serving the cached design, the next DesignCode retries
+                _LOGGER.warning("Unable to revalidate design metadata: %s", repr(ex))
+                return
+            components = response["result"]
+            previous = {c["Name"]: c for c in self._components or []}
+            current = {c["Name"]: c for c in components}
+            changed = [
+                name
+                for name in self._controls
+                if current.get(name) is None or current[name] != previous.get(name)
+            ]
+            for name in changed:
+                del self._controls[name]
+            _LOGGER.info(
+                "Design changed from %s to %s, invalidated controls of %d components",
+                self._design_code,
+                design_code,
+                len(changed),
+            )
+
+            self._design_code = design_code
+            self._components = components
+            self._schedule_save()
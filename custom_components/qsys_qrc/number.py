@@ -1,7 +1,6 @@
 """Platform for number integration."""
 from __future__ import annotations
 
-import asyncio
 import decimal
 import logging
 import math
@@ -14,8 +13,14 @@ from homeassistant.helpers import template
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers import entity_registry as er
 
-from . import changegroup
-from .common import QSysComponentControlBase, id_for_component_control, config_for_core
+from .common import (
+    QSysComponentControlBase,
+    UnrecordedValueAttributes,
+    control_entity_class,
+    id_for_component_control,
+    change_group_for_core,
+    config_for_core,
+)
 from .const import *
 from .qsys import qrc
 
@@ -41,10 +46,8 @@ async def async_setup_entry(
     entities = {}
 
     core_config = config_for_core(hass, core_name)
-    # can platform name be more dynamic than this?
-    poller = changegroup.create_change_group_for_platform(
-        core, core_config.get(CONF_CHANGEGROUP), PLATFORM
-    )
+    # the change groups are shared by all platforms of the core
+    change_groups = change_group_for_core(hass, core_name)
 
     exclude_component_controls = core_config.get(CONF_FILTER, {}).get(
         CONF_EXCLUDE_COMPONENT_CONTROL, []
@@ -78,7 +81,10 @@ async def async_setup_entry(
         if value_template:
             value_template = template.Template(value_template, hass)
 
-        control_number_entity = QRCNumberEntity(
+        entity_class = control_entity_class(
+            QRCNumberEntity, QRCNumberEntityUnrecordedValues, number_config[CONF_EXTRA_ATTRIBUTES]
+        )
+        control_number_entity = entity_class(
             hass,
             core_name,
             core,
@@ -104,9 +110,14 @@ async def async_setup_entry(
         )
 
         if control_number_entity.unique_id not in entities:
+            control_number_entity.set_extra_attributes(number_config[CONF_EXTRA_ATTRIBUTES])
+            control_number_entity.set_max_update_rate(number_config[CONF_MAX_UPDATE_RATE])
             entities[control_number_entity.unique_id] = control_number_entity
             async_add_entities([control_number_entity])
 
+            poller = change_groups.poller_for(
+                control_name, number_config[CONF_POLL_TIER]
+            )
             poller.subscribe_run_loop_iteration_ending(
                 control_number_entity.on_core_polling_ending
             )
@@ -114,12 +125,11 @@ async def async_setup_entry(
                 control_number_entity.on_core_change,
                 component_name,
                 control_name,
+                commit=control_number_entity.async_write_ha_state_throttled,
+                deadband=number_config[CONF_DEADBAND],
+                deadband_relative=number_config[CONF_DEADBAND_RELATIVE],
             )
 
-    if len(entities) > 0:
-        polling = asyncio.create_task(poller.run_while_core_running())
-        entry.async_on_unload(lambda: polling.cancel() and None)
-
     for entity_entry in er.async_entries_for_config_entry(
         er.async_get(hass), entry.entry_id
     ):
@@ -238,3 +248,7 @@ class QRCNumberEntity(QSysComponentControlBase, NumberEntity):
             })
 
         await self.update_control({"Value": value})
+
+
+class QRCNumberEntityUnrecordedValues(UnrecordedValueAttributes, QRCNumberEntity):
+    """QRCNumberEntity of the minimal and none attribute modes."""
@@ -1,8 +1,16 @@
 import asyncio
+import collections
 import contextlib
+import heapq
+import itertools
 import json
 import logging
-from enum import Enum, auto
+from enum import Enum, IntEnum, auto
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -10,6 +18,12 @@ DELIMITER = b"\0"
 
 PORT = 1710
 
+# request ids are allocated from 0 to ID_SPACE - 1 and wrap around
+ID_SPACE = 65535
+
+# upper bound for a single frame, large designs have multi-megabyte GetComponents responses
+DEFAULT_MAX_FRAME_SIZE = 64 * 1024 * 1024
+
 error_codes = {
     -32700: "Parse error. Invalid JSON was received by the server.",
     -32600: "Invalid request. The JSON sent is not a valid Request object.",
@@ -33,6 +47,124 @@ class QRCError(Exception):
         self.error = err
 
 
+class JSONCodec:
+    """Encodes and decodes QRC messages using the standard library json module."""
+
+    name = "json"
+
+    def encode(self, data) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode("utf8")
+
+    def decode(self, raw):
+        if isinstance(raw, memoryview):
+            raw = raw.tobytes()
+        return json.loads(raw)
+
+
+class OrjsonCodec(JSONCodec):
+    """Encodes and decodes QRC messages using orjson."""
+
+    name = "orjson"
+
+    def encode(self, data) -> bytes:
+        return orjson.dumps(data)
+
+    def decode(self, raw):
+        return orjson.loads(raw)
+
+
+def default_codec() -> JSONCodec:
+    """Return the fastest codec available."""
+    if orjson is not None:
+        return OrjsonCodec()
+    return JSONCodec()
+
+
+class QRCProtocol(asyncio.Protocol):
+    """Splits the NUL-delimited QRC byte stream into frames.
+
+    Incoming data accumulates in a single growable buffer. Complete frames are
+    handed to on_frame as memoryview slices of that buffer, which are only
+    valid for the duration of the call.
+
+    `closed` resolves with the reason the connection ended: None for a clean
+    EOF, otherwise the exception.
+    """
+
+    def __init__(
+        self,
+        on_frame,
+        *,
+        max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+        on_resume_writing=None,
+    ):
+        self._on_frame = on_frame
+        self._max_frame_size = max_frame_size
+        self._on_resume_writing = on_resume_writing
+        self.paused = False  # transport write buffer is above its high-water mark
+        self._buffer = bytearray()
+        self._scanned = 0  # buffer prefix known not to contain a delimiter
+        self.transport = None
+        self.closed = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        buffer = self._buffer
+        buffer += data
+
+        end = buffer.find(DELIMITER, self._scanned)
+        start = 0
+        if end != -1:
+            try:
+                with memoryview(buffer) as view:
+                    while end != -1:
+                        # released explicitly, tracebacks may still reference the slice
+                        with view[start:end] as frame:
+                            self._on_frame(frame)
+                        start = end + 1
+                        end = buffer.find(DELIMITER, start)
+            except Exception as ex:  # noqa: BLE001
+                self._abort(ex)
+                return
+            del buffer[:start]
+        self._scanned = len(buffer)
+
+        if self._scanned > self._max_frame_size:
+            self._abort(
+                QRCError(
+                    {
+                        "code": -1,
+                        "message": f"frame exceeds {self._max_frame_size} bytes",
+                    }
+                )
+            )
+
+    def pause_writing(self):
+        self.paused = True
+
+    def resume_writing(self):
+        self.paused = False
+        if self._on_resume_writing:
+            self._on_resume_writing()
+
+    def eof_received(self):
+        # let the transport close itself, which calls connection_lost
+        return False
+
+    def connection_lost(self, exc):
+        self._buffer.clear()
+        self._scanned = 0
+        if not self.closed.done():
+            self.closed.set_result(exc)
+
+    def _abort(self, exc):
+        if not self.closed.done():
+            self.closed.set_result(exc)
+        self.transport.abort()
+
+
 class ConnectionState(Enum):
     """Connection state for the Q-Sys Core."""
 
@@ -42,6 +174,14 @@ class ConnectionState(Enum):
     STOPPING = auto()
 
 
+class Priority(IntEnum):
+    """Order in which queued requests are sent, lower values first."""
+
+    INTERACTIVE = 0  # user initiated, e.g. Component.Set from a dashboard
+    POLL = 1  # change group polling
+    BACKGROUND = 2  # metadata, media browsing and change group registration
+
+
 class Core:
     """Q-Sys Core connection manager with JSON-RPC support.
 
@@ -51,6 +191,19 @@ class Core:
     - backoff_max: maximum reconnect delay
     - connect_timeout: timeout used for initial asyncio.open_connection
     - sleep_func: injectable sleep coroutine (defaults to asyncio.sleep)
+    - codec: message codec (defaults to the fastest available, see default_codec)
+    - max_frame_size: largest message accepted from the core, in bytes
+    - default_timeout: timeout for calls that do not pass their own (None waits forever)
+    - keepalive_interval: send NoOp after this many idle seconds (None disables)
+    - keepalive_timeout: how long to wait for the NoOp response
+    - keepalive_max_missed: consecutive missed keepalives before reconnecting
+    - keepalive_rtt_samples: number of round-trip times kept for keepalive_stats
+    - max_in_flight: requests sent without a response yet, further ones are
+      queued by priority
+    - starvation_limit: times a queued request may be passed over by higher
+      priority ones before it is sent anyway
+    - set_coalesce_window: seconds after a set during which
+      ComponentAPI.set_coalesced collects further values of the component
     """
 
     def __init__(
@@ -63,6 +216,16 @@ class Core:
         backoff_max: float = 60.0,
         connect_timeout: float = 5.0,
         sleep_func=asyncio.sleep,
+        codec: JSONCodec | None = None,
+        max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+        default_timeout: float | None = None,
+        keepalive_interval: float | None = None,
+        keepalive_timeout: float = 5.0,
+        keepalive_max_missed: int = 3,
+        keepalive_rtt_samples: int = 100,
+        max_in_flight: int = 8,
+        starvation_limit: int = 8,
+        set_coalesce_window: float = 0.05,
     ):
         self._host = host
         self._port = port
@@ -76,16 +239,41 @@ class Core:
         self._stop_event = asyncio.Event()
 
         # Connection resources
-        self._reader = None
-        self._writer = None
-        self._reader_task = None
+        self._transport = None
+        self._protocol = None
+        self._max_frame_size = max_frame_size
+        self._last_sent = 0.0
+        self._last_received = 0.0
 
         # RPC state
         self._id = 0
         self._pending = {}
+        # start times of in-flight calls, in allocation order
+        self._pending_since = {}
+        self._pending_high_water = 0
+        self._orphaned_responses = 0
+        self._default_timeout = default_timeout
+        # (deadline, seq, id, future) heap, expired by a single timer
+        self._deadlines = []
+        self._deadline_seq = itertools.count()
+        self._deadline_timer = None
+
+        # Outbound scheduling, one queue of (id, payload) per priority
+        self._max_in_flight = max_in_flight
+        self._starvation_limit = starvation_limit
+        self._in_flight = set()
+        self._outbound = tuple(collections.deque() for _ in Priority)
+        self._passed_over = [0] * len(Priority)
+        self._set_coalescer = SetCoalescer(self, set_coalesce_window)
+        self._shared_calls = {}  # (method, encoded params) -> task
 
         # Hooks
         self._on_connected_commands = []
+        self._notification_handlers = {}  # method -> tuple of handlers
+        self._change_group_push_listeners = {}  # change group id -> listener
+        self.subscribe_notification(
+            "ChangeGroup.Poll", self._process_change_group_push
+        )
 
         # Timing configuration
         self._backoff_initial = backoff_initial
@@ -94,14 +282,114 @@ class Core:
         self._connect_timeout = connect_timeout
         self._sleep = sleep_func
 
+        # Keepalive
+        self._keepalive_interval = keepalive_interval
+        self._keepalive_timeout = keepalive_timeout
+        self._keepalive_max_missed = keepalive_max_missed
+        self._keepalive_rtts = collections.deque(maxlen=keepalive_rtt_samples)
+        self._keepalive_missed = 0
+
+        self._codec = codec or default_codec()
+
     def set_on_connected_commands(self, commands: list):
         """Set commands to execute when connected."""
         self._on_connected_commands = commands
 
+    def subscribe_notification(self, method, handler):
+        """Call handler with the params of every notification for method.
+
+        Notifications are messages without an id pushed by the core, such as
+        EngineStatus or AutoPoll change sets. Handlers are plain callables
+        invoked directly as frames are received, so they must not block. Returns a
+        callable that removes the handler.
+        """
+        # handlers are stored as tuples so dispatch can iterate without copying
+        self._notification_handlers[method] = (
+            *self._notification_handlers.get(method, ()),
+            handler,
+        )
+
+        def unsubscribe():
+            handlers = self._notification_handlers.get(method, ())
+            if handler in handlers:
+                remaining = tuple(h for h in handlers if h is not handler)
+                if remaining:
+                    self._notification_handlers[method] = remaining
+                else:
+                    del self._notification_handlers[method]
+
+        return unsubscribe
+
+    def subscribe_change_group_push(self, change_group_id, listener):
+        """Route change sets pushed for an auto-polled change group to listener.
+
+        The listener is called with the notification params (``Id`` and
+        ``Changes``) as frames are received. Returns a callable that removes it.
+        """
+        self._change_group_push_listeners[change_group_id] = listener
+
+        def unsubscribe():
+            if self._change_group_push_listeners.get(change_group_id) is listener:
+                del self._change_group_push_listeners[change_group_id]
+
+        return unsubscribe
+
     def _generate_id(self):
-        """Generate a unique request ID."""
-        self._id = (self._id + 1) % 65535
-        return self._id
+        """Generate a request ID that is not used by any in-flight request."""
+        for _ in range(ID_SPACE):
+            self._id = (self._id + 1) % ID_SPACE
+            if self._id not in self._pending:
+                return self._id
+        raise QRCError({"code": -1, "message": "no free request id"})
+
+    def pending_stats(self):
+        """Return statistics about the requests awaiting a response.
+
+        - depth: number of in-flight requests
+        - high_water: largest depth seen since the core was created
+        - orphaned_responses: responses received without a matching request,
+          typically answers arriving after their call timed out
+        - oldest_age: seconds the oldest in-flight request has been waiting,
+          None when there are none
+        """
+        oldest_age = None
+        for started in self._pending_since.values():
+            oldest_age = asyncio.get_running_loop().time() - started
+            break
+        return {
+            "depth": len(self._pending),
+            "high_water": self._pending_high_water,
+            "orphaned_responses": self._orphaned_responses,
+            "oldest_age": oldest_age,
+        }
+
+    def keepalive_stats(self):
+        """Return round-trip statistics of the recent keepalives, in seconds.
+
+        Percentiles are computed over the last keepalive_rtt_samples round
+        trips and are None until the first keepalive has been answered.
+        `missed` counts the consecutive keepalives without a response.
+        """
+        rtts = sorted(self._keepalive_rtts)
+        stats = {
+            "samples": len(rtts),
+            "missed": self._keepalive_missed,
+            "last": self._keepalive_rtts[-1] if rtts else None,
+            "min": None,
+            "p50": None,
+            "p95": None,
+            "max": None,
+        }
+        if rtts:
+            stats.update(
+                {
+                    "min": rtts[0],
+                    "p50": rtts[(len(rtts) - 1) // 2],
+                    "p95": rtts[round((len(rtts) - 1) * 0.95)],
+                    "max": rtts[-1],
+                }
+            )
+        return stats
 
     async def get_state(self) -> ConnectionState:
         """Get current connection state."""
@@ -132,13 +420,22 @@ class Core:
         """Establish connection to Q-Sys core."""
         await self._set_state(ConnectionState.CONNECTING)
         _LOGGER.info("Connecting to %s:%d", self._host, self._port)
-        # TODO: make limit configurable
-        opening = asyncio.open_connection(
-            self._host, self._port, limit=5 * 1024 * 1024,
+        opening = asyncio.get_running_loop().create_connection(
+            self._create_protocol, self._host, self._port
         )
-        self._reader, self._writer = await asyncio.wait_for(opening, self._connect_timeout)
+        self._transport, self._protocol = await asyncio.wait_for(
+            opening, self._connect_timeout
+        )
+        self._last_sent = self._last_received = asyncio.get_running_loop().time()
         _LOGGER.info("Connected")
 
+    def _create_protocol(self):
+        return QRCProtocol(
+            self._on_frame,
+            max_frame_size=self._max_frame_size,
+            on_resume_writing=self._send_queued,
+        )
+
     async def _execute_on_connected_commands(self):
         """Execute commands that should run when connected."""
         for cmd in self._on_connected_commands:
@@ -159,31 +456,34 @@ class Core:
 
     async def _cleanup_connection(self):
         """Clean up connection resources and pending requests."""
-        # Cancel reader task if running
-        if self._reader_task and not self._reader_task.done():
-            _LOGGER.debug("Cancelling reader task")
-            self._reader_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self._reader_task
-
-        self._reader_task = None
-
-        # Close writer
-        if self._writer:
+        # Close transport
+        if self._transport:
             try:
-                _LOGGER.info("Closing writer")
-                self._writer.close()
-                await self._writer.wait_closed()
+                _LOGGER.info("Closing transport")
+                self._transport.close()
             except Exception as ex:
-                _LOGGER.exception("Unable to close writer: %s", repr(ex))
+                _LOGGER.exception("Unable to close transport: %s", repr(ex))
+
+        # Release the connection cycle even if the transport never reports the loss
+        if self._protocol and not self._protocol.closed.done():
+            self._protocol.closed.set_result(None)
 
-        self._writer = None
-        self._reader = None
+        self._transport = None
+        self._protocol = None
 
         # Fail pending requests
         pending = list(self._pending.items())
         # Clear pending dict to prevent memory leaks
         self._pending.clear()
+        self._pending_since.clear()
+        self._deadlines.clear()
+        if self._deadline_timer:
+            self._deadline_timer.cancel()
+            self._deadline_timer = None
+        self._in_flight.clear()
+        for queue in self._outbound:
+            queue.clear()
+        self._passed_over = [0] * len(Priority)
 
         for _request_id, future in pending:
             if not future.done():
@@ -195,12 +495,11 @@ class Core:
 
     async def _handle_connection_cycle(self):
         """Handle a single connection attempt and its lifecycle."""
+        keepalive_task = None
         try:
-            # Connect to the core
+            # Connect to the core, frames are dispatched by the protocol from here on
             await self.connect()
-
-            # Start reader task
-            self._reader_task = asyncio.create_task(self._read_forever())
+            protocol = self._protocol
 
             # Mark as connected (this resolves the race condition)
             await self._set_state(ConnectionState.CONNECTED)
@@ -208,8 +507,14 @@ class Core:
             # Execute on-connected commands
             await self._execute_on_connected_commands()
 
-            # Wait for reader to finish (disconnect or error)
-            await self._reader_task
+            if self._keepalive_interval:
+                keepalive_task = asyncio.create_task(self._keepalive_loop(protocol))
+
+            # Wait for the connection to end (disconnect or error)
+            reason = await protocol.closed
+            if reason is not None:
+                raise reason
+            raise EOFError()
 
         except EOFError:
             _LOGGER.info("EOF from core at [%s]", self._host)
@@ -230,8 +535,56 @@ class Core:
         except Exception as ex:
             _LOGGER.exception("Error in connection cycle: %s", repr(ex))
         finally:
+            if keepalive_task:
+                keepalive_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await keepalive_task
             await self._cleanup_connection()
 
+    async def _keepalive_loop(self, protocol):
+        """Send NoOp whenever the link has been idle for keepalive_interval.
+
+        The link counts as idle when nothing has been sent or nothing has been
+        received, so a half-open connection is noticed even while requests
+        keep being written. After keepalive_max_missed consecutive keepalives
+        without a response the connection is aborted, which triggers a
+        reconnect.
+        """
+        loop = asyncio.get_running_loop()
+        self._keepalive_missed = 0
+        while not protocol.closed.done():
+            idle_since = min(self._last_sent, self._last_received)
+            delay = idle_since + self._keepalive_interval - loop.time()
+            if delay > 0:
+                await self._sleep(delay)
+                continue
+
+            started = loop.time()
+            try:
+                await self.call("NoOp", timeout=self._keepalive_timeout)
+            except TimeoutError:
+                self._keepalive_missed += 1
+                _LOGGER.warning(
+                    "Keepalive to [%s:%d] missed (%d/%d)",
+                    self._host,
+                    self._port,
+                    self._keepalive_missed,
+                    self._keepalive_max_missed,
+                )
+                if self._keepalive_missed >= self._keepalive_max_missed:
+                    # reported as a read timeout by the connection cycle
+                    protocol._abort(TimeoutError("keepalive missed"))
+                    return
+                await self._sleep(self._keepalive_interval)
+            except QRCError as ex:
+                # an error response still proves the link is alive
+                _LOGGER.debug("Keepalive failed: %s", repr(ex))
+                self._keepalive_missed = 0
+                await self._sleep(self._keepalive_interval)
+            else:
+                self._keepalive_missed = 0
+                self._keepalive_rtts.append(loop.time() - started)
+
     async def run_until_stopped(self):
         """Run the core connection manager until stopped."""
         backoff = self._backoff_initial
@@ -268,10 +621,16 @@ class Core:
         self._stop_event.set()
         await self._cleanup_connection()
 
-    async def _send(self, data):
-        """Send JSON-RPC message to core."""
-        # Wait until connected
-        await self.wait_until_connected()
+    async def _send(self, data, deadline=None, priority=Priority.INTERACTIVE):
+        """Send JSON-RPC message to core.
+
+        Requests are written right away while fewer than max_in_flight are
+        awaiting a response, otherwise they are queued by priority.
+        """
+        # Wait until connected, bounded by the deadline of the call if any
+        if not self._connected_event.is_set():
+            async with asyncio.timeout_at(deadline):
+                await self._connected_event.wait()
 
         # Check we're still connected after waiting
         state = await self.get_state()
@@ -279,38 +638,225 @@ class Core:
             raise QRCError({"code": -1, "message": "not connected"})
 
         data.setdefault("jsonrpc", "2.0")
-        _LOGGER.debug("Sending message: %s", json.dumps(data).encode("utf8"))
-        self._writer.write(json.dumps(data).encode("utf8"))
-        self._writer.write(DELIMITER)
+        payload = self._codec.encode(data)
+        id_ = data.get("id")
+        if id_ is not None and (any(self._outbound) or not self._can_write()):
+            # the future tells a timed out entry apart from a reuse of its id
+            self._outbound[priority].append((id_, self._pending.get(id_), payload))
+            return
+        self._write(id_, payload)
+
+    def _can_write(self):
+        if self._protocol is not None and self._protocol.paused:
+            return False
+        return len(self._in_flight) < self._max_in_flight
+
+    def _write(self, id_, payload):
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Sending message: %s", payload)
+        self._transport.writelines((payload, DELIMITER))
+        self._last_sent = asyncio.get_running_loop().time()
+        if id_ is not None:
+            self._in_flight.add(id_)
+
+    def _send_queued(self):
+        while self._transport and self._can_write():
+            entry = self._next_queued()
+            if entry is None:
+                return
+            id_, future, payload = entry
+            # skip requests that timed out or were cancelled while queued
+            if self._pending.get(id_) is future:
+                self._write(id_, payload)
+
+    def _next_queued(self):
+        waiting = [priority for priority in Priority if self._outbound[priority]]
+        if not waiting:
+            return None
+        chosen = waiting[0]
+        for priority in waiting[1:]:
+            if self._passed_over[priority] >= self._starvation_limit:
+                chosen = priority
+                break
+        for priority in waiting:
+            if priority > chosen:
+                self._passed_over[priority] += 1
+        self._passed_over[chosen] = 0
+        return self._outbound[chosen].popleft()
+
+    def _release(self, id_):
+        """Free the in-flight slot of a request and send queued ones."""
+        if id_ in self._in_flight:
+            self._in_flight.discard(id_)
+            if any(self._outbound):
+                self._send_queued()
+
+    async def call(
+        self,
+        method,
+        params=None,
+        *,
+        timeout=None,
+        deadline=None,
+        priority=Priority.INTERACTIVE,
+    ):
+        """Call method on the core and return the response.
 
-    async def call(self, method, params=None):
+        The call fails with TimeoutError once `deadline` (in event loop time)
+        has passed, or `timeout` seconds from now. Without either the
+        connection-wide default_timeout applies. `priority` decides the order
+        in which queued requests are sent, see Priority.
+        """
         params = {} if params is None else params
 
-        future = asyncio.Future()
+        loop = asyncio.get_running_loop()
+        if deadline is None:
+            timeout = self._default_timeout if timeout is None else timeout
+            if timeout is not None:
+                deadline = loop.time() + timeout
+
+        future = loop.create_future()
         id_ = self._generate_id()
         self._pending[id_] = future
+        self._pending_since[id_] = loop.time()
+        self._pending_high_water = max(self._pending_high_water, len(self._pending))
 
         try:
-            await self._send({"method": method, "params": params, "id": id_})
+            await self._send(
+                {"method": method, "params": params, "id": id_}, deadline, priority
+            )
+            if deadline is not None:
+                self._add_deadline(deadline, id_, future)
 
             result = await future
             return result
         finally:
-            self._pending.pop(id_, None)
-
-    async def _read_forever(self):
-        while True:
-            raw_data = await self._reader.readuntil(DELIMITER)
-            data = json.loads(raw_data[:-1])
-            if "id" in data:
-                _LOGGER.debug("Received response: %s", data)
-                await self._process_response(data)
-            else:
-                _LOGGER.debug("Received non-response: %s", data)
+            if self._pending.get(id_) is future:
+                del self._pending[id_]
+            self._pending_since.pop(id_, None)
+            self._release(id_)
+
+    async def call_many(
+        self, calls, *, ordered=False, timeout=None, priority=Priority.INTERACTIVE
+    ):
+        """Call many methods, returning a response or exception per call.
+
+        `calls` is a list of (method, params) pairs. All requests are written
+        to the connection right away in list order, unless `ordered` is set,
+        in which case each call is only sent once the previous one completed.
+        A failing call does not stop the others.
+        """
+        if not ordered:
+            return await asyncio.gather(
+                *(
+                    self.call(method, params, timeout=timeout, priority=priority)
+                    for method, params in calls
+                ),
+                return_exceptions=True,
+            )
+
+        results = []
+        for method, params in calls:
+            try:
+                results.append(
+                    await self.call(method, params, timeout=timeout, priority=priority)
+                )
+            except (TimeoutError, QRCError) as ex:
+                results.append(ex)
+        return results
+
+    async def call_shared(
+        self, method, params=None, *, timeout=None, priority=Priority.INTERACTIVE
+    ):
+        """Call a read-only method, sharing the request with identical concurrent calls.
+
+        While a call with the same method and params is in flight its response
+        is returned instead of sending another request. The response object is
+        shared between the callers and must not be modified. The timeout and
+        priority of the call that sent the request apply to all of them.
+        """
+        params = {} if params is None else params
+        key = (method, self._codec.encode(params))
+        task = self._shared_calls.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(
+                self.call(method, params, timeout=timeout, priority=priority)
+            )
+            self._shared_calls[key] = task
+            task.add_done_callback(lambda _: self._shared_calls.pop(key, None))
+        # cancelling one caller must not cancel the request of the others
+        return await asyncio.shield(task)
+
+    def _add_deadline(self, deadline, id_, future):
+        heapq.heappush(
+            self._deadlines, (deadline, next(self._deadline_seq), id_, future)
+        )
+        if self._deadlines[0][3] is future:
+            self._schedule_deadline_timer()
+
+    def _schedule_deadline_timer(self):
+        if self._deadline_timer:
+            self._deadline_timer.cancel()
+            self._deadline_timer = None
+        if self._deadlines:
+            self._deadline_timer = asyncio.get_running_loop().call_at(
+                self._deadlines[0][0], self._expire_deadlines
+            )
+
+    def _expire_deadlines(self):
+        self._deadline_timer = None
+        now = asyncio.get_running_loop().time()
+        deadlines = self._deadlines
+        # answered calls are dropped lazily as they reach the top of the heap
+        while deadlines and (deadlines[0][3].done() or deadlines[0][0] <= now):
+            _, _, id_, future = heapq.heappop(deadlines)
+            if future.done():
+                continue
+            if self._pending.get(id_) is future:
+                del self._pending[id_]
+                self._release(id_)
+            future.set_exception(TimeoutError(f"request {id_} timed out"))
+        self._schedule_deadline_timer()
+
+    def _on_frame(self, frame):
+        self._last_received = asyncio.get_running_loop().time()
+        data = self._codec.decode(frame)
+        if "id" in data:
+            _LOGGER.debug("Received response: %s", data)
+            self._process_response(data)
+        else:
+            self._process_notification(data)
+
+    def _process_notification(self, data):
+        handlers = self._notification_handlers.get(data.get("method"))
+        if not handlers:
+            _LOGGER.debug("Received unhandled notification: %s", data)
+            return
+        _LOGGER.debug("Received notification: %s", data)
+        params = data.get("params", {})
+        for handler in handlers:
+            try:
+                handler(params)
+            except Exception as ex:  # noqa: BLE001
+                _LOGGER.exception(
+                    "Error handling %s notification: %s", data.get("method"), repr(ex)
+                )
 
-    async def _process_response(self, data):
+    def _process_change_group_push(self, params):
+        listener = self._change_group_push_listeners.get(params.get("Id"))
+        if listener is None:
+            _LOGGER.debug("Received push for unknown change group: %s", params)
+            return
+        listener(params)
+
+    def _process_response(self, data):
         future = self._pending.pop(data["id"], None)
-        if future and not future.done():
+        if future is None:
+            self._orphaned_responses += 1
+            _LOGGER.debug("Received response without pending request: %s", data)
+            return
+        self._release(data["id"])
+        if not future.done():
             if "error" in data:
                 future.set_exception(QRCError(data["error"]))
             else:
@@ -322,8 +868,10 @@ class Core:
     async def logon(self, username, password):
         return await self.call("Logon", params={"User": username, "Password": password})
 
-    async def status_get(self):
-        return await self.call("StatusGet")
+    async def status_get(self, *, timeout=None):
+        return await self.call(
+            "StatusGet", timeout=timeout, priority=Priority.BACKGROUND
+        )
 
     def component(self):
         return ComponentAPI(self)
@@ -336,21 +884,119 @@ class ComponentAPI:
     def __init__(self, core: Core):
         self._core = core
 
-    async def get_components(self):
-        return await self._core.call("Component.GetComponents")
+    # reads share identical in-flight requests, see Core.call_shared
+
+    async def get_components(self, *, timeout=None, priority=Priority.BACKGROUND):
+        return await self._core.call_shared(
+            "Component.GetComponents", timeout=timeout, priority=priority
+        )
 
-    async def get_controls(self, name):
-        return await self._core.call("Component.GetControls", params={"Name": name})
+    async def get_controls(self, name, *, timeout=None, priority=Priority.BACKGROUND):
+        return await self._core.call_shared(
+            "Component.GetControls",
+            params={"Name": name},
+            timeout=timeout,
+            priority=priority,
+        )
+
+    async def get(self, name, controls, *, timeout=None, priority=Priority.INTERACTIVE):
+        return await self._core.call_shared(
+            "Component.Get",
+            params={"Name": name, "Controls": controls},
+            timeout=timeout,
+            priority=priority,
+        )
 
-    async def get(self, name, controls):
+    async def set(self, name, controls, *, timeout=None, priority=Priority.INTERACTIVE):
         return await self._core.call(
-            "Component.Get", params={"Name": name, "Controls": controls}
+            "Component.Set",
+            params={"Name": name, "Controls": controls},
+            timeout=timeout,
+            priority=priority,
         )
 
+    async def set_coalesced(self, name, controls):
+        """Set controls, merged with other sets of the component sent meanwhile.
+
+        A set for an idle component goes out right away, later ones are batched
+        until it completed and the coalesce window passed. Only the latest
+        value of each control is sent. Returns the response of
+        the Component.Set that carried the values.
+        """
+        return await self._core._set_coalescer.set(name, controls)
+
+
+class SetCoalescer:
+    """Merges rapid Component.Set calls into one request per component.
+
+    A set for an idle component is sent right away. Sets to the same component
+    that arrive while that request is in flight, or within `window` seconds of
+    it being sent, are collected into one batch, replacing the values of
+    controls that are already part of it. The batch is sent once both have
+    passed.
+    """
+
+    def __init__(self, core: Core, window: float):
+        self._core = core
+        self._window = window
+        self._batches = {}  # component name -> (controls by name, waiters)
+        self._busy = set()  # components with a recent or in-flight set
+        self._tasks = set()
+
     async def set(self, name, controls):
-        return await self._core.call(
-            "Component.Set", params={"Name": name, "Controls": controls}
+        waiter = asyncio.get_running_loop().create_future()
+        if name not in self._busy:
+            self._send(name, {control["Name"]: control for control in controls}, [waiter])
+            return await waiter
+
+        batch_controls, waiters = self._batches.setdefault(name, ({}, []))
+        for control in controls:
+            batch_controls[control["Name"]] = control
+        waiters.append(waiter)
+        return await waiter
+
+    def _send(self, name, controls, waiters):
+        loop = asyncio.get_running_loop()
+        self._busy.add(name)
+        window_end = loop.time() + self._window
+        task = loop.create_task(
+            self._core.call(
+                "Component.Set",
+                params={"Name": name, "Controls": list(controls.values())},
+                priority=Priority.INTERACTIVE,
+            )
         )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(lambda task: self._notify(task, waiters))
+        task.add_done_callback(lambda task: self._sent(name, window_end))
+
+    def _sent(self, name, window_end):
+        loop = asyncio.get_running_loop()
+        delay = window_end - loop.time()
+        if delay > 0:
+            loop.call_later(delay, self._release, name)
+        else:
+            self._release(name)
+
+    def _release(self, name):
+        self._busy.discard(name)
+        batch = self._batches.pop(name, None)
+        if batch is not None:
+            self._send(name, *batch)
+
+    @staticmethod
+    def _notify(task, waiters):
+        exception = None if task.cancelled() else task.exception()
+        for waiter in waiters:
+            if waiter.done():
+                continue  # the caller stopped waiting
+            if task.cancelled():
+                waiter.cancel()
+            elif exception is not None:
+                waiter.set_exception(exception)
+            else:
+                waiter.set_result(task.result())
 
 
 class ChangeGroupAPI:
@@ -358,11 +1004,31 @@ class ChangeGroupAPI:
         self._core = core
         self.id = id_
 
-    async def add_component_control(self, component):
+    async def add_component_control(
+        self, component, *, timeout=None, priority=Priority.BACKGROUND
+    ):
         return await self._core.call(
             "ChangeGroup.AddComponentControl",
             params={"Id": self.id, "Component": component},
+            timeout=timeout,
+            priority=priority,
         )
 
-    async def poll(self):
-        return await self._core.call("ChangeGroup.Poll", {"Id": self.id})
+    async def poll(self, *, timeout=None, priority=Priority.POLL):
+        return await self._core.call(
+            "ChangeGroup.Poll", {"Id": self.id}, timeout=timeout, priority=priority
+        )
+
+    async def auto_poll(self, rate, *, timeout=None, priority=Priority.POLL):
+        """Ask the core to push changes every `rate` seconds instead of being polled."""
+        return await self._core.call(
+            "ChangeGroup.AutoPoll",
+            {"Id": self.id, "Rate": rate},
+            timeout=timeout,
+            priority=priority,
+        )
+
+    async def destroy(self, *, timeout=None, priority=Priority.POLL):
+        return await self._core.call(
+            "ChangeGroup.Destroy", {"Id": self.id}, timeout=timeout, priority=priority
+        )
@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
+import time
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
@@ -10,11 +12,13 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers import entity_registry as er
 
-from . import changegroup
 from .common import (
     QSysComponentBase,
     QSysComponentControlBase,
+    UnrecordedValueAttributes,
+    control_entity_class,
     id_for_component_control,
+    change_group_for_core,
     config_for_core,
 )
 from .const import *
@@ -23,6 +27,11 @@ from .qsys import qrc
 _LOGGER = logging.getLogger(__name__)
 PLATFORM = __name__.rsplit(".", 1)[-1]
 
+# the core pushes EngineStatus on connect and on changes, StatusGet is only a fallback
+ENGINE_STATUS_REFRESH_INTERVAL = 60
+# connection statistics are refreshed more often to surface pile-ups early
+CONNECTION_STATS_REFRESH_INTERVAL = 10
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -40,10 +49,8 @@ async def async_setup_entry(
     entities = {}
 
     core_config = config_for_core(hass, core_name)
-    # can platform name be more dynamic than this?
-    poller = changegroup.create_change_group_for_platform(
-        core, core_config.get(CONF_CHANGEGROUP), PLATFORM
-    )
+    # the change groups are shared by all platforms of the core
+    change_groups = change_group_for_core(hass, core_name)
 
     for sensor_config in core_config.get(CONF_PLATFORMS, {}).get(
         CONF_SENSOR_PLATFORM, []
@@ -53,7 +60,10 @@ async def async_setup_entry(
         attribute = sensor_config[CONF_SENSOR_ATTRIBUTE]
 
         # need to fetch component and control config first?
-        control_sensor_entity = QRCComponentControlEntity(
+        entity_class = control_entity_class(
+            QRCComponentControlEntity, QRCComponentControlEntityUnrecordedValues, sensor_config[CONF_EXTRA_ATTRIBUTES]
+        )
+        control_sensor_entity = entity_class(
             hass,
             core_name,
             core,
@@ -72,9 +82,14 @@ async def async_setup_entry(
         )
 
         if control_sensor_entity.unique_id not in entities:
+            control_sensor_entity.set_extra_attributes(sensor_config[CONF_EXTRA_ATTRIBUTES])
+            control_sensor_entity.set_max_update_rate(sensor_config[CONF_MAX_UPDATE_RATE])
             entities[control_sensor_entity.unique_id] = control_sensor_entity
             async_add_entities([control_sensor_entity])
 
+            poller = change_groups.poller_for(
+                control_name, sensor_config[CONF_POLL_TIER]
+            )
             poller.subscribe_run_loop_iteration_ending(
                 control_sensor_entity.on_core_polling_ending
             )
@@ -82,12 +97,11 @@ async def async_setup_entry(
                 control_sensor_entity.on_core_change,
                 component_name,
                 control_name,
+                commit=control_sensor_entity.async_write_ha_state_throttled,
+                deadband=sensor_config[CONF_DEADBAND],
+                deadband_relative=sensor_config[CONF_DEADBAND_RELATIVE],
             )
 
-    if len(entities) > 0:
-        polling = asyncio.create_task(poller.run_while_core_running())
-        entry.async_on_unload(lambda: polling.cancel() and None)
-
     engine_status_sensor = EngineStatusEntity(
         hass,
         core_name,
@@ -96,18 +110,28 @@ async def async_setup_entry(
         f"{core_name}_engine",
         f"{core_name}_engine_component",  # unused
     )
+    engine_status_sensor.change_groups = change_groups
     async_add_entities([engine_status_sensor])
 
+    entry.async_on_unload(
+        core.subscribe_notification(
+            "EngineStatus", engine_status_sensor.on_engine_status
+        )
+    )
+
     async def update():
         while True:
             try:
-                status = await core.status_get()
-                engine_status_sensor.on_status(status)
+                if engine_status_sensor.status_age() >= ENGINE_STATUS_REFRESH_INTERVAL:
+                    status = await core.status_get()
+                    engine_status_sensor.on_status(status)
+                else:
+                    engine_status_sensor.on_connection_stats()
             except asyncio.CancelledError:
                 engine_status_sensor.on_unavailable()
                 raise
             else:
-                await asyncio.sleep(5)
+                await asyncio.sleep(CONNECTION_STATS_REFRESH_INTERVAL)
 
     entities[engine_status_sensor.unique_id] = engine_status_sensor
     updater = asyncio.create_task(update())
@@ -124,7 +148,39 @@ async def async_setup_entry(
             er.async_get(hass).async_remove(entity_entry.entity_id)
 
 
+def _round_seconds(value):
+    return None if value is None else round(value, 3)
+
+
 class EngineStatusEntity(QSysComponentBase, SensorEntity):
+    # connection statistics change with every refresh, keep them out of the
+    # recorder so they do not add an attributes row each time
+    _unrecorded_attributes = frozenset(
+        {
+            "pending_requests",
+            "pending_requests_high_water",
+            "orphaned_responses",
+            "oldest_pending_request_age",
+            "keepalive_rtt",
+            "keepalive_rtt_p50",
+            "keepalive_rtt_p95",
+            "keepalive_rtt_max",
+            "keepalives_missed",
+            "poll_interval",
+            "poll_deadlines_missed",
+            "poll_changes_suppressed",
+            "poll_tiers",
+        }
+    )
+    _status_received_at = None
+    _status_result = {}
+    change_groups = None
+
+    def status_age(self):
+        if self._status_received_at is None:
+            return math.inf
+        return time.monotonic() - self._status_received_at
+
     def set_available(self, available):
         self._attr_available = available
 
@@ -134,14 +190,63 @@ class EngineStatusEntity(QSysComponentBase, SensorEntity):
     def set_attr_extra_state_attributes(self, value):
         self._attr_extra_state_attributes = value
 
+    def on_engine_status(self, params):
+        # pushes only carry State, DesignName, DesignCode, IsRedundant and
+        # IsEmulator, Status and Platform are kept from the last StatusGet
+        self._status_result = {**self._status_result, **params}
+        self._write_status()
+
     def on_status(self, status):
+        self._status_received_at = time.monotonic()
+        self._status_result = status.get("result", {})
+        self._write_status()
+
+    def _write_status(self):
         self.set_available(True)
-        self.set_attr_native_value(
-            status.get("result", {}).get("Status", {}).get("Code", -1)
+        self.set_attr_native_value(self._status_result.get("Status", {}).get("Code", -1))
+        self.set_attr_extra_state_attributes(
+            {**self._status_result, **self.connection_stats_attributes()}
         )
-        self.set_attr_extra_state_attributes(status.get("result", {}))
         self.async_write_ha_state()
 
+    def on_connection_stats(self):
+        attributes = {**self._status_result, **self.connection_stats_attributes()}
+        if attributes != self._attr_extra_state_attributes:
+            self.set_attr_extra_state_attributes(attributes)
+            self.async_write_ha_state()
+
+    def connection_stats_attributes(self):
+        pending = self.core.pending_stats()
+        keepalive = self.core.keepalive_stats()
+        attributes = {
+            "pending_requests": pending["depth"],
+            "pending_requests_high_water": pending["high_water"],
+            "orphaned_responses": pending["orphaned_responses"],
+            "oldest_pending_request_age": _round_seconds(pending["oldest_age"]),
+            "keepalive_rtt": _round_seconds(keepalive["last"]),
+            "keepalive_rtt_p50": _round_seconds(keepalive["p50"]),
+            "keepalive_rtt_p95": _round_seconds(keepalive["p95"]),
+            "keepalive_rtt_max": _round_seconds(keepalive["max"]),
+            "keepalives_missed": keepalive["missed"],
+        }
+        if self.change_groups is not None:
+            # other tiers are nested, attribute names must be known up front
+            # to be left out of the recorder
+            tiers = {}
+            for tier, poll in self.change_groups.poll_stats().items():
+                stats = {
+                    "poll_interval": _round_seconds(poll["interval"]),
+                    "poll_deadlines_missed": poll["missed_deadlines"],
+                    "poll_changes_suppressed": poll["suppressed_changes"],
+                }
+                if tier == DEFAULT_POLL_TIER:
+                    attributes.update(stats)
+                else:
+                    tiers[tier] = stats
+            if tiers:
+                attributes["poll_tiers"] = tiers
+        return attributes
+
     def on_unavailable(self):
         self.set_available(False)
         self.async_write_ha_state()
@@ -174,3 +279,7 @@ class QRCComponentControlEntity(QSysComponentControlBase, SensorEntity):
     async def on_control_changed(self, core, change):
         # TODO: if change["Choices"], copy to attr options?
         self._attr_native_value = change.get(self.attribute)
+
+
+class QRCComponentControlEntityUnrecordedValues(UnrecordedValueAttributes, QRCComponentControlEntity):
+    """QRCComponentControlEntity of the minimal and none attribute modes."""
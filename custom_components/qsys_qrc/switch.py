@@ -1,7 +1,6 @@
 """Platform for switch integration."""
 from __future__ import annotations
 
-import asyncio
 import logging
 
 from homeassistant.components.switch import SwitchEntity
@@ -10,8 +9,14 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers import entity_registry as er
 
-from . import changegroup
-from .common import QSysComponentControlBase, id_for_component_control, config_for_core
+from .common import (
+    QSysComponentControlBase,
+    UnrecordedValueAttributes,
+    control_entity_class,
+    id_for_component_control,
+    change_group_for_core,
+    config_for_core,
+)
 from .const import *
 from .qsys import qrc
 
@@ -35,10 +40,8 @@ async def async_setup_entry(
     entities = {}
 
     core_config = config_for_core(hass, core_name)
-    # can platform name be more dynamic than this?
-    poller = changegroup.create_change_group_for_platform(
-        core, core_config.get(CONF_CHANGEGROUP), PLATFORM
-    )
+    # the change groups are shared by all platforms of the core
+    change_groups = change_group_for_core(hass, core_name)
 
     for switch_config in core_config.get(CONF_PLATFORMS, {}).get(
         CONF_SWITCH_PLATFORM, []
@@ -47,7 +50,10 @@ async def async_setup_entry(
         control_name = switch_config[CONF_CONTROL]
 
         # need to fetch component and control config first?
-        control_switch_entity = QRCSwitchEntity(
+        entity_class = control_entity_class(
+            QRCSwitchEntity, QRCSwitchEntityUnrecordedValues, switch_config[CONF_EXTRA_ATTRIBUTES]
+        )
+        control_switch_entity = entity_class(
             hass,
             core_name,
             core,
@@ -63,9 +69,13 @@ async def async_setup_entry(
         )
 
         if control_switch_entity.unique_id not in entities:
+            control_switch_entity.set_extra_attributes(switch_config[CONF_EXTRA_ATTRIBUTES])
             entities[control_switch_entity.unique_id] = control_switch_entity
             async_add_entities([control_switch_entity])
 
+            poller = change_groups.poller_for(
+                control_name, switch_config[CONF_POLL_TIER]
+            )
             poller.subscribe_run_loop_iteration_ending(
                 control_switch_entity.on_core_polling_ending
             )
@@ -73,12 +83,9 @@ async def async_setup_entry(
                 control_switch_entity.on_core_change,
                 component_name,
                 control_name,
+                commit=control_switch_entity.async_write_ha_state,
             )
 
-    if len(entities) > 0:
-        polling = asyncio.create_task(poller.run_while_core_running())
-        entry.async_on_unload(lambda: polling.cancel() and None)
-
     for entity_entry in er.async_entries_for_config_entry(
         er.async_get(hass), entry.entry_id
     ):
@@ -129,4 +136,11 @@ class QRCSwitchEntity(QSysComponentControlBase, SwitchEntity):
 
     async def async_toggle(self, **kwargs):
         """Toggle the entity."""
-        await self.update_control({"Value": not self.is_on})
+        # the last value received from the core rather than the entity's copy
+        value = self.control_value(self.control)
+        is_on = self.is_on if value is None else value == 1.0
+        await self.update_control({"Value": not is_on})
+
+
+class QRCSwitchEntityUnrecordedValues(UnrecordedValueAttributes, QRCSwitchEntity):
+    """QRCSwitchEntity of the minimal and none attribute modes."""
@@ -1,7 +1,6 @@
 """Platform for text integration."""
 from __future__ import annotations
 
-import asyncio
 import logging
 
 from homeassistant.components.text import TextEntity
@@ -10,8 +9,14 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers import entity_registry as er
 
-from . import changegroup
-from .common import QSysComponentControlBase, id_for_component_control, config_for_core
+from .common import (
+    QSysComponentControlBase,
+    UnrecordedValueAttributes,
+    control_entity_class,
+    id_for_component_control,
+    change_group_for_core,
+    config_for_core,
+)
 from .const import *
 from .qsys import qrc
 
@@ -35,17 +40,18 @@ async def async_setup_entry(
     entities = {}
 
     core_config = config_for_core(hass, core_name)
-    # can platform name be more dynamic than this?
-    poller = changegroup.create_change_group_for_platform(
-        core, core_config.get(CONF_CHANGEGROUP), PLATFORM
-    )
+    # the change groups are shared by all platforms of the core
+    change_groups = change_group_for_core(hass, core_name)
 
     for text_config in core_config.get(CONF_PLATFORMS, {}).get(CONF_TEXT_PLATFORM, []):
         component_name = text_config[CONF_COMPONENT]
         control_name = text_config[CONF_CONTROL]
 
         # need to fetch component and control config first?
-        control_text_entity = QRCTextEntity(
+        entity_class = control_entity_class(
+            QRCTextEntity, QRCTextEntityUnrecordedValues, text_config[CONF_EXTRA_ATTRIBUTES]
+        )
+        control_text_entity = entity_class(
             hass,
             core_name,
             core,
@@ -64,9 +70,13 @@ async def async_setup_entry(
         )
 
         if control_text_entity.unique_id not in entities:
+            control_text_entity.set_extra_attributes(text_config[CONF_EXTRA_ATTRIBUTES])
             entities[control_text_entity.unique_id] = control_text_entity
             async_add_entities([control_text_entity])
 
+            poller = change_groups.poller_for(
+                control_name, text_config[CONF_POLL_TIER]
+            )
             poller.subscribe_run_loop_iteration_ending(
                 control_text_entity.on_core_polling_ending
             )
@@ -74,12 +84,9 @@ async def async_setup_entry(
                 control_text_entity.on_core_change,
                 component_name,
                 control_name,
+                commit=control_text_entity.async_write_ha_state,
             )
 
-    if len(entities) > 0:
-        polling = asyncio.create_task(poller.run_while_core_running())
-        entry.async_on_unload(lambda: polling.cancel() and None)
-
     for entity_entry in er.async_entries_for_config_entry(
         er.async_get(hass), entry.entry_id
     ):
@@ -122,3 +129,7 @@ class QRCTextEntity(QSysComponentControlBase, TextEntity):
     async def async_set_value(self, value: str) -> None:
         """Change the value."""
         await self.update_control({"Value": value})
+
+
+class QRCTextEntityUnrecordedValues(UnrecordedValueAttributes, QRCTextEntity):
+    """QRCTextEntity of the minimal and none attribute modes."""
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Compare encode/decode throughput of the available QRC message codecs.
+
+Uses payloads shaped like real ChangeGroup.Poll and Component.GetComponents
+responses. Run from the repository root:
+
+    python scripts/benchmark_codec.py [--changes 200] [--components 1000]
+"""
+
+import argparse
+import pathlib
+import sys
+import timeit
+
+# import the qsys package directly, it does not depend on Home Assistant
+sys.path.insert(
+    0, str(pathlib.Path(__file__).resolve().parent.parent / "custom_components" / "qsys_qrc")
+)
+
+from qsys import qrc  # noqa: E402
+
+
+def change_group_poll_response(changes):
+    return {
+        "jsonrpc": "2.0",
+        "id": 1234,
+        "result": {
+            "Id": "my_core_change_group",
+            "Changes": [
+                {
+                    "Component": f"gain_{i // 4}",
+                    "Name": ("gain", "mute", "level", "peak.level")[i % 4],
+                    "Value": -12.5 + i / 10,
+                    "String": f"{-12.5 + i / 10:.1f}dB",
+                    "Position": 0.83333331 - i / 1000,
+                    "Choices": [],
+                    "Color": "",
+                    "Indeterminate": False,
+                    "Invisible": False,
+                    "Disabled": False,
+                    "Legend": "",
+                    "CssClass": "",
+                }
+                for i in range(changes)
+            ],
+        },
+    }
+
+
+def get_components_response(components):
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": [
+            {
+                "Name": f"component_{i}",
+                "Type": ("gain", "URL_receiver", "audio_file_player", "mixer")[i % 4],
+                "Properties": [
+                    {"Name": "n_inputs", "Value": "8"},
+                    {"Name": "n_outputs", "Value": "8"},
+                    {"Name": "max_delay", "Value": "0.5"},
+                    {"Name": "delay_type", "Value": "0"},
+                    {"Name": "linear_gain", "Value": "False"},
+                    {"Name": "multi_channel_type", "Value": "1"},
+                    {"Name": "multi_channel_count", "Value": "8"},
+                ],
+                "ControlSource": 2,
+                "Controls": None,
+                "ID": f"component_{i}",
+            }
+            for i in range(components)
+        ],
+    }
+
+
+def bench(label, func, size, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(
+        f"  {label:<8} {seconds * 1e6:10.1f} us/op "
+        f"{1 / seconds:10.0f} ops/s {size / seconds / 1e6:8.1f} MB/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--changes", type=int, default=200)
+    parser.add_argument("--components", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    codecs = [qrc.JSONCodec()]
+    if qrc.orjson is not None:
+        codecs.append(qrc.OrjsonCodec())
+    else:
+        print("orjson is not installed, only benchmarking the json codec")
+
+    payloads = {
+        f"ChangeGroup.Poll ({args.changes} changes)": change_group_poll_response(
+            args.changes
+        ),
+        f"Component.GetComponents ({args.components} components)": get_components_response(
+            args.components
+        ),
+    }
+
+    for name, payload in payloads.items():
+        raw = qrc.JSONCodec().encode(payload)
+        print(f"{name}: {len(raw)} bytes")
+        for codec in codecs:
+            print(f" {codec.name}")
+            bench("encode", lambda codec=codec: codec.encode(payload), len(raw), args.number)
+            bench("decode", lambda codec=codec: codec.decode(raw), len(raw), args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import pytest
 
 from custom_components.qsys_qrc.qsys import qrc
 from custom_components.qsys_qrc.changegroup import ChangeGroupPoller, PollerState
+from custom_components.qsys_qrc.controlstate import ControlStateStore
 
 pytestmark = pytest.mark.asyncio
 
@@ -13,10 +14,10 @@ class DummyChangeGroup:
         self.poll_calls = 0
         self._poll_side_effects = []
 
-    async def add_component_control(self, payload):
+    async def add_component_control(self, payload, timeout=None):
         self.add_component_control_calls.append(payload)
 
-    async def poll(self):
+    async def poll(self, timeout=None):
         self.poll_calls += 1
         if self._poll_side_effects:
             effect = self._poll_side_effects.pop(0)
@@ -88,6 +89,19 @@ async def test_dynamic_add_control_after_creation(core):
     await poller.stop()
 
 
+async def test_shared_control_added_once(core):
+    poller = ChangeGroupPoller(core, "testcg", 0.01, 0.1)
+    poller.start()
+    await poller.wait_until_running(timeout=1)
+    cg = poller.cg
+    # e.g. a switch and a sensor on the same control, registered from different platforms
+    await poller.subscribe_component_control_changes(lambda *_: None, "Comp", "Ctrl")
+    await poller.subscribe_component_control_changes(lambda *_: None, "Comp", "Ctrl")
+    assert cg.add_component_control_calls == [{"Name": "Comp", "Controls": [{"Name": "Ctrl"}]}]
+    assert len(poller._listeners_component_control_changes[("Comp", "Ctrl")]) == 2
+    await poller.stop()
+
+
 async def test_polling_changes_dispatch(core):
     poller = ChangeGroupPoller(core, "testcg", 0.01, 0.1)
     poller.start()
@@ -163,3 +177,75 @@ async def test_stop_idempotent(core):
     await poller.stop()  # second stop should not fail
     assert poller._loop_task is None
 
+
+
+async def test_controls_added_per_component_with_bounded_concurrency(core):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def add_component_control(payload, timeout=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        core._cg.add_component_control_calls.append(payload)
+
+    core._cg.add_component_control = add_component_control
+
+    poller = ChangeGroupPoller(core, "testcg", 0.01, 0.1, max_concurrent_requests=2)
+    for component in ("A", "B", "C", "D"):
+        for control in ("gain", "mute"):
+            await poller.subscribe_component_control_changes(lambda *_: None, component, control)
+
+    poller.start()
+    await poller.wait_until_running(timeout=1)
+
+    calls = sorted(core._cg.add_component_control_calls, key=lambda c: c["Name"])
+    assert calls == [
+        {"Name": component, "Controls": [{"Name": "gain"}, {"Name": "mute"}]}
+        for component in ("A", "B", "C", "D")
+    ]
+    assert max_in_flight == 2
+    await poller.stop()
+
+
+async def test_changes_recorded_in_control_states_before_listeners(core):
+    control_states = ControlStateStore()
+    poller = ChangeGroupPoller(core, "testcg", 0.01, 0.1, control_states=control_states)
+    seen = []
+    await poller.subscribe_component_control_changes(
+        lambda p, change: seen.append(control_states.value("Comp", "Ctrl")), "Comp", "Ctrl"
+    )
+    core._cg._poll_side_effects.append(
+        {"result": {"Changes": [{"Component": "Comp", "Name": "Ctrl", "Value": 5},
+                                {"Component": "Comp", "Name": "Other", "Value": 1}]}}
+    )
+
+    poller.start()
+    await poller.wait_until_running(timeout=1)
+    await asyncio.sleep(0.05)
+    await poller.stop()
+
+    assert seen == [5]
+    assert control_states.version("Comp", "Ctrl") == 1
+    assert control_states.value("Comp", "Other") == 1
+
+
+async def test_control_states_confirmed_by_polls_and_expired_on_stop(core):
+    control_states = ControlStateStore()
+    poller = ChangeGroupPoller(core, "testcg", 0.01, 0.1, control_states=control_states)
+    await poller.subscribe_component_control_changes(lambda p, change: None, "Comp", "Ctrl")
+    core._cg._poll_side_effects.append(
+        {"result": {"Changes": [{"Component": "Comp", "Name": "Ctrl", "Value": 5}]}}
+    )
+
+    poller.start()
+    await poller.wait_until_running(timeout=1)
+    await asyncio.sleep(0.05)
+    state = control_states.get("Comp", "Ctrl")
+    # later polls without changes still confirm the value
+    assert control_states.confirmed_at(state) > state.updated_at
+
+    await poller.stop()
+    assert control_states.confirmed_at(state) is None
@@ -1,7 +1,12 @@
 import asyncio
 import pytest
 
-from custom_components.qsys_qrc.changegroup import ChangeGroupPoller, PollerState
+from custom_components.qsys_qrc.changegroup import (
+    ChangeGroupPoller,
+    PollerState,
+    create_change_group_for_core,
+)
+from custom_components.qsys_qrc.controlstate import ControlStateStore
 from custom_components.qsys_qrc.qsys.qrc import QRCError
 
 
@@ -13,13 +18,13 @@ class FakeChangeGroup:
         self._poll_exception = None
         self._poll_delay = 0
 
-    async def add_component_control(self, component):
+    async def add_component_control(self, component, timeout=None):
         self.added.append(component)
 
-    async def poll(self):
+    async def poll(self, timeout=None):
         self.poll_calls += 1
         if self._poll_delay:
-            await asyncio.sleep(self._poll_delay)
+            await asyncio.wait_for(asyncio.sleep(self._poll_delay), timeout)
         if self._poll_exception:
             raise self._poll_exception
         # mimic real response structure
@@ -122,6 +127,53 @@ async def test_timeout_handling(fake_core):
     assert poller._state in (PollerState.STARTING, PollerState.RUNNING)
     await poller.stop()
 
+@pytest.mark.asyncio
+async def test_adaptive_poll_interval(fake_core):
+    cg = FakeChangeGroup()
+    fake_core.cg_instance = cg
+    poller = ChangeGroupPoller(fake_core, 'test_cg', poll_interval=1.0, request_timeout=0.05,
+                               min_poll_interval=0.01, max_poll_interval=0.04)
+    assert [poller._next_poll_interval(0) for _ in range(3)] == [0.04, 0.04, 0.04]
+    assert poller._next_poll_interval(2) == 0.01
+    assert [poller._next_poll_interval(0) for _ in range(3)] == [0.02, 0.04, 0.04]
+
+    poller.start()
+    await poller.wait_until_running(timeout=1)
+    await asyncio.sleep(0.1)
+    assert poller.poll_interval == 0.04
+    cg._changes = [{"Component": "CompA", "Name": "Gain", "Value": 1}]
+    await asyncio.sleep(0.1)
+    assert poller.poll_interval == 0.01
+    await poller.stop()
+
+
+def test_fixed_rate_deadlines_skip_missed_ticks(fake_core):
+    poller = ChangeGroupPoller(fake_core, 'test_cg', poll_interval=1.0, request_timeout=0.05)
+    # a fast poll keeps the grid regardless of its latency
+    assert poller._next_poll_deadline(10.0, 0, now=10.3) == 11.0
+    assert poller._next_poll_deadline(11.0, 0, now=11.9) == 12.0
+    # a poll overrunning two ticks skips them instead of bunching polls
+    assert poller._next_poll_deadline(12.0, 0, now=14.5) == 15.0
+    assert poller._next_poll_deadline(15.0, 0, now=16.0) == 17.0
+    assert poller.poll_stats()["interval"] == 1.0
+    assert poller.poll_stats()["missed_deadlines"] == 3
+
+
+@pytest.mark.asyncio
+async def test_poll_period_excludes_poll_latency(fake_core):
+    cg = FakeChangeGroup()
+    cg._poll_delay = 0.02
+    fake_core.cg_instance = cg
+    poller = ChangeGroupPoller(fake_core, 'test_cg', poll_interval=0.03, request_timeout=0.5)
+    poller.start()
+    await poller.wait_until_running(timeout=1)
+    await asyncio.sleep(0.3)
+    await poller.stop()
+    # sleeping the full interval after each poll would allow at most 6 polls
+    assert cg.poll_calls >= 8
+    assert poller.poll_stats()["missed_deadlines"] <= 1
+
+
 @pytest.mark.asyncio
 async def test_qrc_error_triggers_recreate(fake_core):
     cg = FakeChangeGroup()
@@ -241,3 +293,289 @@ async def test_recreate_after_disconnect_and_reconnect():
     assert second_cg is not first_cg
     assert any('CompC' in str(c) for c in second_cg.added), 'Control not re-added on recreation'
     await poller.stop()
+
+
+class AutoPollChangeGroup(FakeChangeGroup):
+    def __init__(self):
+        super().__init__()
+        self.auto_poll_rates = []
+        self.destroyed = False
+
+    async def auto_poll(self, rate, timeout=None):
+        self.auto_poll_rates.append(rate)
+
+    async def destroy(self, timeout=None):
+        self.destroyed = True
+
+
+class PushingCore(FakeCore):
+    """Core stub that routes pushed change sets like Core.subscribe_change_group_push."""
+
+    def __init__(self):
+        super().__init__()
+        self.push_listeners = {}
+
+    def subscribe_change_group_push(self, change_group_id, listener):
+        self.push_listeners[change_group_id] = listener
+        return lambda: self.push_listeners.pop(change_group_id, None)
+
+    def push(self, change_group_id, changes):
+        self.push_listeners[change_group_id]({'Id': change_group_id, 'Changes': changes})
+
+
+@pytest.mark.asyncio
+async def test_auto_poll_dispatches_pushed_changes_without_polling():
+    core = PushingCore()
+    cg = AutoPollChangeGroup()
+    core.cg_instance = cg
+    poller = ChangeGroupPoller(core, 'auto_cg', poll_interval=0.01, request_timeout=0.05, auto_poll=True)
+    received = []
+    await poller.subscribe_component_control_changes(lambda p, change: received.append(change), 'CompA', 'Gain')
+    poller.start()
+    await poller.wait_until_running(timeout=1)
+    assert cg.auto_poll_rates == [0.01]
+
+    core.push('auto_cg', [{'Component': 'CompA', 'Name': 'Gain', 'Value': 1.0}])
+    from .utils import wait_for_condition
+    await wait_for_condition(lambda: received, fail_msg='pushed change not dispatched')
+    assert received == [{'Component': 'CompA', 'Name': 'Gain', 'Value': 1.0}]
+    assert cg.poll_calls == 0
+
+    await poller.stop()
+    assert cg.destroyed
+    assert 'auto_cg' not in core.push_listeners
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("auto_poll", [False, True])
+async def test_stop_does_not_wait_for_next_poll(auto_poll):
+    core = PushingCore()
+    cg = AutoPollChangeGroup()
+    core.cg_instance = cg
+    poller = ChangeGroupPoller(core, 'slow_cg', poll_interval=10, request_timeout=0.05, auto_poll=auto_poll)
+    await poller.subscribe_component_control_changes(lambda p, change: None, 'CompA', 'Gain')
+    task = poller.start()
+    await poller.wait_until_running(timeout=1)
+    await asyncio.sleep(0.01)
+
+    async with asyncio.timeout(0.5):
+        await poller.stop()
+    # the loop ended by itself rather than being cancelled
+    assert not task.cancelled()
+    assert poller._state == PollerState.IDLE
+
+
+@pytest.mark.asyncio
+async def test_async_listeners_run_concurrently(fake_core):
+    poller = ChangeGroupPoller(fake_core, 'test_cg', poll_interval=0.01, request_timeout=0.05)
+    calls = []
+    release = asyncio.Event()
+
+    async def slow_listener(p, change):
+        calls.append(("async", change["Name"]))
+        await release.wait()
+
+    async def failing_listener(p, change):
+        raise ValueError("boom")
+
+    def sync_listener(p, change):
+        calls.append(("sync", change["Name"]))
+
+    for control in ("a", "b"):
+        await poller.subscribe_component_control_changes(slow_listener, "Comp", control)
+        await poller.subscribe_component_control_changes(sync_listener, "Comp", control)
+    await poller.subscribe_component_control_changes(failing_listener, "Comp", "a")
+    assert poller._dispatch_table[("Comp", "a")] == (
+        (sync_listener,), (slow_listener, failing_listener), (), (0.0, 0.0))
+
+    dispatch = asyncio.create_task(poller._dispatch_changes(
+        [{"Component": "Comp", "Name": name} for name in ("a", "b", "unknown")]))
+    await asyncio.sleep(0.01)
+    # both slow listeners started before either finished
+    assert calls == [("sync", "a"), ("sync", "b"), ("async", "a"), ("async", "b")]
+    release.set()
+    await asyncio.wait_for(dispatch, 1)
+
+
+@pytest.mark.asyncio
+async def test_commit_called_once_per_batch(fake_core):
+    poller = ChangeGroupPoller(fake_core, 'test_cg', poll_interval=0.01, request_timeout=0.05)
+    applied = []
+    commits = []
+
+    async def on_change(p, change):
+        applied.append(change["Name"])
+
+    def commit():
+        # all changes of the batch are applied before the commit
+        commits.append(list(applied))
+
+    for control in ("gain", "mute", "status"):
+        await poller.subscribe_component_control_changes(on_change, "Player", control, commit=commit)
+
+    await poller._dispatch_changes(
+        [{"Component": "Player", "Name": name} for name in ("gain", "mute", "status")])
+    await poller._dispatch_changes([])
+    assert commits == [["gain", "mute", "status"]]
+
+
+@pytest.mark.asyncio
+async def test_failing_listeners_do_not_abort_batch(fake_core, caplog):
+    poller = ChangeGroupPoller(fake_core, 'test_cg', poll_interval=0.01, request_timeout=0.05)
+    applied = []
+    commits = []
+
+    def failing_listener(p, change):
+        raise ValueError("boom")
+
+    async def failing_async_listener(p, change):
+        raise ValueError("boom")
+
+    def on_change(p, change):
+        applied.append(change["Name"])
+
+    def commit():
+        commits.append(list(applied))
+
+    for control in ("gain", "mute"):
+        await poller.subscribe_component_control_changes(failing_listener, "Player", control)
+        await poller.subscribe_component_control_changes(on_change, "Player", control, commit=commit)
+    await poller.subscribe_component_control_changes(failing_async_listener, "Player", "gain")
+
+    await poller._dispatch_changes(
+        [{"Component": "Player", "Name": name} for name in ("gain", "mute")])
+    assert commits == [["gain", "mute"]]
+    # sync and async failures are logged alike
+    failures = [record for record in caplog.records if "change listener failed" in record.getMessage()]
+    assert len(failures) == 3
+    assert all(record.exc_info and record.getMessage() == "test_cg: change listener failed: ValueError('boom')"
+               for record in failures)
+
+
+@pytest.mark.asyncio
+async def test_deadband_and_duplicates_suppressed_until_recreate(fake_core):
+    cg = FakeChangeGroup()
+    fake_core.cg_instance = cg
+    poller = ChangeGroupPoller(fake_core, 'test_cg', poll_interval=0.01, request_timeout=0.05)
+    received = []
+
+    def listener(p, change):
+        received.append((change["Name"], change["Value"]))
+
+    await poller.subscribe_component_control_changes(listener, "Comp", "level", deadband=0.5)
+    await poller.subscribe_component_control_changes(listener, "Comp", "gain", deadband_relative=0.1)
+    await poller.subscribe_component_control_changes(listener, "Comp", "mute")
+
+    def change(name, value):
+        return {"Component": "Comp", "Name": name, "Value": value, "String": str(value)}
+
+    for batch in (
+        [change("level", -20.0), change("gain", -10.0), change("mute", 0.0)],
+        [change("level", -20.3), change("gain", -10.5), change("mute", 0.0)],
+        [change("level", -20.6), change("gain", -11.0), change("mute", 1.0)],
+    ):
+        await poller._dispatch_changes(batch)
+    assert received == [
+        ("level", -20.0), ("gain", -10.0), ("mute", 0.0),
+        ("level", -20.6), ("gain", -11.0), ("mute", 1.0),
+    ]
+    assert poller.poll_stats()["suppressed_changes"] == 3
+
+    # changes of other keys than the value are never suppressed
+    received.clear()
+    await poller._dispatch_changes([
+        dict(change("mute", 1.0), Legend="Muted"),
+        dict(change("level", -20.7), Color="red"),
+    ])
+    assert received == [("mute", 1.0), ("level", -20.7)]
+
+    # after recreating the group the current values are dispatched again
+    received.clear()
+    await poller._create_or_recreate_change_group()
+    await poller._dispatch_changes([change("mute", 1.0)])
+    assert received == [("mute", 1.0)]
+
+
+@pytest.mark.asyncio
+async def test_late_listener_receives_last_change(fake_core):
+    cg = FakeChangeGroup()
+    fake_core.cg_instance = cg
+    poller = ChangeGroupPoller(fake_core, 'test_cg', poll_interval=0.01, request_timeout=0.05)
+    first, late, commits = [], [], []
+    await poller.subscribe_component_control_changes(
+        lambda p, change: first.append(change["Value"]), "Gain", "gain")
+    cg._changes = [{"Component": "Gain", "Name": "gain", "Value": -10.0}]
+    poller.start()
+    await poller.wait_until_running(timeout=1)
+    await asyncio.sleep(0.03)
+    cg._changes = []  # the core only reports changes
+
+    async def late_listener(p, change):
+        late.append(change["Value"])
+
+    await poller.subscribe_component_control_changes(
+        late_listener, "Gain", "gain", commit=lambda: commits.append(True))
+    await asyncio.sleep(0.05)
+    await poller.stop()
+
+    assert first == [-10.0]
+    assert late == [-10.0]
+    assert commits == [True]
+    # the control was not added to the group twice
+    assert len(cg.added) == 1
+
+
+class TieredCore(FakeCore):
+    def __init__(self):
+        super().__init__()
+        self.change_groups = {}
+
+    def change_group(self, name):
+        return self.change_groups.setdefault(name, FakeChangeGroup())
+
+
+@pytest.mark.asyncio
+async def test_poll_tiers_routed_to_own_change_groups():
+    core = TieredCore()
+    control_states = ControlStateStore()
+    hub = create_change_group_for_core(
+        core,
+        {
+            "poll_interval": 0.05,
+            "request_timeout": 0.05,
+            "tiers": {
+                "fast": {"poll_interval": 0.01, "controls": ["*meter*"]},
+                "slow": {"poll_interval": 10.0},
+            },
+        },
+        "core",
+        control_states=control_states,
+    )
+
+    assert hub.tier_for("gain") == "normal"
+    assert hub.tier_for("meter.1") == "fast"
+    assert hub.tier_for("meter.1", "slow") == "slow"
+    assert hub.tier_for("gain", "unknown") == "normal"
+
+    received = []
+    for control in ("gain", "meter.1"):
+        await hub.poller_for(control).subscribe_component_control_changes(
+            lambda poller, change: received.append(change), "CompA", control
+        )
+    hub.start()
+    await hub.pollers["fast"].wait_until_running(timeout=1)
+    await hub.pollers["normal"].wait_until_running(timeout=1)
+    # tiers without controls are not polled
+    assert hub.pollers["slow"]._loop_task is None
+
+    fast = core.change_groups["core_change_group_fast"]
+    normal = core.change_groups["core_change_group"]
+    assert fast.added == [{"Name": "CompA", "Controls": [{"Name": "meter.1"}]}]
+    assert normal.added == [{"Name": "CompA", "Controls": [{"Name": "gain"}]}]
+
+    fast._changes = [{"Component": "CompA", "Name": "meter.1", "Value": -20.0}]
+    await asyncio.sleep(0.05)
+    assert fast.poll_calls > normal.poll_calls
+    assert control_states.value("CompA", "meter.1") == -20.0
+    assert set(hub.poll_stats()) == {"normal", "fast", "slow"}
+    await hub.stop()
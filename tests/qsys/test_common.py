@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+
+from custom_components.qsys_qrc.common import (
+    QSysComponentBase,
+    QSysComponentControlBase,
+    attribute_name,
+    control_entity_class,
+)
+from custom_components.qsys_qrc.number import QRCNumberEntity, QRCNumberEntityUnrecordedValues
+from custom_components.qsys_qrc.sensor import (
+    QRCComponentControlEntity,
+    QRCComponentControlEntityUnrecordedValues,
+)
+from custom_components.qsys_qrc.switch import QRCSwitchEntity, QRCSwitchEntityUnrecordedValues
+from custom_components.qsys_qrc.text import QRCTextEntity, QRCTextEntityUnrecordedValues
+
+
+class ThrottledEntity(QSysComponentBase):
+    # skips the device registry lookups of QSysComponentBase
+    def __init__(self, max_update_rate):
+        self.writes = []
+        self.state = None
+        self.set_max_update_rate(max_update_rate)
+
+    def async_write_ha_state(self):
+        self.writes.append(self.state)
+
+
+@pytest.mark.asyncio
+async def test_throttled_writes_end_with_trailing_write():
+    entity = ThrottledEntity(max_update_rate=20)  # one write per 50ms
+
+    for state in range(5):
+        entity.state = state
+        entity.async_write_ha_state_throttled()
+    # the first write goes out right away, the rest is merged
+    assert entity.writes == [0]
+
+    await asyncio.sleep(0.08)
+    assert entity.writes == [0, 4]
+
+    await entity.async_will_remove_from_hass()
+
+
+@pytest.mark.asyncio
+async def test_unthrottled_writes_every_time():
+    entity = ThrottledEntity(max_update_rate=None)
+
+    for state in range(3):
+        entity.state = state
+        entity.async_write_ha_state_throttled()
+    assert entity.writes == [0, 1, 2]
+
+
+class ControlEntity(QSysComponentControlBase):
+    # skips the device registry lookups of QSysComponentBase
+    def __init__(self, mode):
+        self._attr_extra_state_attributes = {}
+        self.set_extra_attributes(mode)
+
+
+CHANGE = {"Component": "gain", "Name": "gain", "Value": -10.0, "String": "-10.0dB",
+          "Position": 0.5, "Indeterminate": False, "Choices": []}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode, expected", [
+    ("none", set()),
+    ("minimal", {"component", "name", "value", "string", "position"}),
+    ("full", {"component", "name", "value", "string", "position", "indeterminate", "choices"}),
+])
+async def test_extra_attributes_modes(mode, expected):
+    entity = ControlEntity(mode)
+    await entity.on_core_change(None, CHANGE)
+    assert set(entity.extra_state_attributes) == expected
+    assert entity.available
+
+
+@pytest.mark.parametrize("mode, unrecorded", [
+    ("none", True),
+    ("minimal", True),
+    ("full", False),
+    (None, False),
+])
+@pytest.mark.parametrize("entity_class, unrecorded_class", [
+    (QRCNumberEntity, QRCNumberEntityUnrecordedValues),
+    (QRCComponentControlEntity, QRCComponentControlEntityUnrecordedValues),
+    (QRCSwitchEntity, QRCSwitchEntityUnrecordedValues),
+    (QRCTextEntity, QRCTextEntityUnrecordedValues),
+])
+def test_value_attributes_recorded_in_full_mode_only(entity_class, unrecorded_class, mode, unrecorded):
+    chosen = control_entity_class(entity_class, unrecorded_class, mode)
+    assert issubclass(chosen, entity_class)
+    assert ({"value", "string", "position"} <= chosen._unrecorded_attributes) is unrecorded
+
+
+def test_attribute_names_cached():
+    assert attribute_name("ChoicesLegend") == "choices_legend"
+    assert attribute_name("ChoicesLegend") is attribute_name("ChoicesLegend")
@@ -0,0 +1,134 @@
+import asyncio
+import time
+
+import pytest
+
+from custom_components.qsys_qrc.controlstate import ControlStateStore, async_read_controls
+from custom_components.qsys_qrc.qsys.qrc import QRCError
+
+
+def test_update_tracks_latest_value_and_version():
+    store = ControlStateStore()
+    assert store.get("gain", "mute") is None
+    assert store.value("gain", "mute", default=0.0) == 0.0
+    assert store.version("gain", "mute") == 0
+
+    store.update({"Component": "gain", "Name": "mute", "Value": 1.0, "String": "muted", "Position": 1.0})
+    state = store.update({"Component": "gain", "Name": "mute", "Value": 0.0, "String": "unmuted", "Position": 0.0})
+
+    assert store.get("gain", "mute") is state
+    assert state.as_dict() == {"value": 0.0, "string": "unmuted", "position": 0.0, "version": 2}
+    assert store.value("gain", "mute") == 0.0
+    assert store.version("gain", "mute") == 2
+
+
+def test_component_states():
+    store = ControlStateStore()
+    for component, control in (("gain", "gain"), ("gain", "mute"), ("player", "gain")):
+        store.update({"Component": component, "Name": control, "Value": 1})
+
+    assert len(store) == 3
+    assert sorted(store.component_states("gain")) == ["gain", "mute"]
+    assert store.component_states("unknown") == {}
+
+
+class FakeComponentAPI:
+    def __init__(self, core):
+        self._core = core
+
+    async def get(self, name, controls, *, timeout=None):
+        self._core.gets.append((name, [c["Name"] for c in controls]))
+        if name == "silent":
+            await asyncio.wait_for(asyncio.Event().wait(), timeout)
+        if name not in self._core.values:
+            raise QRCError({"code": 2, "message": "Unknown component name"})
+        return {
+            "result": {
+                "Name": name,
+                "Controls": [
+                    {"Name": c["Name"], "Value": self._core.values[name][c["Name"]]}
+                    for c in controls
+                ],
+            }
+        }
+
+
+class FakeCore:
+    def __init__(self, values):
+        self.values = values
+        self.gets = []
+
+    def component(self):
+        return FakeComponentAPI(self)
+
+
+@pytest.mark.asyncio
+async def test_read_controls_served_from_store():
+    store = ControlStateStore()
+    store.update({"Component": "gain", "Name": "mute", "Value": 1.0, "String": "muted", "Position": 1.0})
+    core = FakeCore({"gain": {"gain": -10.0}})
+
+    result = await async_read_controls(core, store, [("gain", "mute"), ("gain", "gain")])
+
+    assert core.gets == [("gain", ["gain"])]
+    assert result["gain"]["mute"]["source"] == "cache"
+    assert result["gain"]["mute"]["string"] == "muted"
+    assert result["gain"]["gain"] == {
+        "value": -10.0,
+        "string": None,
+        "position": None,
+        "age": None,
+        "source": "core",
+    }
+
+
+@pytest.mark.asyncio
+async def test_read_controls_refreshes_stale_and_reports_errors():
+    store = ControlStateStore()
+    store.update({"Component": "gain", "Name": "mute", "Value": 1.0})
+    store.update({"Component": "player", "Name": "play", "Value": 0.0})
+    store.get("gain", "mute").updated_at = time.monotonic() - 60
+    core = FakeCore({"gain": {"mute": 0.0}})
+
+    result = await async_read_controls(
+        core, store, [("gain", "mute"), ("player", "play"), ("unknown", "x")], max_age=10
+    )
+
+    assert sorted(core.gets) == [("gain", ["mute"]), ("unknown", ["x"])]
+    assert result["gain"]["mute"]["value"] == 0.0
+    assert result["gain"]["mute"]["source"] == "core"
+    assert result["player"]["play"]["source"] == "cache"
+    assert result["unknown"]["x"] == {"error": "Unknown component name"}
+
+
+@pytest.mark.asyncio
+async def test_read_controls_fresh_while_polled_and_stale_once_expired():
+    store = ControlStateStore()
+    store.update({"Component": "gain", "Name": "mute", "Value": 1.0}, "cg")
+    # unchanged since long ago, but confirmed by the last poll
+    store.get("gain", "mute").updated_at = time.monotonic() - 60
+    store.confirm("cg")
+    core = FakeCore({"gain": {"mute": 0.0}})
+
+    result = await async_read_controls(core, store, [("gain", "mute")], max_age=10)
+    assert core.gets == []
+    assert result["gain"]["mute"]["source"] == "cache"
+    assert result["gain"]["mute"]["age"] < 10
+
+    store.expire("cg")
+    result = await async_read_controls(core, store, [("gain", "mute")])
+    assert core.gets == [("gain", ["mute"])]
+    assert result["gain"]["mute"]["source"] == "core"
+
+
+@pytest.mark.asyncio
+async def test_read_controls_times_out_per_component():
+    core = FakeCore({"gain": {"mute": 0.0}})
+
+    async with asyncio.timeout(1):
+        result = await async_read_controls(
+            core, ControlStateStore(), [("gain", "mute"), ("silent", "x")], timeout=0.01
+        )
+
+    assert result["gain"]["mute"]["value"] == 0.0
+    assert result["silent"]["x"] == {"error": "TimeoutError()"}
@@ -0,0 +1,174 @@
+import asyncio
+import pytest
+import voluptuous as vol
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.qsys_qrc import (
+    CALL_METHOD_SCHEMA,
+    CONFIG_SCHEMA,
+    async_call_cores,
+    call_method_response,
+)
+from custom_components.qsys_qrc.qsys.qrc import QRCError
+
+
+def _tiers_config(tiers):
+    return {"qsys_qrc": {"cores": {"core": {"change_group": {"tiers": tiers}}}}}
+
+
+def test_poll_tier_named_like_default_tier_rejected():
+    config = CONFIG_SCHEMA(_tiers_config({"fast": {"poll_interval": 0.1}}))
+    assert "fast" in config["qsys_qrc"]["cores"]["core"]["change_group"]["tiers"]
+
+    with pytest.raises(vol.Invalid):
+        CONFIG_SCHEMA(_tiers_config({"normal": {"poll_interval": 0.1}}))
+
+
+class FakeCore:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    async def call(self, method, params=None, *, timeout=None):
+        self.calls.append((method, params, timeout))
+        if self.error is not None:
+            raise self.error
+        return {"jsonrpc": "2.0", "id": 1, "result": method}
+
+    async def call_many(self, calls, *, ordered=False, timeout=None):
+        results = []
+        for method, params in calls:
+            try:
+                results.append(await self.call(method, params, timeout=timeout))
+            except QRCError as ex:
+                results.append(ex)
+        self.calls.append(("ordered", ordered))
+        return results
+
+
+def test_call_method_schema_requires_method_per_call():
+    data = CALL_METHOD_SCHEMA(
+        {"device_id": "a", "calls": [{"method": "NoOp"}, {"method": "StatusGet", "params": 0}]}
+    )
+    assert data["ordered"] is False
+
+    with pytest.raises(vol.Invalid):
+        CALL_METHOD_SCHEMA({"device_id": "a", "calls": [{"params": {}}]})
+
+
+@pytest.mark.parametrize("data", [
+    {"device_id": "a"},
+    {"device_id": "a", "method": "NoOp", "calls": [{"method": "NoOp"}]},
+    {"device_id": "a", "method": "NoOp", "timeout": 0},
+])
+def test_call_method_schema_rejects(data):
+    with pytest.raises(vol.Invalid):
+        CALL_METHOD_SCHEMA(data)
+
+
+@pytest.mark.asyncio
+async def test_calls_sent_to_every_core():
+    cores = {"a": FakeCore(), "b": FakeCore()}
+    data = CALL_METHOD_SCHEMA({
+        "device_id": ["a", "b"],
+        "calls": [{"method": "Component.Set", "params": {"Name": "gain"}}, {"method": "NoOp"}],
+        "ordered": True,
+        "timeout": 2,
+    })
+
+    responses = await async_call_cores(cores, data)
+
+    for core in cores.values():
+        assert core.calls == [
+            ("Component.Set", {"Name": "gain"}, 2.0),
+            ("NoOp", None, 2.0),
+            ("ordered", True),
+        ]
+    assert call_method_response(data, responses) == {
+        "devices": {
+            device_id: {"results": [{"result": "Component.Set"}, {"result": "NoOp"}]}
+            for device_id in ("a", "b")
+        }
+    }
+
+
+@pytest.mark.asyncio
+async def test_failed_call_reported_per_call():
+    cores = {"a": FakeCore(QRCError({"code": 8, "message": "Unknown control"}))}
+    data = CALL_METHOD_SCHEMA({"device_id": "a", "calls": [{"method": "Component.Set"}]})
+
+    responses = await async_call_cores(cores, data)
+
+    assert call_method_response(data, responses) == {
+        "results": [{"error": {"code": 8, "message": "Unknown control"}}]
+    }
+
+
+@pytest.mark.asyncio
+async def test_single_device_gets_raw_response():
+    cores = {"a": FakeCore()}
+    data = CALL_METHOD_SCHEMA({"device_id": "a", "method": "StatusGet"})
+
+    responses = await async_call_cores(cores, data)
+
+    assert call_method_response(data, responses) == {"jsonrpc": "2.0", "id": 1, "result": "StatusGet"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", [
+    {"device_id": ["a", "b"], "method": "NoOp"},
+    {"device_id": ["a", "b"], "calls": [{"method": "NoOp"}]},
+])
+async def test_failing_core_does_not_fail_the_others(data):
+    class BrokenCore(FakeCore):
+        async def call_many(self, calls, *, ordered=False, timeout=None):
+            raise TimeoutError()
+
+    cores = {"a": FakeCore(), "b": BrokenCore(TimeoutError())}
+    data = CALL_METHOD_SCHEMA(data)
+
+    response = call_method_response(data, await async_call_cores(cores, data))
+
+    assert response["devices"]["b"] == {"error": {"message": "TimeoutError()"}}
+    assert "error" not in response["devices"]["a"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", [
+    {"device_id": ["a", "b"], "method": "NoOp"},
+    {"device_id": ["a", "b"], "calls": [{"method": "NoOp"}]},
+])
+async def test_all_cores_failing_raises(data):
+    class BrokenCore(FakeCore):
+        async def call_many(self, calls, *, ordered=False, timeout=None):
+            raise QRCError({"code": -1, "message": "not connected"})
+
+    error = QRCError({"code": -1, "message": "not connected"})
+    cores = {"a": BrokenCore(error), "b": BrokenCore(error)}
+
+    with pytest.raises(ServiceValidationError, match="not connected"):
+        await async_call_cores(cores, CALL_METHOD_SCHEMA(data))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", [
+    {"device_id": ["a", "b"], "method": "NoOp"},
+    {"device_id": ["a", "b"], "calls": [{"method": "NoOp"}]},
+])
+async def test_core_that_never_answers_times_out(data):
+    class SilentCore(FakeCore):
+        async def call(self, method, params=None, *, timeout=None):
+            self.calls.append((method, params, timeout))
+            await asyncio.wait_for(asyncio.Event().wait(), timeout)
+
+        async def call_many(self, calls, *, ordered=False, timeout=None):
+            return [await self.call(method, params, timeout=timeout) for method, params in calls]
+
+    cores = {"a": FakeCore(), "b": SilentCore()}
+    data = CALL_METHOD_SCHEMA(data)
+
+    async with asyncio.timeout(1):
+        responses = await async_call_cores(cores, data, {"a": 5.0, "b": 0.01})
+
+    assert cores["b"].calls == [("NoOp", None, 0.01)]
+    assert isinstance(responses["b"], TimeoutError)
@@ -0,0 +1,150 @@
+import asyncio
+import pytest
+
+from custom_components.qsys_qrc.metadata import DesignMetadataCache
+from custom_components.qsys_qrc.qsys.qrc import QRCError
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeStore:
+    def __init__(self, data=None):
+        self.data = data
+        self.saves = 0
+
+    async def async_load(self):
+        return self.data
+
+    def async_delay_save(self, data_func, delay=0):  # noqa: ARG002
+        self.data = data_func()
+        self.saves += 1
+
+
+class FakeHass:
+    def __init__(self):
+        self.tasks = []
+
+    def async_create_background_task(self, target, name):  # noqa: ARG002
+        task = asyncio.get_running_loop().create_task(target)
+        self.tasks.append(task)
+        return task
+
+
+class FakeComponentAPI:
+    def __init__(self, core):
+        self._core = core
+
+    async def get_components(self, *, timeout=None):
+        self._core.calls.append(("Component.GetComponents",))
+        self._core.timeouts.append(timeout)
+        if isinstance(self._core.components, Exception):
+            raise self._core.components
+        return {"result": self._core.components}
+
+    async def get_controls(self, name, *, timeout=None):
+        self._core.calls.append(("Component.GetControls", name))
+        self._core.timeouts.append(timeout)
+        return {"result": {"Name": name, "Controls": self._core.controls[name]}}
+
+
+class FakeCore:
+    def __init__(self, components, controls):
+        self.components = components
+        self.controls = controls
+        self.calls = []
+        self.timeouts = []
+
+    def component(self):
+        return FakeComponentAPI(self)
+
+
+PLAYER = {"Name": "player", "Type": "audio_file_player", "Properties": []}
+GAIN = {"Name": "gain", "Type": "gain", "Properties": [{"Name": "n_channels", "Value": "2"}]}
+CONTROLS = {"player": [{"Name": "play"}], "gain": [{"Name": "gain"}, {"Name": "mute"}]}
+
+
+async def test_metadata_fetched_once_and_persisted():
+    core = FakeCore([PLAYER, GAIN], CONTROLS)
+    store = FakeStore()
+    cache = DesignMetadataCache(FakeHass(), core, store, request_timeout=5.0)
+    await cache.async_load()
+
+    assert await cache.get_components() == [PLAYER, GAIN]
+    assert await cache.get_controls("gain") == CONTROLS["gain"]
+    assert await cache.get_components() == [PLAYER, GAIN]
+    assert await cache.get_controls("gain") == CONTROLS["gain"]
+    assert core.calls == [("Component.GetComponents",), ("Component.GetControls", "gain")]
+    # bounded even though the core waits for reconnects by default
+    assert core.timeouts == [5.0, 5.0]
+    assert store.data["controls"] == {"gain": CONTROLS["gain"]}
+
+    # unknown design code is adopted without fetching anything
+    await cache.async_revalidate("design-1")
+    assert len(core.calls) == 2
+    assert cache.design_code == "design-1"
+
+
+async def test_unchanged_design_served_from_store():
+    core = FakeCore([PLAYER, GAIN], CONTROLS)
+    store = FakeStore({"design_code": "design-1", "components": [PLAYER, GAIN], "controls": CONTROLS})
+    cache = DesignMetadataCache(FakeHass(), core, store)
+    await cache.async_load()
+
+    assert await cache.get_components() == [PLAYER, GAIN]
+    assert await cache.get_controls("player") == CONTROLS["player"]
+    await cache.async_revalidate("design-1")
+    assert core.calls == []
+
+
+async def test_design_change_invalidates_changed_components_only():
+    changed_gain = dict(GAIN, Properties=[{"Name": "n_channels", "Value": "4"}])
+    core = FakeCore([PLAYER, changed_gain], dict(CONTROLS, gain=[{"Name": "gain.1"}]))
+    store = FakeStore({"design_code": "design-1", "components": [PLAYER, GAIN], "controls": CONTROLS})
+    cache = DesignMetadataCache(FakeHass(), core, store)
+    await cache.async_load()
+
+    cache.on_engine_status({"State": "Active", "DesignCode": "design-2"})
+    await asyncio.gather(*cache.hass.tasks)
+
+    assert cache.design_code == "design-2"
+    assert store.data["design_code"] == "design-2"
+    assert await cache.get_components() == [PLAYER, changed_gain]
+    assert await cache.get_controls("player") == CONTROLS["player"]
+    assert await cache.get_controls("gain") == [{"Name": "gain.1"}]
+    assert core.calls == [("Component.GetComponents",), ("Component.GetControls", "gain")]
+
+
+async def test_failed_revalidation_keeps_cache():
+    core = FakeCore(QRCError({"code": -1, "message": "disconnected"}), CONTROLS)
+    store = FakeStore({"design_code": "design-1", "components": [PLAYER], "controls": CONTROLS})
+    cache = DesignMetadataCache(FakeHass(), core, store)
+    await cache.async_load()
+
+    await asyncio.wait_for(cache.async_revalidate("design-2"), 1)
+
+    assert cache.design_code == "design-1"
+    assert await cache.get_controls("gain") == CONTROLS["gain"]
+    assert store.saves == 0
+
+
+async def test_close_cancels_background_revalidation():
+    class StalledComponentAPI(FakeComponentAPI):
+        async def get_components(self, *, timeout=None):
+            await asyncio.Event().wait()
+
+    core = FakeCore([GAIN], CONTROLS)
+    core.component = lambda: StalledComponentAPI(core)
+    store = FakeStore({"design_code": "design-1", "components": [GAIN], "controls": CONTROLS})
+    cache = DesignMetadataCache(FakeHass(), core, store)
+    await cache.async_load()
+
+    # each new DesignCode schedules a revalidation, all are cancelled
+    cache.on_engine_status({"DesignCode": "design-2"})
+    cache.on_engine_status({"DesignCode": "design-3"})
+    await asyncio.sleep(0)
+    cache.close()
+
+    results = await asyncio.gather(*cache.hass.tasks, return_exceptions=True)
+    assert len(results) == 2
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert cache.design_code == "design-1"
@@ -1,5 +1,6 @@
 import asyncio
 import contextlib
+import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -11,9 +12,56 @@ TEST_HOST = "127.0.0.1"
 TEST_PORT = 1710
 
 
-async def _mocked_open_connection():
-    """Create a mocked stream pair for testing."""
-    return MagicMock(), MagicMock()
+CREATE_CONNECTION = 'asyncio.base_events.BaseEventLoop.create_connection'
+
+
+class FakeTransport:
+    """Transport stand-in that records writes and reports closing to the protocol."""
+
+    def __init__(self, protocol):
+        self.protocol = protocol
+        self.written = []
+        self.closed = False
+
+    def writelines(self, data):
+        self.written.extend(data)
+
+    def is_closing(self):
+        return self.closed
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            asyncio.get_running_loop().call_soon(self.protocol.connection_lost, None)
+
+    def abort(self):
+        self.close()
+
+
+def _fake_connection(on_connected=None, transport_factory=FakeTransport):
+    """Side effect for create_connection returning a fake transport/protocol pair.
+
+    on_connected(protocol) is called once connected, to feed data or drop the connection.
+    """
+
+    async def create_connection(protocol_factory, host, port):
+        protocol = protocol_factory()
+        transport = transport_factory(protocol)
+        protocol.connection_made(transport)
+        if on_connected:
+            on_connected(protocol)
+        return transport, protocol
+
+    return create_connection
+
+
+def _lose_connection(exc=None):
+    """on_connected hook that drops the connection right away (EOF when exc is None)."""
+
+    def on_connected(protocol):
+        asyncio.get_running_loop().call_soon(protocol.connection_lost, exc)
+
+    return on_connected
 
 
 @pytest.mark.asyncio
@@ -24,19 +72,21 @@ async def test_core_initialization():
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_core_connect(mock_open_connection):
-    mock_open_connection.return_value = await _mocked_open_connection()
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_core_connect(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection()
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
-    mock_open_connection.assert_called_once_with(
-        TEST_HOST, TEST_PORT, limit=5 * 1024 * 1024)
+    mock_create_connection.assert_called_once_with(
+        core._create_protocol, TEST_HOST, TEST_PORT)
+    assert isinstance(core._protocol, qrc.QRCProtocol)
+    assert core._protocol._max_frame_size == qrc.DEFAULT_MAX_FRAME_SIZE
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_core_run_until_stopped(mock_open_connection):
-    mock_open_connection.return_value = await _mocked_open_connection()
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_core_run_until_stopped(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection()
     core = Core(TEST_HOST, TEST_PORT)
     run_task = asyncio.create_task(core.run_until_stopped())
 
@@ -49,16 +99,15 @@ async def test_core_run_until_stopped(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_core_call(mock_open_connection):
-    reader, writer = await _mocked_open_connection()
-    mock_open_connection.return_value = (reader, writer)
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_core_call(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection()
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
 
     with patch.object(core, '_send', new_callable=AsyncMock) as mock_send:
         result = 412
-        mock_send.side_effect = lambda params: core._pending[params['id']].set_result(
+        mock_send.side_effect = lambda params, deadline, priority: core._pending[params['id']].set_result(
             result)
         response = await core.call('Test', {'param': 'value'})
         mock_send.assert_called_once()
@@ -66,10 +115,9 @@ async def test_core_call(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_core_noop(mock_open_connection):
-    reader, writer = await _mocked_open_connection()
-    mock_open_connection.return_value = (reader, writer)
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_core_noop(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection()
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
 
@@ -80,10 +128,9 @@ async def test_core_noop(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_core_logon(mock_open_connection):
-    reader, writer = await _mocked_open_connection()
-    mock_open_connection.return_value = (reader, writer)
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_core_logon(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection()
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
     with patch.object(core, 'call', new_callable=AsyncMock) as mock_call:
@@ -94,43 +141,40 @@ async def test_core_logon(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_core_status_get(mock_open_connection):
-    reader, writer = await _mocked_open_connection()
-    mock_open_connection.return_value = (reader, writer)
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_core_status_get(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection()
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
 
     with patch.object(core, 'call', new_callable=AsyncMock) as mock_call:
         mock_call.return_value = None
         await core.status_get()
-        mock_call.assert_called_once_with('StatusGet')
+        mock_call.assert_called_once_with('StatusGet', timeout=None, priority=qrc.Priority.BACKGROUND)
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_component_api_get(mock_open_connection):
-    reader, writer = await _mocked_open_connection()
-    mock_open_connection.return_value = (reader, writer)
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_component_api_get(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection()
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
 
-    with patch.object(core, 'call', new_callable=AsyncMock) as mock_call:
+    with patch.object(core, 'call_shared', new_callable=AsyncMock) as mock_call:
         retval = {"Name": "My APM", "Controls": [
             {"Name": "ent.xfade.gain", "Value": -100.0, "String": "-100.0dB", "Position": 0}]}
         mock_call.return_value = retval
         component_api = qrc.ComponentAPI(core)
         result = await component_api.get('component_id', controls=[{"Name": "ent.xfade.gain"}])
         mock_call.assert_called_once_with('Component.Get', params={
-                                          'Name': 'component_id', 'Controls': [{'Name': 'ent.xfade.gain'}]})
+                                          'Name': 'component_id', 'Controls': [{'Name': 'ent.xfade.gain'}]}, timeout=None, priority=qrc.Priority.INTERACTIVE)
         assert result == retval
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_component_api_set(mock_open_connection):
-    reader, writer = await _mocked_open_connection()
-    mock_open_connection.return_value = (reader, writer)
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_component_api_set(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection()
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
 
@@ -139,18 +183,17 @@ async def test_component_api_set(mock_open_connection):
         component_api = qrc.ComponentAPI(core)
         await component_api.set('component_id', {"Name": "My APM", "Controls": [{"Name": "ent.xfade.gain", "Value": -100.0, "Ramp": 2.0}]})
         mock_call.assert_called_once_with('Component.Set', params={'Name': 'component_id', 'Controls': {
-                                          'Name': 'My APM', 'Controls': [{'Name': 'ent.xfade.gain', 'Value': -100.0, 'Ramp': 2.0}]}})
+                                          'Name': 'My APM', 'Controls': [{'Name': 'ent.xfade.gain', 'Value': -100.0, 'Ramp': 2.0}]}}, timeout=None, priority=qrc.Priority.INTERACTIVE)
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_component_api_get_components(mock_open_connection):
-    reader, writer = await _mocked_open_connection()
-    mock_open_connection.return_value = (reader, writer)
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_component_api_get_components(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection()
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
 
-    with patch.object(core, 'call', new_callable=AsyncMock) as mock_call:
+    with patch.object(core, 'call_shared', new_callable=AsyncMock) as mock_call:
         retval = [
             {
                 "Name": "APM ABC",
@@ -174,19 +217,19 @@ async def test_component_api_get_components(mock_open_connection):
         mock_call.return_value = retval
         component_api = qrc.ComponentAPI(core)
         result = await component_api.get_components()
-        mock_call.assert_called_once_with('Component.GetComponents')
+        mock_call.assert_called_once_with(
+            'Component.GetComponents', timeout=None, priority=qrc.Priority.BACKGROUND)
         assert result == retval
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_component_api_get_controls(mock_open_connection):
-    reader, writer = await _mocked_open_connection()
-    mock_open_connection.return_value = (reader, writer)
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_component_api_get_controls(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection()
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
 
-    with patch.object(core, 'call', new_callable=AsyncMock) as mock_call:
+    with patch.object(core, 'call_shared', new_callable=AsyncMock) as mock_call:
         retval = {
             "Name": "MyGain",
             "Controls": [
@@ -215,15 +258,15 @@ async def test_component_api_get_controls(mock_open_connection):
         component_api = qrc.ComponentAPI(core)
         result = await component_api.get_controls('component_id')
         mock_call.assert_called_once_with(
-            'Component.GetControls', params={'Name': 'component_id'})
+            'Component.GetControls', params={'Name': 'component_id'}, timeout=None,
+            priority=qrc.Priority.BACKGROUND)
         assert result == retval
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_change_group_api_poll(mock_open_connection):
-    reader, writer = await _mocked_open_connection()
-    mock_open_connection.return_value = (reader, writer)
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_change_group_api_poll(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection()
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
 
@@ -243,7 +286,8 @@ async def test_change_group_api_poll(mock_open_connection):
         mock_call.return_value = addretval
         result = await change_group_api.add_component_control("My Component")
         mock_call.assert_called_once_with('ChangeGroup.AddComponentControl', params={
-                                          'Id': 1234, 'Component': 'My Component'})
+                                          'Id': 1234, 'Component': 'My Component'}, timeout=None,
+                                          priority=qrc.Priority.BACKGROUND)
         assert result == addretval
 
         mock_call.reset_mock()
@@ -266,10 +310,545 @@ async def test_change_group_api_poll(mock_open_connection):
         }
         mock_call.return_value = retval
         result = await change_group_api.poll()
-        mock_call.assert_called_once_with('ChangeGroup.Poll', {'Id': 1234})
+        mock_call.assert_called_once_with(
+            'ChangeGroup.Poll', {'Id': 1234}, timeout=None, priority=qrc.Priority.POLL)
         assert result == retval
 
 
+@pytest.mark.asyncio
+async def test_change_group_api_auto_poll():
+    core = Core(TEST_HOST, TEST_PORT)
+
+    with patch.object(core, 'call', new_callable=AsyncMock) as mock_call:
+        change_group_api = core.change_group("my change group")
+        await change_group_api.auto_poll(0.5, timeout=2.0)
+        mock_call.assert_called_once_with(
+            'ChangeGroup.AutoPoll', {'Id': "my change group", 'Rate': 0.5}, timeout=2.0,
+            priority=qrc.Priority.POLL)
+
+
+@pytest.mark.asyncio
+async def test_change_group_push_routed_to_listener():
+    core = Core(TEST_HOST, TEST_PORT)
+    protocol = core._create_protocol()
+    push = {
+        "jsonrpc": "2.0",
+        "method": "ChangeGroup.Poll",
+        "params": {"Id": "cg", "Changes": [{"Component": "c", "Name": "gain", "Value": 1}]},
+    }
+
+    received = []
+    unsubscribe = core.subscribe_change_group_push("cg", received.append)
+
+    protocol.data_received(
+        json.dumps(push).encode() + DELIMITER
+        + json.dumps(dict(push, params={"Id": "other", "Changes": []})).encode() + DELIMITER
+    )
+    assert received == [push["params"]]
+
+    unsubscribe()
+    assert core._change_group_push_listeners == {}
+
+
+@pytest.mark.asyncio
+async def test_notifications_dispatched_by_method():
+    core = Core(TEST_HOST, TEST_PORT)
+    protocol = core._create_protocol()
+    status = {"State": "Active", "DesignName": "design", "DesignCode": "abc"}
+
+    received = []
+
+    def failing_handler(params):
+        raise RuntimeError("handler failure")
+
+    core.subscribe_notification("EngineStatus", failing_handler)
+    unsubscribe = core.subscribe_notification("EngineStatus", received.append)
+
+    for message in (
+        {"jsonrpc": "2.0", "method": "EngineStatus", "params": status},
+        {"jsonrpc": "2.0", "method": "Unknown", "params": {}},
+        {"jsonrpc": "2.0", "method": "EngineStatus", "params": status},
+    ):
+        protocol.data_received(json.dumps(message).encode() + DELIMITER)
+    # a failing handler neither stops the connection nor other handlers
+    assert not protocol.closed.done()
+    assert received == [status, status]
+
+    unsubscribe()
+    assert core._notification_handlers["EngineStatus"] == (failing_handler,)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec", [qrc.JSONCodec(), qrc.OrjsonCodec()], ids=lambda c: c.name)
+async def test_codec_round_trip(codec):
+    message = {"jsonrpc": "2.0", "id": 1, "result": {"Name": "gain", "Value": -12.5, "String": "-12.5dB°"}}
+    encoded = codec.encode(message)
+    assert isinstance(encoded, bytes)
+    assert DELIMITER not in encoded
+    assert codec.decode(encoded) == message
+
+
+@pytest.mark.asyncio
+async def test_default_codec_prefers_orjson():
+    assert isinstance(qrc.default_codec(), qrc.OrjsonCodec)
+    assert isinstance(Core(TEST_HOST, TEST_PORT)._codec, qrc.OrjsonCodec)
+
+
+@pytest.mark.asyncio
+async def test_send_encodes_message_once():
+    codec = MagicMock(wraps=qrc.JSONCodec())
+    core = Core(TEST_HOST, TEST_PORT, codec=codec)
+    core._transport = MagicMock()
+    await core._set_state(ConnectionState.CONNECTED)
+
+    await core._send({"method": "NoOp", "params": {}, "id": 1})
+
+    codec.encode.assert_called_once()
+    core._transport.writelines.assert_called_once_with(
+        (b'{"method":"NoOp","params":{},"id":1,"jsonrpc":"2.0"}', DELIMITER)
+    )
+
+
+@pytest.mark.asyncio
+async def test_protocol_splits_frames_across_chunks():
+    frames = []
+    protocol = qrc.QRCProtocol(lambda frame: frames.append(bytes(frame)))
+    protocol.connection_made(FakeTransport(protocol))
+
+    protocol.data_received(b'{"id":1}' + DELIMITER + b'{"id"')
+    protocol.data_received(b':2}')
+    assert frames == [b'{"id":1}']
+    protocol.data_received(DELIMITER + b'{"id":3}' + DELIMITER)
+    assert frames == [b'{"id":1}', b'{"id":2}', b'{"id":3}']
+    assert protocol._buffer == bytearray()
+
+
+@pytest.mark.asyncio
+async def test_protocol_rejects_oversized_frame():
+    frames = []
+    protocol = qrc.QRCProtocol(frames.append, max_frame_size=8)
+    transport = FakeTransport(protocol)
+    protocol.connection_made(transport)
+
+    protocol.data_received(b'{"id":1,')
+    assert not protocol.closed.done()
+    protocol.data_received(b'"result":{}}')
+
+    assert transport.closed
+    reason = protocol.closed.result()
+    assert isinstance(reason, QRCError)
+    assert frames == []
+
+
+@pytest.mark.asyncio
+async def test_responses_resolved_from_frames():
+    core = Core(TEST_HOST, TEST_PORT)
+    protocol = core._create_protocol()
+    future = asyncio.Future()
+    core._pending[7] = future
+
+    protocol.data_received(b'{"jsonrpc":"2.0","id":7,"result":{"Platform":"Core 110f"}}' + DELIMITER)
+
+    assert future.result() == {"jsonrpc": "2.0", "id": 7, "result": {"Platform": "Core 110f"}}
+
+
+async def _connected_core(**kwargs):
+    core = Core(TEST_HOST, TEST_PORT, **kwargs)
+    core._transport = FakeTransport(None)
+    await core._set_state(ConnectionState.CONNECTED)
+    return core
+
+
+@pytest.mark.asyncio
+async def test_call_timeout_removes_pending_request():
+    core = await _connected_core()
+
+    with pytest.raises(TimeoutError):
+        await core.call('NoOp', timeout=0.01)
+    assert core._pending == {}
+    assert core._deadlines == []
+    assert core._deadline_timer is None
+
+
+@pytest.mark.asyncio
+async def test_call_uses_default_timeout_and_deadline():
+    core = await _connected_core(default_timeout=0.01)
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    with pytest.raises(TimeoutError):
+        await core.call('NoOp')
+    assert loop.time() - started < 1
+
+    # an explicit deadline takes precedence over the default timeout
+    call = asyncio.create_task(core.call('NoOp', deadline=loop.time() + 0.05))
+    await asyncio.sleep(0.02)
+    assert not call.done()
+    with pytest.raises(TimeoutError):
+        await call
+    assert core._pending == {}
+
+
+@pytest.mark.asyncio
+async def test_single_timer_expires_deadlines_in_order():
+    core = await _connected_core()
+    protocol = core._create_protocol()
+
+    slow = asyncio.create_task(core.call('Slow', timeout=0.05))
+    answered = asyncio.create_task(core.call('Answered', timeout=0.01))
+    fast = asyncio.create_task(core.call('Fast', timeout=0.02))
+    await asyncio.sleep(0)
+    timer = core._deadline_timer
+    assert timer is not None and len(core._deadlines) == 3
+
+    # answered calls are not expired, later deadlines keep their own expiry
+    protocol.data_received(b'{"jsonrpc":"2.0","id":2,"result":true}' + DELIMITER)
+    assert (await answered)["result"] is True
+    with pytest.raises(TimeoutError):
+        await fast
+    assert not slow.done()
+    with pytest.raises(TimeoutError):
+        await slow
+    assert core._pending == {}
+    assert core._deadlines == []
+
+
+class NoOpAnsweringTransport(FakeTransport):
+    """Transport that answers every NoOp request."""
+
+    def writelines(self, data):
+        super().writelines(data)
+        request = json.loads(data[0])
+        if request["method"] == "NoOp":
+            response = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": True})
+            asyncio.get_running_loop().call_soon(
+                self.protocol.data_received, response.encode() + DELIMITER)
+
+
+@pytest.mark.asyncio
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_keepalive_records_round_trips_when_idle(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection(
+        transport_factory=NoOpAnsweringTransport)
+    core = Core(TEST_HOST, TEST_PORT, keepalive_interval=0.01)
+    assert core.keepalive_stats()["p50"] is None
+
+    run_task = asyncio.create_task(core.run_until_stopped())
+    from .utils import wait_for_condition
+    await wait_for_condition(lambda: core.keepalive_stats()["samples"] >= 3,
+                             fail_msg='keepalives not answered')
+    stats = core.keepalive_stats()
+    assert stats["missed"] == 0
+    assert 0 <= stats["min"] <= stats["p50"] <= stats["p95"] <= stats["max"]
+
+    await core.stop()
+    await run_task
+
+
+@pytest.mark.asyncio
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_keepalive_skipped_while_link_busy(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection()
+    core = Core(TEST_HOST, TEST_PORT, keepalive_interval=0.05)
+    run_task = asyncio.create_task(core.run_until_stopped())
+    await core.wait_until_connected()
+
+    transport = core._transport
+    protocol = core._protocol
+    for _ in range(5):
+        await asyncio.sleep(0.02)
+        await core._send({"method": "StatusGet", "params": {}, "id": 1})
+        protocol.data_received(b'{"jsonrpc":"2.0","method":"EngineStatus","params":{}}' + DELIMITER)
+    assert all(b'NoOp' not in data for data in transport.written)
+
+    await core.stop()
+    await run_task
+
+
+@pytest.mark.asyncio
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_missed_keepalives_force_reconnect(mock_create_connection):
+    mock_create_connection.side_effect = _fake_connection()
+    core = Core(TEST_HOST, TEST_PORT, backoff_initial=0.01, keepalive_interval=0.01,
+                keepalive_timeout=0.01, keepalive_max_missed=2)
+    run_task = asyncio.create_task(core.run_until_stopped())
+
+    from .utils import wait_for_condition
+    await wait_for_condition(lambda: mock_create_connection.call_count >= 2,
+                             fail_msg='dead link not detected')
+    assert core.keepalive_stats()["samples"] == 0
+
+    await core.stop()
+    await run_task
+
+
+@pytest.mark.asyncio
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_missed_keepalive_probes_wait_interval(mock_create_connection, caplog):
+    mock_create_connection.side_effect = _fake_connection()
+    core = Core(TEST_HOST, TEST_PORT, backoff_initial=10, keepalive_interval=0.05,
+                keepalive_timeout=0.01, keepalive_max_missed=3)
+    run_task = asyncio.create_task(core.run_until_stopped())
+    await core.wait_until_connected()
+    transport = core._transport
+
+    await asyncio.sleep(0.12)
+    # probes are an interval apart, not sent back to back after a miss
+    assert len(_written_methods(transport)) <= 2
+
+    from .utils import wait_for_condition
+    await wait_for_condition(lambda: mock_create_connection.call_count >= 1 and transport.closed,
+                             fail_msg='dead link not detected')
+    await asyncio.sleep(0.01)
+    assert not any(record.exc_info for record in caplog.records)
+
+    await core.stop()
+    await run_task
+
+
+def _written_methods(transport):
+    return [json.loads(data)["method"] for data in transport.written if data != DELIMITER]
+
+
+def _respond(protocol, transport, index):
+    request = json.loads([data for data in transport.written if data != DELIMITER][index])
+    protocol.data_received(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": True}).encode() + DELIMITER)
+
+
+@pytest.mark.asyncio
+async def test_queued_requests_sent_by_priority():
+    core = await _connected_core(max_in_flight=1)
+    protocol = core._create_protocol()
+    transport = core._transport
+
+    calls = [asyncio.create_task(core.call('First'))]
+    await asyncio.sleep(0)
+    for method, priority in (('Metadata', qrc.Priority.BACKGROUND),
+                             ('Poll', qrc.Priority.POLL),
+                             ('Set', qrc.Priority.INTERACTIVE)):
+        calls.append(asyncio.create_task(core.call(method, priority=priority)))
+        await asyncio.sleep(0)
+    assert _written_methods(transport) == ['First']
+
+    for index in range(3):
+        _respond(protocol, transport, index)
+    _respond(protocol, transport, 3)
+    await asyncio.gather(*calls)
+    assert _written_methods(transport) == ['First', 'Set', 'Poll', 'Metadata']
+    assert core._in_flight == set()
+
+
+@pytest.mark.asyncio
+async def test_lower_priority_not_starved():
+    core = await _connected_core(max_in_flight=1, starvation_limit=2)
+    protocol = core._create_protocol()
+    transport = core._transport
+
+    calls = [asyncio.create_task(core.call('First'))]
+    await asyncio.sleep(0)
+    calls.append(asyncio.create_task(core.call('Metadata', priority=qrc.Priority.BACKGROUND)))
+    calls.extend(asyncio.create_task(core.call(f'Set{i}')) for i in range(4))
+    await asyncio.sleep(0)
+
+    for index in range(6):
+        _respond(protocol, transport, index)
+    await asyncio.gather(*calls)
+    assert _written_methods(transport) == ['First', 'Set0', 'Set1', 'Metadata', 'Set2', 'Set3']
+
+
+@pytest.mark.asyncio
+async def test_queued_requests_wait_for_resume_writing():
+    core = Core(TEST_HOST, TEST_PORT)
+    protocol = core._create_protocol()
+    core._protocol = protocol
+    core._transport = transport = FakeTransport(protocol)
+    await core._set_state(ConnectionState.CONNECTED)
+
+    protocol.pause_writing()
+    call = asyncio.create_task(core.call('Set', timeout=1))
+    await asyncio.sleep(0)
+    assert transport.written == []
+
+    protocol.resume_writing()
+    assert _written_methods(transport) == ['Set']
+    _respond(protocol, transport, 0)
+    await call
+
+
+@pytest.mark.asyncio
+async def test_expired_queued_request_not_sent():
+    core = await _connected_core(max_in_flight=1)
+    protocol = core._create_protocol()
+    transport = core._transport
+
+    first = asyncio.create_task(core.call('First'))
+    await asyncio.sleep(0)
+    with pytest.raises(TimeoutError):
+        await core.call('Expired', timeout=0.01)
+
+    _respond(protocol, transport, 0)
+    await first
+    assert _written_methods(transport) == ['First']
+
+
+@pytest.mark.asyncio
+async def test_expired_queued_request_not_sent_under_reused_id():
+    core = await _connected_core(max_in_flight=1)
+    protocol = core._create_protocol()
+    transport = core._transport
+
+    first = asyncio.create_task(core.call('First'))
+    await asyncio.sleep(0)
+    with pytest.raises(TimeoutError):
+        await core.call('Expired', timeout=0.01)
+    # hand the id of the expired request out again
+    core._id -= 1
+    reused = asyncio.create_task(core.call('Reused'))
+    await asyncio.sleep(0)
+
+    _respond(protocol, transport, 0)
+    await first
+    assert _written_methods(transport) == ['First', 'Reused']
+    _respond(protocol, transport, 1)
+    await reused
+
+
+@pytest.mark.asyncio
+async def test_coalesced_sets_merged_per_component():
+    core = Core(TEST_HOST, TEST_PORT, set_coalesce_window=0.01)
+    component = core.component()
+
+    with patch.object(core, 'call', new_callable=AsyncMock) as mock_call:
+        mock_call.return_value = {"result": True}
+        results = await asyncio.gather(
+            component.set_coalesced('gain', [{"Name": "gain", "Value": -10}]),
+            component.set_coalesced('gain', [{"Name": "mute", "Value": 1}]),
+            component.set_coalesced('gain', [{"Name": "gain", "Value": -5}]),
+            component.set_coalesced('other', [{"Name": "gain", "Value": 0}]),
+        )
+
+    assert results == [{"result": True}] * 4
+    assert mock_call.call_count == 3
+    # the first set goes out right away, the ones arriving meanwhile are merged
+    mock_call.assert_any_call('Component.Set', params={'Name': 'gain', 'Controls': [
+        {"Name": "gain", "Value": -10}]}, priority=qrc.Priority.INTERACTIVE)
+    mock_call.assert_any_call('Component.Set', params={'Name': 'gain', 'Controls': [
+        {"Name": "mute", "Value": 1}, {"Name": "gain", "Value": -5}]}, priority=qrc.Priority.INTERACTIVE)
+    mock_call.assert_any_call('Component.Set', params={'Name': 'other', 'Controls': [
+        {"Name": "gain", "Value": 0}]}, priority=qrc.Priority.INTERACTIVE)
+
+
+@pytest.mark.asyncio
+async def test_coalesced_set_failure_reported_to_all_callers():
+    core = Core(TEST_HOST, TEST_PORT, set_coalesce_window=0.01)
+    component = core.component()
+
+    with patch.object(core, 'call', new_callable=AsyncMock) as mock_call:
+        mock_call.side_effect = QRCError({"code": 8, "message": "Unknown control"})
+        results = await asyncio.gather(
+            component.set_coalesced('gain', [{"Name": "gain", "Value": -10}]),
+            component.set_coalesced('gain', [{"Name": "gain", "Value": -5}]),
+            return_exceptions=True,
+        )
+        # a new batch is started once the previous one was sent
+        mock_call.side_effect = None
+        await component.set_coalesced('gain', [{"Name": "gain", "Value": 0}])
+
+    assert all(isinstance(result, QRCError) for result in results)
+    assert mock_call.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_lone_coalesced_set_sent_right_away():
+    core = Core(TEST_HOST, TEST_PORT, set_coalesce_window=10)
+    component = core.component()
+
+    with patch.object(core, 'call', new_callable=AsyncMock) as mock_call:
+        mock_call.return_value = {"result": True}
+        async with asyncio.timeout(1):
+            result = await component.set_coalesced('gain', [{"Name": "mute", "Value": 1}])
+            other = await component.set_coalesced('other', [{"Name": "mute", "Value": 1}])
+
+    assert result == other == {"result": True}
+    assert mock_call.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_identical_reads_share_one_request():
+    core = await _connected_core()
+    protocol = core._create_protocol()
+    transport = core._transport
+    component = core.component()
+
+    reads = [
+        asyncio.create_task(component.get_controls('gain')),
+        asyncio.create_task(component.get_controls('gain')),
+        asyncio.create_task(component.get_controls('mute')),
+        asyncio.create_task(component.get('gain', [{"Name": "gain"}])),
+        asyncio.create_task(component.get('gain', [{"Name": "gain"}])),
+    ]
+    writes = [asyncio.create_task(component.set('gain', [{"Name": "gain", "Value": 0}]))
+              for _ in range(2)]
+    await asyncio.sleep(0.01)
+    assert sorted(_written_methods(transport)) == [
+        'Component.Get', 'Component.GetControls', 'Component.GetControls',
+        'Component.Set', 'Component.Set']
+
+    # a cancelled caller does not cancel the shared request
+    reads[0].cancel()
+    for index in range(5):
+        _respond(protocol, transport, index)
+    results = await asyncio.gather(*reads[1:], *writes)
+    assert results[2] is results[3]
+    assert core._shared_calls == {}
+
+    # once answered, the next read sends a new request
+    read = asyncio.create_task(component.get_controls('gain'))
+    await asyncio.sleep(0.01)
+    _respond(protocol, transport, 5)
+    await read
+    assert _written_methods(transport)[5] == 'Component.GetControls'
+
+
+@pytest.mark.asyncio
+async def test_call_many_pipelined_and_ordered():
+    core = await _connected_core()
+    protocol = core._create_protocol()
+    transport = core._transport
+    calls = [('Set1', {}), ('Set2', {}), ('Set3', {})]
+
+    batch = asyncio.create_task(core.call_many(calls))
+    await asyncio.sleep(0.01)
+    assert _written_methods(transport) == ['Set1', 'Set2', 'Set3']
+    _respond(protocol, transport, 2)
+    request = json.loads([data for data in transport.written if data != DELIMITER][1])
+    protocol.data_received(json.dumps({
+        "jsonrpc": "2.0", "id": request["id"], "error": {"code": 8, "message": "Bad"}}).encode() + DELIMITER)
+    _respond(protocol, transport, 0)
+    results = await batch
+    assert results[0]["result"] is True
+    assert isinstance(results[1], qrc.QRCError)
+    assert results[2]["result"] is True
+
+    transport.written.clear()
+    batch = asyncio.create_task(core.call_many(calls, ordered=True, timeout=1))
+    for index in range(3):
+        await asyncio.sleep(0.01)
+        assert len(_written_methods(transport)) == index + 1
+        _respond(protocol, transport, index)
+    assert [r["result"] for r in await batch] == [True, True, True]
+    assert _written_methods(transport) == ['Set1', 'Set2', 'Set3']
+
+
+@pytest.mark.asyncio
+async def test_call_waiting_for_connection_times_out():
+    core = Core(TEST_HOST, TEST_PORT)
+
+    with pytest.raises(TimeoutError):
+        await core.call('NoOp', timeout=0.01)
+    assert core._pending == {}
+
+
 # ============================================================================
 # New tests for refactored state management
 # ============================================================================
@@ -283,10 +862,10 @@ async def test_core_initial_state():
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_core_state_transitions(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_core_state_transitions(mock_create_connection):
     """Test that connection state transitions work correctly."""
-    mock_open_connection.return_value = await _mocked_open_connection()
+    mock_create_connection.side_effect = _fake_connection()
     core = Core(TEST_HOST, TEST_PORT)
 
     # Initially disconnected
@@ -307,8 +886,8 @@ async def test_core_state_transitions(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_wait_until_connected_timeout(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_wait_until_connected_timeout(mock_create_connection):
     """Test that wait_until_connected respects timeout."""
     core = Core(TEST_HOST, TEST_PORT)
 
@@ -318,10 +897,10 @@ async def test_wait_until_connected_timeout(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_wait_until_running_alias(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_wait_until_running_alias(mock_create_connection):
     """Test that wait_until_running is an alias for wait_until_connected."""
-    mock_open_connection.return_value = await _mocked_open_connection()
+    mock_create_connection.side_effect = _fake_connection()
     core = Core(TEST_HOST, TEST_PORT)
 
     # Start the run loop
@@ -339,12 +918,11 @@ async def test_wait_until_running_alias(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_on_connected_commands_execution(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_on_connected_commands_execution(mock_create_connection):
     """Test that on_connected commands are executed when connected."""
-    mock_reader = AsyncMock()
-    mock_writer = MagicMock()
-    mock_open_connection.return_value = (mock_reader, mock_writer)
+    # Drop the connection right away, commands still run first
+    mock_create_connection.side_effect = _fake_connection(_lose_connection())
 
     core = Core(TEST_HOST, TEST_PORT)
 
@@ -361,9 +939,6 @@ async def test_on_connected_commands_execution(mock_open_connection):
 
     core.set_on_connected_commands([async_command, sync_command, dict_command])
 
-    # Mock the reader to raise EOF after commands execute
-    mock_reader.readuntil.side_effect = EOFError()
-
     # Run the connection cycle
     with patch.object(core, 'call', new_callable=AsyncMock) as mock_call:
         run_task = asyncio.create_task(core.run_until_stopped())
@@ -382,8 +957,8 @@ async def test_on_connected_commands_execution(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_reconnection_with_backoff(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_reconnection_with_backoff(mock_create_connection):
     """Test that reconnection uses exponential backoff."""
     # Make connection fail initially
     connection_attempts = []
@@ -392,7 +967,7 @@ async def test_reconnection_with_backoff(mock_open_connection):
         connection_attempts.append(len(connection_attempts))
         raise ConnectionError("Connection failed")
 
-    mock_open_connection.side_effect = track_connection
+    mock_create_connection.side_effect = track_connection
 
     # Use tiny backoff values for speed
     core = Core(
@@ -418,11 +993,10 @@ async def test_reconnection_with_backoff(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_cleanup_fails_pending_requests(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_cleanup_fails_pending_requests(mock_create_connection):
     """Test that cleanup properly fails pending requests."""
-    mock_reader, mock_writer = await _mocked_open_connection()
-    mock_open_connection.return_value = (mock_reader, mock_writer)
+    mock_create_connection.side_effect = _fake_connection()
 
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
@@ -443,8 +1017,8 @@ async def test_cleanup_fails_pending_requests(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_send_when_not_connected(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_send_when_not_connected(mock_create_connection):
     """Test that _send raises error when not connected."""
     core = Core(TEST_HOST, TEST_PORT)
 
@@ -457,11 +1031,10 @@ async def test_send_when_not_connected(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_send_checks_connection_state(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_send_checks_connection_state(mock_create_connection):
     """Test that _send checks connection state after waiting."""
-    mock_reader, mock_writer = await _mocked_open_connection()
-    mock_open_connection.return_value = (mock_reader, mock_writer)
+    mock_create_connection.side_effect = _fake_connection()
 
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
@@ -478,19 +1051,11 @@ async def test_send_checks_connection_state(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_reader_task_cancellation_on_cleanup(mock_open_connection):
-    """Test that reader task is properly cancelled during cleanup."""
-    mock_reader = AsyncMock()
-    mock_writer = MagicMock()
-    mock_open_connection.return_value = (mock_reader, mock_writer)
-
-    # Make reader raise EOF after a short delay
-    async def delayed_eof(_):
-        await asyncio.sleep(10)  # Long enough to test cancellation
-        raise EOFError()
-
-    mock_reader.readuntil.side_effect = delayed_eof
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_transport_closed_on_cleanup(mock_create_connection):
+    """Test that the transport is closed and released during cleanup."""
+    # The connection stays open until stopped
+    mock_create_connection.side_effect = _fake_connection()
 
     core = Core(TEST_HOST, TEST_PORT)
     run_task = asyncio.create_task(core.run_until_stopped())
@@ -499,20 +1064,22 @@ async def test_reader_task_cancellation_on_cleanup(mock_open_connection):
         # Wait for connection
         await core.wait_until_connected()
 
-        # Reader task should be running
-        assert core._reader_task is not None
-        reader_task = core._reader_task
-        assert not reader_task.done()
+        # Transport should be open
+        transport = core._transport
+        protocol = core._protocol
+        assert transport is not None
+        assert not protocol.closed.done()
 
-        # Stop should cancel reader task
+        # Stop should close the transport
         await core.stop()
 
         # Give cleanup time to complete
         await asyncio.sleep(0.2)
 
-        # Reader task should now be done (cancelled)
-        assert reader_task.done()
-        assert core._reader_task is None
+        assert transport.closed
+        assert protocol.closed.done()
+        assert core._transport is None
+        assert core._protocol is None
     finally:
         # Ensure the run task is cancelled
         if not run_task.done():
@@ -522,10 +1089,10 @@ async def test_reader_task_cancellation_on_cleanup(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_multiple_stop_calls(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_multiple_stop_calls(mock_create_connection):
     """Test that multiple stop() calls are handled gracefully."""
-    mock_open_connection.return_value = await _mocked_open_connection()
+    mock_create_connection.side_effect = _fake_connection()
 
     core = Core(TEST_HOST, TEST_PORT)
     run_task = asyncio.create_task(core.run_until_stopped())
@@ -544,13 +1111,10 @@ async def test_multiple_stop_calls(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_connection_cycle_handles_eof(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_connection_cycle_handles_eof(mock_create_connection):
     """Test that connection cycle properly handles EOFError."""
-    mock_reader = AsyncMock()
-    mock_writer = MagicMock()
-    mock_reader.readuntil.side_effect = EOFError()
-    mock_open_connection.return_value = (mock_reader, mock_writer)
+    mock_create_connection.side_effect = _fake_connection(_lose_connection())
 
     core = Core(TEST_HOST, TEST_PORT)
 
@@ -566,13 +1130,10 @@ async def test_connection_cycle_handles_eof(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_connection_cycle_handles_timeout(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_connection_cycle_handles_timeout(mock_create_connection):
     """Test that connection cycle properly handles TimeoutError."""
-    mock_reader = AsyncMock()
-    mock_writer = MagicMock()
-    mock_reader.readuntil.side_effect = TimeoutError()
-    mock_open_connection.return_value = (mock_reader, mock_writer)
+    mock_create_connection.side_effect = _fake_connection(_lose_connection(TimeoutError()))
 
     core = Core(TEST_HOST, TEST_PORT)
 
@@ -588,11 +1149,10 @@ async def test_connection_cycle_handles_timeout(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_process_response_with_error(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_process_response_with_error(mock_create_connection):
     """Test that _process_response handles error responses."""
-    mock_reader, mock_writer = await _mocked_open_connection()
-    mock_open_connection.return_value = (mock_reader, mock_writer)
+    mock_create_connection.side_effect = _fake_connection()
 
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
@@ -611,7 +1171,7 @@ async def test_process_response_with_error(mock_open_connection):
         }
     }
 
-    await core._process_response(error_response)
+    core._process_response(error_response)
 
     # Future should have exception
     assert future.done()
@@ -621,11 +1181,10 @@ async def test_process_response_with_error(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_process_response_with_success(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_process_response_with_success(mock_create_connection):
     """Test that _process_response handles success responses."""
-    mock_reader, mock_writer = await _mocked_open_connection()
-    mock_open_connection.return_value = (mock_reader, mock_writer)
+    mock_create_connection.side_effect = _fake_connection()
 
     core = Core(TEST_HOST, TEST_PORT)
     await core.connect()
@@ -641,7 +1200,7 @@ async def test_process_response_with_success(mock_open_connection):
         "result": {"status": "ok", "value": 123}
     }
 
-    await core._process_response(success_response)
+    core._process_response(success_response)
 
     # Future should have result
     assert future.done()
@@ -668,8 +1227,42 @@ async def test_generate_id_wraps_around():
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_set_on_connected_commands(mock_open_connection):
+async def test_generate_id_skips_in_flight_ids():
+    core = Core(TEST_HOST, TEST_PORT)
+    core._pending = {1: asyncio.Future(), 2: asyncio.Future(), 4: asyncio.Future()}
+
+    assert core._generate_id() == 3
+    assert core._generate_id() == 5
+
+    core._pending = dict.fromkeys(range(qrc.ID_SPACE))
+    with pytest.raises(QRCError):
+        core._generate_id()
+
+
+@pytest.mark.asyncio
+async def test_pending_stats():
+    core = await _connected_core()
+    protocol = core._create_protocol()
+    assert core.pending_stats() == {
+        "depth": 0, "high_water": 0, "orphaned_responses": 0, "oldest_age": None}
+
+    calls = [asyncio.create_task(core.call('NoOp')) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    stats = core.pending_stats()
+    assert stats["depth"] == 3
+    assert stats["high_water"] == 3
+    assert stats["oldest_age"] >= 0.01
+
+    for id_ in (1, 2, 3, 3):
+        protocol.data_received(b'{"jsonrpc":"2.0","id":%d,"result":true}' % id_ + DELIMITER)
+    await asyncio.gather(*calls)
+    assert core.pending_stats() == {
+        "depth": 0, "high_water": 3, "orphaned_responses": 1, "oldest_age": None}
+
+
+@pytest.mark.asyncio
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_set_on_connected_commands(mock_create_connection):
     """Test setting on_connected_commands."""
     core = Core(TEST_HOST, TEST_PORT)
 
@@ -680,8 +1273,8 @@ async def test_set_on_connected_commands(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_component_factory_method(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_component_factory_method(mock_create_connection):
     """Test that component() returns ComponentAPI instance."""
     core = Core(TEST_HOST, TEST_PORT)
     component_api = core.component()
@@ -691,8 +1284,8 @@ async def test_component_factory_method(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_change_group_factory_method(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_change_group_factory_method(mock_create_connection):
     """Test that change_group() returns ChangeGroupAPI instance."""
     core = Core(TEST_HOST, TEST_PORT)
     cg_id = 12345
@@ -708,8 +1301,8 @@ async def test_change_group_factory_method(mock_open_connection):
 # ============================================================================
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_failure_during_connection_establishment(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_failure_during_connection_establishment(mock_create_connection):
     """Test that failures during connection establishment are handled and retried."""
     attempts = []
 
@@ -718,9 +1311,9 @@ async def test_failure_during_connection_establishment(mock_open_connection):
         if len(attempts) < 3:
             raise ConnectionRefusedError("Connection refused")
         # Succeed on third attempt
-        return await _mocked_open_connection()
+        return await _fake_connection()(*args, **kwargs)
 
-    mock_open_connection.side_effect = failing_connect
+    mock_create_connection.side_effect = failing_connect
 
     # Use tiny backoff values to accelerate retries while preserving semantics
     core = Core(
@@ -745,13 +1338,11 @@ async def test_failure_during_connection_establishment(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_failure_during_on_connected_commands(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_failure_during_on_connected_commands(mock_create_connection):
     """Test that failures in on_connected commands don't prevent operation."""
-    mock_reader = AsyncMock()
-    mock_writer = MagicMock()
-    mock_open_connection.return_value = (mock_reader, mock_writer)
-    mock_reader.readuntil.side_effect = EOFError()  # Will disconnect immediately
+    # Will disconnect immediately
+    mock_create_connection.side_effect = _fake_connection(_lose_connection())
 
     core = Core(TEST_HOST, TEST_PORT)
 
@@ -782,8 +1373,8 @@ async def test_failure_during_on_connected_commands(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_stuck_connect_timeout(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_stuck_connect_timeout(mock_create_connection):
     """Test that stuck connection attempts timeout and retry."""
     attempts = []
 
@@ -793,9 +1384,9 @@ async def test_stuck_connect_timeout(mock_open_connection):
         if len(attempts) == 1:
             await asyncio.sleep(100)  # Simulate stuck connection
         # Second attempt succeeds
-        return await _mocked_open_connection()
+        return await _fake_connection()(*args, **kwargs)
 
-    mock_open_connection.side_effect = stuck_connect
+    mock_create_connection.side_effect = stuck_connect
 
     # Shrink connection timeout & backoff to make the timeout/retry cycle fast
     core = Core(
@@ -820,24 +1411,19 @@ async def test_stuck_connect_timeout(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_stuck_reader_during_read(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_stuck_reader_during_read(mock_create_connection):
     """Test that stuck reader is properly handled and cleaned up."""
-    mock_reader = AsyncMock()
-    mock_writer = MagicMock()
-    mock_open_connection.return_value = (mock_reader, mock_writer)
-
-    # Make first read hang, then raise EOF
+    # Make the first connection silent for a while, then EOF
     read_count = [0]
-    async def stuck_then_eof(_):
+    def stuck_then_eof(protocol):
         read_count[0] += 1
         if read_count[0] == 1:
             # Simulate a brief "stuck" period before EOF (reduced from 0.5s)
-            await asyncio.sleep(0.05)
-            raise EOFError()  # Then disconnect
-        await asyncio.sleep(100)  # Subsequent reads hang
+            asyncio.get_running_loop().call_later(0.05, protocol.connection_lost, None)
+        # Subsequent connections stay silent
 
-    mock_reader.readuntil.side_effect = stuck_then_eof
+    mock_create_connection.side_effect = _fake_connection(stuck_then_eof)
 
     core = Core(TEST_HOST, TEST_PORT)
     run_task = asyncio.create_task(core.run_until_stopped())
@@ -847,9 +1433,9 @@ async def test_stuck_reader_during_read(mock_open_connection):
         # Wait until the first (stuck) read attempt completed and triggered EOF/cleanup
         from .utils import wait_for_condition
         await wait_for_condition(
-            lambda: read_count[0] >= 1 and core._reader_task is None,
+            lambda: read_count[0] >= 1 and core._transport is None,
             timeout=0.5,
-            fail_msg="Reader task did not clean up after EOF",
+            fail_msg="Transport was not cleaned up after EOF",
         )
 
         # Should handle the stuck reader and clean up
@@ -868,16 +1454,18 @@ async def test_stuck_reader_during_read(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_writer_close_failure(mock_open_connection):
-    """Test that writer close failures don't prevent cleanup."""
-    mock_reader = AsyncMock()
-    mock_writer = MagicMock()
-    mock_open_connection.return_value = (mock_reader, mock_writer)
-    mock_reader.readuntil.side_effect = EOFError()
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_transport_close_failure(mock_create_connection):
+    """Test that transport close failures don't prevent cleanup."""
+
+    # Make transport.close() raise an exception
+    class FailingCloseTransport(FakeTransport):
+        def close(self):
+            raise RuntimeError("Close failed")
 
-    # Make writer.close() raise an exception
-    mock_writer.close.side_effect = RuntimeError("Close failed")
+    mock_create_connection.side_effect = _fake_connection(
+        _lose_connection(), transport_factory=FailingCloseTransport
+    )
 
     core = Core(TEST_HOST, TEST_PORT)
     run_task = asyncio.create_task(core.run_until_stopped())
@@ -886,7 +1474,7 @@ async def test_writer_close_failure(mock_open_connection):
         await asyncio.wait_for(core.wait_until_connected(), timeout=5)
         await asyncio.sleep(0.2)  # Let disconnect happen
 
-        # Despite writer.close() failing, should still clean up
+        # Despite transport.close() failing, should still clean up
         await core.stop()
 
         state = await core.get_state()
@@ -899,26 +1487,22 @@ async def test_writer_close_failure(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_unexpected_exception_during_read(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_unexpected_exception_during_read(mock_create_connection):
     """Test that unexpected exceptions during read are handled and reconnection occurs."""
     connection_count = [0]
 
-    async def multi_connection(*args, **kwargs):
+    def multi_connection(protocol):
         connection_count[0] += 1
-        reader = AsyncMock()
-        writer = MagicMock()
 
         if connection_count[0] == 1:
-            # First connection: raise unexpected exception
-            reader.readuntil.side_effect = ValueError("Unexpected error!")
+            # First connection: fails with an unexpected exception
+            _lose_connection(ValueError("Unexpected error!"))(protocol)
         else:
             # Subsequent connections: EOF
-            reader.readuntil.side_effect = EOFError()
-
-        return reader, writer
+            _lose_connection()(protocol)
 
-    mock_open_connection.side_effect = multi_connection
+    mock_create_connection.side_effect = _fake_connection(multi_connection)
 
     core = Core(TEST_HOST, TEST_PORT, backoff_initial=0.01, backoff_multiplier=1.1, backoff_max=0.05)
     run_task = asyncio.create_task(core.run_until_stopped())
@@ -934,8 +1518,8 @@ async def test_unexpected_exception_during_read(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_continuous_reconnection_attempts(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_continuous_reconnection_attempts(mock_create_connection):
     """Test that core keeps trying to reconnect indefinitely on failures."""
     attempts = []
 
@@ -943,7 +1527,7 @@ async def test_continuous_reconnection_attempts(mock_open_connection):
         attempts.append(len(attempts))
         raise ConnectionError("Always fails")
 
-    mock_open_connection.side_effect = always_fail
+    mock_create_connection.side_effect = always_fail
 
     core = Core(TEST_HOST, TEST_PORT, backoff_initial=0.01, backoff_multiplier=1.1, backoff_max=0.05)
     run_task = asyncio.create_task(core.run_until_stopped())
@@ -960,22 +1544,15 @@ async def test_continuous_reconnection_attempts(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_memory_leak_prevention_on_reconnect(mock_open_connection, caplog):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_memory_leak_prevention_on_reconnect(mock_create_connection, caplog):
     """Test that pending requests are cleaned up to prevent memory leaks."""
     connection_count = [0]
 
-    async def multi_connection(*args, **kwargs):
+    def multi_connection(protocol):
         connection_count[0] += 1
-        reader = AsyncMock()
-        writer = MagicMock()
-
-        # All connections immediately EOF (disconnect)
-        reader.readuntil.side_effect = EOFError()
 
-        return reader, writer
-
-    mock_open_connection.side_effect = multi_connection
+    mock_create_connection.side_effect = _fake_connection(multi_connection)
 
     core = Core(TEST_HOST, TEST_PORT, backoff_initial=0.01, backoff_multiplier=1.1, backoff_max=0.05)
     # Suppress noisy error-level logs produced during intentional EOF cycles
@@ -990,9 +1567,9 @@ async def test_memory_leak_prevention_on_reconnect(mock_open_connection, caplog)
             future = asyncio.Future()
             core._pending[100 + i] = future
             futures_to_check.append(future)
-            # Trigger EOF on reader to force cleanup
-            if core._reader:
-                core._reader.readuntil.side_effect = EOFError()
+            # Trigger EOF to force cleanup
+            if core._protocol:
+                core._protocol.connection_lost(None)
             await wait_for_condition(lambda: future.done(), timeout=0.5, fail_msg="Pending future not failed")
         await wait_for_condition(lambda: len(core._pending) == 0, timeout=0.5, fail_msg="Pending dict not cleared")
     finally:
@@ -1000,8 +1577,8 @@ async def test_memory_leak_prevention_on_reconnect(mock_open_connection, caplog)
         with contextlib.suppress(asyncio.CancelledError):
             await run_task
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_call_during_reconnection(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_call_during_reconnection(mock_create_connection):
     """Test that calls made during reconnection wait for connection."""
     connection_count = [0]
 
@@ -1009,9 +1586,9 @@ async def test_call_during_reconnection(mock_open_connection):
         connection_count[0] += 1
         if connection_count[0] == 1:
             raise ConnectionError("Failed")
-        return await _mocked_open_connection()
+        return await _fake_connection()(*args, **kwargs)
 
-    mock_open_connection.side_effect = delayed_connection
+    mock_create_connection.side_effect = delayed_connection
 
     core = Core(TEST_HOST, TEST_PORT, backoff_initial=0.01, backoff_multiplier=1.1, backoff_max=0.05)
     run_task = asyncio.create_task(core.run_until_stopped())
@@ -1036,10 +1613,10 @@ async def test_call_during_reconnection(mock_open_connection):
 
 
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_rapid_stop_start_cycles(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_rapid_stop_start_cycles(mock_create_connection):
     """Test that rapid stop/start cycles don't cause issues."""
-    mock_open_connection.return_value = await _mocked_open_connection()
+    mock_create_connection.side_effect = _fake_connection()
 
     # Use separate Core instances for each cycle since stop_event stays set
     for _ in range(3):
@@ -1065,15 +1642,13 @@ async def test_rapid_stop_start_cycles(mock_open_connection):
         state = await core.get_state()
         assert state in (ConnectionState.DISCONNECTED, ConnectionState.STOPPING)
 @pytest.mark.asyncio
-@patch('asyncio.open_connection', new_callable=AsyncMock)
-async def test_json_parse_error_during_read(mock_open_connection):
+@patch(CREATE_CONNECTION, new_callable=AsyncMock)
+async def test_json_parse_error_during_read(mock_create_connection):
     """Test that JSON parse errors during read are handled gracefully."""
-    mock_reader = AsyncMock()
-    mock_writer = MagicMock()
-    mock_open_connection.return_value = (mock_reader, mock_writer)
-
     # Return invalid JSON
-    mock_reader.readuntil.return_value = b"invalid json{{{" + DELIMITER
+    mock_create_connection.side_effect = _fake_connection(
+        lambda protocol: protocol.data_received(b"invalid json{{{" + DELIMITER)
+    )
 
     core = Core(TEST_HOST, TEST_PORT)
     run_task = asyncio.create_task(core.run_until_stopped())
@@ -1101,9 +1676,8 @@ async def test_no_resource_leaks_over_time():
 
     # Check initial state
     assert len(core._pending) == 0
-    assert core._reader is None
-    assert core._writer is None
-    assert core._reader_task is None
+    assert core._transport is None
+    assert core._protocol is None
 
     # Simulate multiple cleanup cycles
     for i in range(10):
@@ -1121,6 +1695,5 @@ async def test_no_resource_leaks_over_time():
         assert future2.done()
         # After cleanup, pending should be empty
         assert len(core._pending) == 0
-        assert core._reader is None
-        assert core._writer is None
-        assert core._reader_task is None
+        assert core._transport is None
+        assert core._protocol is None
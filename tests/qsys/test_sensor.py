@@ -0,0 +1,59 @@
+import math
+
+from custom_components.qsys_qrc.qsys.qrc import Core
+from custom_components.qsys_qrc.sensor import EngineStatusEntity
+
+
+class EngineStatus(EngineStatusEntity):
+    # skips the device registry lookups of QSysComponentBase
+    def __init__(self):
+        self.core = Core("localhost")
+        self.writes = 0
+
+    def async_write_ha_state(self):
+        self.writes += 1
+
+
+def test_engine_status_push_keeps_status_get_fields():
+    entity = EngineStatus()
+    entity.on_status({"result": {
+        "Platform": "Core 110f", "State": "Active", "DesignCode": "a",
+        "Status": {"Code": 0, "String": "OK"}}})
+    received_at = entity._status_received_at
+
+    entity.on_engine_status({"State": "Standby", "DesignName": "d", "DesignCode": "b",
+                             "IsRedundant": False, "IsEmulator": False})
+
+    assert entity.native_value == 0
+    attributes = entity.extra_state_attributes
+    assert attributes["Status"] == {"Code": 0, "String": "OK"}
+    assert attributes["Platform"] == "Core 110f"
+    assert attributes["State"] == "Standby"
+    assert attributes["DesignCode"] == "b"
+    # the StatusGet fallback is not held off by pushes
+    assert entity._status_received_at == received_at
+    assert entity.writes == 2
+
+
+def test_engine_status_push_without_status_get():
+    entity = EngineStatus()
+    entity.on_engine_status({"State": "Active", "DesignCode": "a"})
+
+    assert entity.native_value == -1
+    assert entity.status_age() == math.inf
+
+
+class FakeHub:
+    def poll_stats(self):
+        stats = {"interval": 1.0, "missed_deadlines": 0, "suppressed_changes": 2}
+        return {"normal": stats, "fast": stats}
+
+
+def test_connection_stats_not_recorded():
+    entity = EngineStatus()
+    entity.change_groups = FakeHub()
+
+    attributes = entity.connection_stats_attributes()
+
+    assert attributes["poll_tiers"]["fast"]["poll_changes_suppressed"] == 2
+    assert set(attributes) <= EngineStatusEntity._unrecorded_attributes